@@ -0,0 +1,103 @@
+# src/benchmarks/fake_backend.py
+import time
+from typing import Dict, List, Optional
+
+from docker.errors import NotFound
+
+
+class FakeExecResult:
+    def __init__(self, exit_code: int, output: bytes):
+        self.exit_code = exit_code
+        self.output = output
+
+
+class FakeAPI:
+    """Minimal low-level API used by the streaming exec path."""
+
+    def __init__(self, client: "FakeDockerClient"):
+        self.client = client
+        # Registries are shared per daemon URL; keep every fake client separate
+        self.base_url = f"fake://benchmark/{id(client)}"
+        self._execs: Dict[str, bytes] = {}
+
+    def exec_create(self, container_id: str, command) -> Dict:
+        exec_id = f"exec-{len(self._execs)}"
+        self._execs[exec_id] = self.client.output
+        return {"Id": exec_id}
+
+    def exec_start(self, exec_id: str, stream: bool = False):
+        time.sleep(self.client.latency)
+        return _FakeStream(self._execs.pop(exec_id), self.client.chunk_size)
+
+    def exec_inspect(self, exec_id: str) -> Dict:
+        return {"ExitCode": 0}
+
+
+class _FakeStream:
+    def __init__(self, data: bytes, chunk_size: int):
+        self._chunks = iter(
+            data[i : i + chunk_size] for i in range(0, len(data), chunk_size)
+        )
+
+    def __iter__(self):
+        return self._chunks
+
+    def close(self):
+        pass
+
+
+class FakeContainer:
+    def __init__(self, client: "FakeDockerClient", name: str):
+        self.client = client
+        self.name = name
+        self.id = name
+        self.status = "running"
+        self.labels = {"com.docker.compose.project": client.project}
+
+    def exec_run(self, command) -> FakeExecResult:
+        time.sleep(self.client.latency)
+        return FakeExecResult(0, self.client.output)
+
+
+class FakeContainers:
+    def __init__(self, client: "FakeDockerClient", names: List[str]):
+        self._containers = {name: FakeContainer(client, name) for name in names}
+
+    def get(self, name: str) -> FakeContainer:
+        if name not in self._containers:
+            raise NotFound(f"No such container: {name}")
+        return self._containers[name]
+
+    def list(self, all: bool = False, filters: Optional[Dict] = None):
+        return list(self._containers.values())
+
+
+class FakeDockerClient:
+    """In-memory stand-in for docker.DockerClient with configurable exec cost.
+
+    Every exec sleeps for `latency` seconds and returns `output_size` bytes of
+    output, so framework overhead can be measured without a daemon.
+    """
+
+    def __init__(
+        self,
+        nodes: List[str],
+        latency: float = 0.0,
+        output_size: int = 1024,
+        project: str = "network-test-framework",
+        name_pattern: str = "{project}-{node}-1",
+        chunk_size: int = 64 * 1024,
+    ):
+        self.latency = latency
+        self.project = project
+        self.chunk_size = chunk_size
+        self.output = _make_output(output_size)
+        self.api = FakeAPI(self)
+        self.containers = FakeContainers(
+            self, [name_pattern.format(project=project, node=node) for node in nodes]
+        )
+
+
+def _make_output(size: int) -> bytes:
+    line = b"64 bytes from 172.20.0.3: seq=0 ttl=64 time=0.081 ms\n"
+    return (line * (size // len(line) + 1))[:size]
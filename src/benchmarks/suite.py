@@ -0,0 +1,309 @@
+# src/benchmarks/suite.py
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+from src.benchmarks.fake_backend import FakeDockerClient
+from src.core.blobs import BlobStore
+from src.core.config import ConfigManager
+from src.core.logging import CommandLog, TestCommandLogger
+from src.core.reporter import TestReporter, TestResult
+
+TEMPLATE_DIR = Path(__file__).parent.parent.parent / "templates"
+
+KB = 1024
+MB = 1024 * KB
+
+SCALES = {
+    "quick": {"tests": [10, 100, 1000], "outputs": [1 * KB, 1 * MB]},
+    "full": {"tests": [10, 100, 1000, 10000], "outputs": [1 * KB, 1 * MB, 10 * MB]},
+}
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    params: Dict
+    iterations: int
+    total_seconds: float
+    extra: Dict = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["per_iteration_us"] = self.total_seconds / self.iterations * 1e6
+        return data
+
+
+def _timed(func: Callable) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+@contextmanager
+def _sandbox():
+    """Fresh working and report directories with no reporter singleton."""
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        TestReporter._instance = None
+        reporter = TestReporter(
+            output_dir=str(Path(tmp) / "reports"),
+            template_dir=str(TEMPLATE_DIR),
+            flush_interval=None,
+        )
+        try:
+            yield Path(tmp), reporter
+        finally:
+            reporter.close()
+            TestReporter._instance = None
+            os.chdir(previous_cwd)
+
+
+def _make_result(index: int) -> TestResult:
+    return TestResult(
+        module_name="bench",
+        test_name=f"test_{index}",
+        status="PASS" if index % 10 else "FAIL",
+        duration=0.01,
+        timestamp=datetime.now(),
+        error_message=None if index % 10 else "benchmark failure",
+        details={
+            "command_logs": [
+                {
+                    "node": "node1",
+                    "command": "ping -c 3 172.20.0.3",
+                    "exit_code": 0,
+                    "timestamp": datetime.now().isoformat(),
+                    "duration": 0.01,
+                    "truncated": 0,
+                    "output_ref": None,
+                }
+            ]
+        },
+    )
+
+
+def bench_execute_command(
+    output_size: int, stream: bool, latency: float = 0.0
+) -> BenchmarkResult:
+    """Time _execute_command against execs taking `latency` seconds each."""
+    # Keep the total amount of output per benchmark roughly constant
+    iterations = max(5, min(1000, (64 * MB) // output_size))
+    if latency:
+        # And the time spent waiting on the fake daemon
+        iterations = max(5, min(iterations, int(1 / latency)))
+    from src.core.test_base import NetworkTestBase
+
+    with _sandbox():
+        client = FakeDockerClient(["node1"], latency=latency, output_size=output_size)
+        test = NetworkTestBase(docker_client=client)
+        test.current_test_name = "bench"
+        container = test.get_container("node1")
+        # Guard against measuring the fake client of another benchmark
+        returned = len(container.exec_run("ping -c 3 node2").output)
+        assert returned == output_size, f"got {returned} bytes, not {output_size}"
+
+        def run():
+            for _ in range(iterations):
+                test._execute_command(container, "ping -c 3 node2", "node1", stream)
+                test.command_logger.clear_logs("bench")
+
+        total = _timed(run)
+    name = "execute_command_stream" if stream else "execute_command"
+    params = {"output_size": output_size}
+    if latency:
+        params["latency"] = latency
+    return BenchmarkResult(name, params, iterations, total)
+
+
+def bench_command_logger(count: int, output_size: int) -> List[BenchmarkResult]:
+    output = "x" * output_size
+    with tempfile.TemporaryDirectory() as tmp:
+        logger = TestCommandLogger(BlobStore(Path(tmp)))
+        add_time = _timed(
+            lambda: [
+                logger.add_log(
+                    "bench",
+                    CommandLog(
+                        "node1", "ip addr", 0, output + str(i), datetime.now(), 0.01
+                    ),
+                )
+                for i in range(count)
+            ]
+        )
+        finalize_time = _timed(lambda: logger.finalize("bench"))
+        logger.blob_store.close()
+
+    params = {"logs": count, "output_size": output_size}
+    return [
+        BenchmarkResult("command_logger_add", params, count, add_time),
+        BenchmarkResult("command_logger_finalize", params, count, finalize_time),
+    ]
+
+
+def bench_reporter(count: int, buckets: int = 10) -> List[BenchmarkResult]:
+    """Time the reporter, and whether add_result slows down as results pile up."""
+    results = [_make_result(i) for i in range(count)]
+    bucket_size = max(count // buckets, 1)
+    bucket_times = []  # (seconds, results) per bucket of consecutive results
+    with _sandbox() as (_, reporter):
+        for start in range(0, count, bucket_size):
+            bucket = results[start : start + bucket_size]
+            elapsed = _timed(lambda: [reporter.add_result("bench", r) for r in bucket])
+            bucket_times.append((elapsed, len(bucket)))
+        save_time = _timed(reporter._save_results)
+        html_time = _timed(reporter._generate_html_report)
+
+    add_time = sum(elapsed for elapsed, _ in bucket_times)
+    params = {"tests": count}
+    extra = {
+        # Per-result cost of the first and the last results; should stay flat
+        "first_bucket_us": bucket_times[0][0] / bucket_times[0][1] * 1e6,
+        "last_bucket_us": bucket_times[-1][0] / bucket_times[-1][1] * 1e6,
+    }
+    return [
+        BenchmarkResult("reporter_add_result", params, count, add_time, extra),
+        BenchmarkResult("reporter_save_results", params, 1, save_time),
+        BenchmarkResult("reporter_render_html", params, 1, html_time),
+    ]
+
+
+def bench_config_load(node_count: int) -> List[BenchmarkResult]:
+    raw_config = {
+        "scale": {
+            "description": "Benchmark topology",
+            "nodes": {
+                f"node{i}": {
+                    "ip_address": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+                    "subnet_mask": "255.0.0.0",
+                }
+                for i in range(node_count)
+            },
+        }
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / "test_config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump(raw_config, f)
+        ConfigManager._compiled.clear()
+        total = _timed(lambda: ConfigManager(str(config_path)))
+        # What other processes pay: the compiled config comes from the disk cache
+        ConfigManager._compiled.clear()
+        cached_total = _timed(lambda: ConfigManager(str(config_path)))
+    params = {"nodes": node_count}
+    return [
+        BenchmarkResult("config_load", params, 1, total),
+        BenchmarkResult("config_load_cached", params, 1, cached_total),
+    ]
+
+
+def run_suite(scale: str, latency: float = 0.0) -> List[BenchmarkResult]:
+    sizes = SCALES[scale]
+    results = []
+    for output_size in sizes["outputs"]:
+        results.append(bench_execute_command(output_size, False, latency))
+        results.append(bench_execute_command(output_size, True, latency))
+    for count in sizes["tests"]:
+        results.extend(bench_command_logger(count, 1 * KB))
+        results.extend(bench_reporter(count))
+        results.extend(bench_config_load(count))
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _result_key(result: Dict) -> str:
+    return f"{result['name']}{json.dumps(result['params'], sort_keys=True)}"
+
+
+def compare(current: Dict, baseline: Dict):
+    """Print the per-iteration time ratio of every benchmark in both runs."""
+    previous = {_result_key(r): r for r in baseline["results"]}
+    print(f"\n{'benchmark':<70} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for result in current["results"]:
+        before = previous.get(_result_key(result))
+        if before is None:
+            continue
+        ratio = result["per_iteration_us"] / before["per_iteration_us"]
+        print(
+            f"{_result_key(result):<70} {before['per_iteration_us']:>10.1f}us "
+            f"{result['per_iteration_us']:>10.1f}us {ratio:>6.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Framework overhead benchmarks")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="quick")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds every fake exec takes, to model a daemon round trip",
+    )
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--compare", help="Previous results JSON to compare with")
+    args = parser.parse_args()
+
+    cwd = Path.cwd()
+    results = run_suite(args.scale, args.latency)
+    data = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "latency": args.latency,
+        },
+        "results": [result.to_dict() for result in results],
+    }
+
+    for result in data["results"]:
+        print(
+            f"{result['name']:<28} {json.dumps(result['params']):<40} "
+            f"{result['per_iteration_us']:>12.1f} us/iter"
+        )
+
+    output = (
+        Path(args.output)
+        if args.output
+        else cwd
+        / "reports"
+        / "benchmarks"
+        / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(data, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(data, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
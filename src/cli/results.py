@@ -0,0 +1,85 @@
+import argparse
+import json
+from pathlib import Path
+
+from src.core.config import ConfigManager
+from src.core.reporter import TestReporter
+from src.core.results_store import ResultsStore, open_results_store
+
+
+def import_reports(store: ResultsStore, reports_dir: Path) -> int:
+    """Add execution directories that are not in the store yet."""
+    imported = 0
+    for execution_dir in sorted(reports_dir.glob("execution_*")):
+        log_file = execution_dir / "results.jsonl"
+        if not log_file.exists() or store.has_execution(execution_dir.name):
+            continue
+
+        results = {}
+        with open(log_file) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                module_name = record.pop("module")
+                results.setdefault(module_name, []).append(
+                    TestReporter._result_from_dict(module_name, record)
+                )
+        finished_at = max(
+            (r.timestamp for module in results.values() for r in module), default=None
+        )
+        store.record_execution(execution_dir.name, results, finished_at)
+        imported += 1
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the test results store")
+    parser.add_argument(
+        "--report-dir", default="reports", help="Directory holding the reports"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("latest", help="Print the id of the latest execution")
+    flaky = commands.add_parser("flaky", help="List tests that both passed and failed")
+    flaky.add_argument("--runs", type=int, default=500)
+    trend = commands.add_parser("trend", help="Show the duration trend of a test")
+    trend.add_argument("test_name")
+    trend.add_argument("--module", default=None)
+    trend.add_argument("--limit", type=int, default=100)
+    commands.add_parser(
+        "import", help="Add existing execution directories to the store"
+    )
+    args = parser.parse_args()
+
+    url = ConfigManager().framework.results_store
+    if not url:
+        raise SystemExit("No results store configured (framework.results_store)")
+    store = open_results_store(url, Path(args.report_dir))
+
+    try:
+        if args.command == "latest":
+            latest = store.latest_execution()
+            if latest is None:
+                raise SystemExit(1)
+            print(latest)
+        elif args.command == "flaky":
+            for test in store.flaky_tests(args.runs):
+                print(
+                    f"{test.module}::{test.test_name}: "
+                    f"{test.failed} failed, {test.passed} passed"
+                )
+        elif args.command == "trend":
+            for point in store.duration_trend(args.test_name, args.module, args.limit):
+                print(
+                    f"{point.timestamp}  {point.duration:8.2f}s  {point.status}  "
+                    f"{point.execution_id}"
+                )
+        else:
+            count = import_reports(store, Path(args.report_dir))
+            print(f"Imported {count} executions")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
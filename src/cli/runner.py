@@ -1,86 +1,192 @@
 import argparse
 import importlib
+import os
 import subprocess
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
-
-import pytest
-from rich.console import Console
-from rich.panel import Panel
-from rich.progress import Progress
+from typing import Dict, List, Optional
 
+from src.cli.scheduler import (
+    WorkUnit,
+    load_module_durations,
+    module_file,
+    plan_work_units,
+)
+from src.cli.shards import prepare_shards, resolve_docker_host
+from src.core.backends.base import backend_name, create_backend
+from src.core.config import ConfigError, ConfigManager
 from src.core.reporter import TestReporter
+from src.core.topology import TopologyManager
+from src.core.tracing import TRACER
 
 
 class TestRunner:
-    def __init__(self, report_dir: Optional[str] = None):
-        self.console = Console()
+    """CLI test runner.
+
+    pytest, rich and the docker SDK are imported on first use, so invocations
+    that never reach them (and the preflight itself) stay cheap.
+    """
+
+    def __init__(
+        self,
+        report_dir: Optional[str] = None,
+        assume_yes: bool = False,
+        started_at: Optional[float] = None,
+        docker_hosts: Optional[List[str]] = None,
+        metrics_port: Optional[int] = None,
+        trace: bool = False,
+    ):
+        self.started_at = time.perf_counter() if started_at is None else started_at
         self.reporter = TestReporter(report_dir) if report_dir else TestReporter()
+        self.assume_yes = assume_yes
+        # Shards to spread modules across; None runs on the default daemon
+        self.docker_hosts = docker_hosts
+        self.metrics_port = metrics_port
+        self.trace = trace
+        self._console = None
+        self._docker_client = None
+        self._topology_manager = None
+
+    @property
+    def console(self):
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        return self._console
+
+    @property
+    def docker_client(self):
+        if self._docker_client is None:
+            import docker
+
+            self._docker_client = docker.from_env()
+        return self._docker_client
 
     def check_docker_status(self) -> bool:
         """Check if Docker daemon is running."""
         try:
-            result = subprocess.run(
-                ["docker", "info"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
-            return result.returncode == 0
-        except FileNotFoundError:
-            self.console.print("[red]Docker is not installed or not in PATH[/red]")
+            return self.docker_client.ping()
+        except Exception as e:
+            self.console.print(f"[red]Cannot reach the Docker daemon: {str(e)}[/red]")
             return False
 
+    @property
+    def topology_manager(self) -> TopologyManager:
+        """Manager for the topology generated from the test configuration."""
+        if self._topology_manager is None:
+            config_manager = ConfigManager()
+            self._topology_manager = TopologyManager(
+                self.docker_client,
+                config_manager.topology(),
+                config_manager.framework.container_name_pattern,
+            )
+        return self._topology_manager
+
     def check_docker_containers(self) -> bool:
-        """Check if Docker containers are running."""
+        """Check if the topology's containers are running and up to date."""
         try:
-            result = subprocess.run(
-                ["docker", "ps"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
+            stale = self.topology_manager.stale_nodes()
+            if stale:
+                self.console.print(
+                    f"[yellow]Nodes not running or out of date: {', '.join(stale)}"
+                    "[/yellow]"
+                )
+                return False
+            self.console.print(
+                "[cyan]Reusing warm topology "
+                f"{self.topology_manager.topology.hash}[/cyan]"
             )
-            # Check if there are any running containers (more than just the header line)
-            return len(result.stdout.strip().split("\n")) > 1
+            return True
         except Exception as e:
             self.console.print(f"[red]Error checking Docker containers: {str(e)}[/red]")
             return False
 
     def prompt_start_containers(self) -> bool:
         """Prompt user to start Docker containers if they're not running."""
-        response = input(
-            "Docker containers are not running. Would you like to start them? (y/n): "
-        ).lower()
-        if response == "y":
-            try:
-                self.console.print("[cyan]Starting Docker containers...[/cyan]")
-                result = subprocess.run(
-                    ["make", "up"],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                )
-                if result.returncode == 0:
-                    self.console.print(
-                        "[green]Docker containers started successfully![/green]"
-                    )
-                    return True
-                else:
-                    self.console.print(
-                        f"[red]Failed to start Docker containers: {result.stderr}[/red]"
-                    )
-                    return False
-            except Exception as e:
+        if not self.assume_yes:
+            response = input(
+                "Docker containers are not running. "
+                "Would you like to start them? (y/n): "
+            ).lower()
+            if response != "y":
+                return False
+
+        try:
+            self.console.print("[cyan]Starting Docker containers...[/cyan]")
+            if self.topology_manager.ensure_up():
                 self.console.print(
-                    f"[red]Error starting Docker containers: {str(e)}[/red]"
+                    "[green]Docker containers started successfully![/green]"
                 )
+                return True
+            self.console.print("[red]Docker containers did not become ready[/red]")
+            return False
+        except Exception as e:
+            self.console.print(f"[red]Error starting Docker containers: {str(e)}[/red]")
+            return False
+
+    def prepare_backend(self, name: str) -> bool:
+        """Preflight for backends that run without the Docker daemon."""
+        if name != "netns":
+            return True
+
+        try:
+            config_manager = ConfigManager()
+            self.console.print("[cyan]Creating missing node namespaces...[/cyan]")
+            create_backend(config_manager).build_topology(config_manager.topology())
+            return True
+        except Exception as e:
+            self.console.print(f"[red]Error creating namespaces: {str(e)}[/red]")
+            return False
+
+    def prepare_shards(self) -> bool:
+        """Check every shard's daemon and bring up the topology where needed."""
+        config_manager = ConfigManager()
+        topology = config_manager.topology()
+        pattern = config_manager.framework.container_name_pattern
+        try:
+            self.docker_hosts = [resolve_docker_host(h) for h in self.docker_hosts]
+        except Exception as e:
+            self.console.print(f"[red]{str(e)}[/red]")
+            return False
+
+        problems = prepare_shards(self.docker_hosts, topology, pattern, False)
+        stale = [host for host, problem in problems.items() if problem]
+        for host in stale:
+            self.console.print(f"[yellow]{host}: {problems[host]}[/yellow]")
+        if not stale:
+            self.console.print(
+                f"[cyan]Reusing warm topology {topology.hash} on "
+                f"{len(self.docker_hosts)} shards[/cyan]"
+            )
+            return True
+
+        if not self.assume_yes:
+            response = input(
+                f"The topology is not ready on {len(stale)} shards. "
+                "Would you like to start it there? (y/n): "
+            ).lower()
+            if response != "y":
                 return False
-        return False
+
+        self.console.print("[cyan]Starting the topology on the shards...[/cyan]")
+        problems = prepare_shards(stale, topology, pattern, True)
+        for host, problem in problems.items():
+            if problem:
+                self.console.print(f"[red]{host}: {problem}[/red]")
+        return not any(problems.values())
 
     @staticmethod
     def discover_test_modules() -> List[str]:
-        """Discover all test modules in the tests directory."""
+        """Discover the network test modules in the tests directory.
+
+        Unit tests of the framework itself live in tests/unit and are not
+        scheduled; run them with `make unit`.
+        """
         test_dir = Path(__file__).parent.parent / "tests"
         test_files = test_dir.glob("test_*.py")
         return [
@@ -89,17 +195,43 @@ class TestRunner:
             if f.is_file() and not f.name.startswith("__")
         ]
 
-    def run_tests(self, test_modules: Optional[List[str]] = None) -> bool:
+    def run_tests(
+        self, test_modules: Optional[List[str]] = None, jobs: int = 1
+    ) -> bool:
         """Run tests and consolidate results."""
+        try:
+            framework = ConfigManager().framework
+        except ConfigError as e:
+            self.console.print(f"[red]Invalid configuration: {str(e)}[/red]")
+            return False
+        backend = backend_name(framework)
+        if self.docker_hosts is None and framework.docker_hosts:
+            self.docker_hosts = list(framework.docker_hosts)
+        if self.metrics_port is None:
+            self.metrics_port = framework.metrics_port
+        if self.trace or framework.trace:
+            TRACER.enable()
+
+        if backend != "docker":
+            if not self.prepare_backend(backend):
+                return False
+
+        elif self.docker_hosts:
+            if not self.prepare_shards():
+                self.console.print(
+                    "[yellow]Exiting as not every shard is ready.[/yellow]"
+                )
+                return False
+
         # Check Docker status first
-        if not self.check_docker_status():
+        elif not self.check_docker_status():
             self.console.print(
                 "[red]Docker is not running. Please start Docker first.[/red]"
             )
             return False
 
         # Check if containers are running
-        if not self.check_docker_containers():
+        elif not self.check_docker_containers():
             if not self.prompt_start_containers():
                 self.console.print(
                     "[yellow]Exiting as Docker containers are not running.[/yellow]"
@@ -109,6 +241,10 @@ class TestRunner:
         if test_modules is None:
             test_modules = self.discover_test_modules()
 
+        from rich.panel import Panel
+
+        startup_ms = (time.perf_counter() - self.started_at) * 1000
+        self.console.print(f"[dim]Startup and preflight took {startup_ms:.0f} ms[/dim]")
         self.console.print(
             Panel.fit(
                 "[bold blue]Network Test Framework[/bold blue]\n"
@@ -116,6 +252,42 @@ class TestRunner:
             )
         )
 
+        metrics_server = self.start_metrics_server()
+        try:
+            if jobs > 1 or self.docker_hosts:
+                success = self._run_parallel(test_modules, jobs, self.docker_hosts)
+            else:
+                success = self._run_sequential(test_modules)
+
+            self.console.print("\n[green]Test execution completed![/green]")
+            self.reporter.generate_summary()
+        finally:
+            if metrics_server is not None:
+                metrics_server.shutdown()
+        return success
+
+    def start_metrics_server(self):
+        """Serve the run's metrics over HTTP if a metrics port is configured."""
+        if not self.metrics_port:
+            return None
+
+        from src.core.metrics import start_http_server
+
+        try:
+            server = start_http_server(self.metrics_port, self.reporter.metrics_text)
+        except OSError as e:
+            self.console.print(f"[red]Cannot serve metrics: {str(e)}[/red]")
+            return None
+        self.console.print(
+            f"[dim]Metrics at http://127.0.0.1:{self.metrics_port}/metrics[/dim]"
+        )
+        return server
+
+    def _run_sequential(self, test_modules: List[str]) -> bool:
+        """Run every module in this process, one after another."""
+        import pytest
+        from rich.progress import Progress
+
         success = True
         with Progress() as progress:
             task = progress.add_task("[cyan]Running tests...", total=len(test_modules))
@@ -133,31 +305,169 @@ class TestRunner:
                         f"[red]Error running {module_name}: {str(e)}[/red]"
                     )
                     success = False
+        return success
+
+    def _run_parallel(
+        self,
+        test_modules: List[str],
+        jobs: int,
+        docker_hosts: Optional[List[str]] = None,
+    ) -> bool:
+        """Run modules in worker processes, longest work unit first.
+
+        Work units are taken in descending order of their duration in the
+        previous execution, so the pool approximates longest-processing-time
+        scheduling. Modules sharing an isolation group form a single unit.
+
+        With docker_hosts, every host runs `jobs` workers against its own copy
+        of the topology. Idle workers take the next unit from a shared queue, so
+        faster or less loaded hosts end up running more of them.
+
+        Workers send their results to a collector in this process as they
+        finish, so the execution directory gets a single consolidated report.
+        """
+        from rich.progress import Progress
+
+        units = deque(
+            enumerate(
+                plan_work_units(
+                    test_modules, load_module_durations(self.reporter.base_output_dir)
+                )
+            )
+        )
+        units_lock = threading.Lock()
+        log_dir = self.reporter.execution_dir / "worker_logs"
+        log_dir.mkdir(exist_ok=True)
+        slots = [host for host in (docker_hosts or [None]) for _ in range(jobs)]
+
+        with Progress() as progress:
+            task = progress.add_task("[cyan]Running tests...", total=len(test_modules))
+
+            def run_unit(worker_id: int, unit: WorkUnit, host: Optional[str]) -> bool:
+                unit_success = True
+                for module_name in unit.modules:
+                    if not self._run_module_process(
+                        module_name, worker_id, log_dir, host, collector_env
+                    ):
+                        unit_success = False
+                    progress.update(task, advance=1)
+                return unit_success
+
+            def run_slot(host: Optional[str]) -> bool:
+                slot_success = True
+                while True:
+                    with units_lock:
+                        if not units:
+                            return slot_success
+                        worker_id, unit = units.popleft()
+                    if not run_unit(worker_id, unit, host):
+                        slot_success = False
 
-        self.console.print("\n[green]Test execution completed![/green]")
-        self.reporter.generate_summary()
+            collector = self.reporter.start_collector()
+            collector_env = collector.export_env({})
+            try:
+                with ThreadPoolExecutor(max_workers=len(slots)) as executor:
+                    futures = [executor.submit(run_slot, host) for host in slots]
+                    success = all([future.result() for future in futures])
+            finally:
+                collector.stop()
+
+        self.reporter.collect_worker_results()
         return success
 
+    def _run_module_process(
+        self,
+        module_name: str,
+        worker_id: int,
+        log_dir: Path,
+        docker_host: Optional[str] = None,
+        collector_env: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        """Run a single test module in a pytest subprocess."""
+        env = dict(os.environ)
+        env[TestReporter.EXECUTION_DIR_ENV] = str(self.reporter.execution_dir)
+        env[TestReporter.WORKER_ID_ENV] = str(worker_id)
+        env.update(collector_env or {})
+        if docker_host:
+            env["DOCKER_HOST"] = docker_host
+            env[TestReporter.SHARD_ENV] = docker_host
+
+        log_file = log_dir / f"{module_name.split('.')[-1]}.log"
+        with open(log_file, "w") as f:
+            result = subprocess.run(
+                [sys.executable, "-m", "pytest", "-v", str(module_file(module_name))],
+                stdout=f,
+                stderr=subprocess.STDOUT,
+                env=env,
+            )
+
+        if result.returncode != 0:
+            shard = f" on {docker_host}" if docker_host else ""
+            self.console.print(
+                f"[red]{module_name} failed{shard}, see {log_file}[/red]"
+            )
+            return False
+        return True
+
 
 def main():
+    started_at = time.perf_counter()
     parser = argparse.ArgumentParser(description="Network Test Framework CLI Runner")
     parser.add_argument(
         "--report-dir", help="Custom directory for test reports", default=None
     )
+    parser.add_argument(
+        "-y",
+        "--yes",
+        action="store_true",
+        help="Start or recreate the test topology without prompting",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of test modules to run in parallel worker processes",
+    )
+    parser.add_argument(
+        "--docker-host",
+        action="append",
+        dest="docker_hosts",
+        help="Docker daemon (DOCKER_HOST URL or context name) to shard modules "
+        "across; repeat for each host",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this local port while tests run",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write a Chrome/Perfetto trace of every test phase to trace.json",
+    )
     parser.add_argument(
         "test_modules",
         nargs="*",
         help="Specific test modules to run (without the .py extension)",
     )
     args = parser.parse_args()
-    runner = TestRunner(args.report_dir)
+    runner = TestRunner(
+        args.report_dir,
+        assume_yes=args.yes,
+        started_at=started_at,
+        docker_hosts=args.docker_hosts,
+        metrics_port=args.metrics_port,
+        trace=args.trace,
+    )
 
     # If specific modules provided, format them correctly
     test_modules = None
     if args.test_modules:
         test_modules = [f"src.tests.test_{module}" for module in args.test_modules]
 
-    success = runner.run_tests(test_modules)
+    success = runner.run_tests(test_modules, jobs=args.jobs)
     sys.exit(0 if success else 1)
 
 
@@ -0,0 +1,95 @@
+# src/cli/scheduler.py
+import ast
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+@dataclass
+class WorkUnit:
+    """Test modules that must run one after another in the same worker."""
+
+    modules: List[str]
+    isolation_group: Optional[str] = None
+    estimated_duration: float = 0.0
+    durations: Dict[str, float] = field(default_factory=dict)
+
+
+def load_module_durations(report_dir: Path) -> Dict[str, float]:
+    """Get per-module durations from the most recent previous execution.
+
+    Executions are scanned newest first and the first one with a JSON report
+    wins. Keys are module short names (e.g. "test_connectivity").
+    """
+    for execution_dir in sorted(report_dir.glob("execution_*"), reverse=True):
+        report_file = execution_dir / "test_report.json"
+        if not report_file.exists():
+            continue
+        try:
+            with open(report_file) as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            continue
+
+        durations = {
+            module: sum(test.get("duration", 0.0) for test in tests)
+            for module, tests in report.get("modules", {}).items()
+        }
+        if durations:
+            return durations
+    return {}
+
+
+def module_file(module_name: str) -> Path:
+    """Resolve a dotted test module name (src.tests.test_x) to its file."""
+    root = Path(__file__).parent.parent.parent
+    return root.joinpath(*module_name.split(".")).with_suffix(".py")
+
+
+def isolation_group(module_name: str) -> Optional[str]:
+    """Read a module's ISOLATION_GROUP without importing it.
+
+    Modules that mutate shared containers declare a group; modules of the same
+    group are never run concurrently.
+    """
+    try:
+        tree = ast.parse(module_file(module_name).read_text())
+    except (OSError, SyntaxError):
+        return None
+
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and any(
+                isinstance(t, ast.Name) and t.id == "ISOLATION_GROUP"
+                for t in node.targets
+            )
+            and isinstance(node.value, ast.Constant)
+        ):
+            return node.value.value
+    return None
+
+
+def plan_work_units(
+    test_modules: List[str], durations: Dict[str, float]
+) -> List[WorkUnit]:
+    """Group modules by isolation group and order the groups longest-first.
+
+    Modules without a recorded duration are assumed to be as long as the
+    longest known module so they are not left for the end of the run.
+    """
+    default_duration = max(durations.values(), default=0.0)
+    units: Dict[str, WorkUnit] = {}
+    for module_name in test_modules:
+        group = isolation_group(module_name)
+        key = f"group:{group}" if group else f"module:{module_name}"
+        unit = units.setdefault(key, WorkUnit(modules=[], isolation_group=group))
+        duration = durations.get(module_name.split(".")[-1], default_duration)
+        unit.modules.append(module_name)
+        unit.durations[module_name] = duration
+        unit.estimated_duration += duration
+
+    for unit in units.values():
+        unit.modules.sort(key=lambda m: unit.durations[m], reverse=True)
+    return sorted(units.values(), key=lambda u: u.estimated_duration, reverse=True)
@@ -0,0 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from src.core.topology import Topology, TopologyManager
+
+
+def resolve_docker_host(endpoint: str) -> str:
+    """Turn a DOCKER_HOST URL or a Docker context name into a daemon URL."""
+    if "://" in endpoint:
+        return endpoint
+
+    import docker
+
+    context = docker.ContextAPI.get_context(endpoint)
+    if context is None or not context.Host:
+        raise Exception(f"Unknown Docker context: {endpoint}")
+    return context.Host
+
+
+def prepare_shard(
+    docker_host: str, topology: Topology, name_pattern: str, start: bool
+) -> Optional[str]:
+    """Check a shard's daemon and topology, starting the topology if allowed.
+
+    Returns None when the shard is ready, or why it is not.
+    """
+    import docker
+
+    try:
+        client = docker.DockerClient(base_url=docker_host)
+        client.ping()
+        manager = TopologyManager(client, topology, name_pattern)
+        stale = manager.stale_nodes()
+        if not stale:
+            return None
+        if not start:
+            return f"nodes not running or out of date: {', '.join(stale)}"
+        if not manager.ensure_up():
+            return "topology did not become ready"
+        return None
+    except Exception as e:
+        return str(e)
+
+
+def prepare_shards(
+    docker_hosts: List[str], topology: Topology, name_pattern: str, start: bool
+) -> Dict[str, Optional[str]]:
+    """Prepare every shard concurrently and map docker host -> problem."""
+    with ThreadPoolExecutor(max_workers=len(docker_hosts) or 1) as executor:
+        futures = {
+            host: executor.submit(prepare_shard, host, topology, name_pattern, start)
+            for host in docker_hosts
+        }
+        return {host: future.result() for host, future in futures.items()}
@@ -0,0 +1,102 @@
+# src/core/backends/base.py
+import os
+from abc import ABC, abstractmethod
+from typing import Iterator, List, NamedTuple, Optional
+
+from src.core.batch import BatchEntry, run_batch
+
+# Overrides framework.backend, e.g. to run the suite without Docker in CI
+BACKEND_ENV = "NETWORK_TEST_BACKEND"
+
+
+class ExecResult(NamedTuple):
+    """Exit code and combined stdout/stderr, like the docker SDK's ExecResult."""
+
+    exit_code: int
+    output: bytes
+
+
+class NodeNotFound(Exception):
+    """Raised when a backend has no node with the requested name."""
+
+
+class StreamingExec(ABC):
+    """Output chunks of a running command, with its exit code once finished."""
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[bytes]:
+        pass
+
+    @abstractmethod
+    def close(self):
+        """Stop reading; the command may keep running in the background."""
+
+    @abstractmethod
+    def exit_code(self) -> Optional[int]:
+        """Exit code of the command, or None if it is still running."""
+
+
+class NodeHandle(ABC):
+    """A test node that commands can be executed on."""
+
+    name: str
+
+    @abstractmethod
+    def exec_run(self, command) -> ExecResult:
+        """Run a command (string or argv list) and wait for it to finish."""
+
+    @abstractmethod
+    def exec_stream(self, command) -> StreamingExec:
+        """Start a command and stream its output."""
+
+    def exec_batch(self, commands: List[str], parallel: int = 1) -> List[BatchEntry]:
+        """Run several commands at once, by default as a single shell script."""
+        return run_batch(self, commands, parallel)
+
+    def exec_ip_batch(self, lines: List[str]) -> ExecResult:
+        """Feed lines to `ip -force -batch -` in a single exec."""
+        script = "ip -force -batch - <<'EOF'\n{}\nEOF".format("\n".join(lines))
+        return self.exec_run(["sh", "-c", script])
+
+
+class ExecBackend(ABC):
+    """Resolves node names to handles that commands run on."""
+
+    @abstractmethod
+    def get(self, node: str) -> NodeHandle:
+        """Get a node's handle, raising NodeNotFound if it does not exist."""
+
+    def invalidate(self, node: Optional[str] = None):
+        """Forget cached handles, e.g. after a node was recreated."""
+
+    def is_stale_error(self, error: Exception) -> bool:
+        """Whether an exec error means the node's handle should be refreshed."""
+        return False
+
+
+def backend_name(framework) -> str:
+    return os.environ.get(BACKEND_ENV) or framework.backend
+
+
+def create_backend(config_manager, docker_client=None) -> ExecBackend:
+    """Create the execution backend selected by the configuration."""
+    framework = config_manager.framework
+    name = backend_name(framework)
+
+    if name == "docker":
+        from src.core.backends.docker_backend import DockerBackend
+
+        return DockerBackend(
+            docker_client,
+            framework.compose_project,
+            framework.container_name_pattern,
+        )
+    if name == "netns":
+        from src.core.backends.netns_backend import NamespaceBackend
+
+        return NamespaceBackend(framework.netns_name_pattern, framework.compose_project)
+    if name == "simulated":
+        from src.core.backends.simulated import SimulatedBackend
+
+        return SimulatedBackend(config_manager.topology())
+    raise Exception(f"Unknown execution backend: {name}")
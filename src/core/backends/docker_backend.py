@@ -0,0 +1,84 @@
+# src/core/backends/docker_backend.py
+import time
+from typing import Optional
+
+import docker
+from docker.errors import NotFound
+
+from src.core.backends.base import (
+    ExecBackend,
+    ExecResult,
+    NodeHandle,
+    NodeNotFound,
+    StreamingExec,
+)
+from src.core.containers import ContainerRegistry
+
+
+class DockerStreamingExec(StreamingExec):
+    # How long to wait for the daemon to record the exit code after the output
+    # stream ended, and how often to ask
+    exit_timeout = 5.0
+    exit_poll_interval = 0.05
+
+    def __init__(self, container, command):
+        self._api = container.client.api
+        self._exec_id = self._api.exec_create(container.id, command)["Id"]
+        self._chunks = self._api.exec_start(self._exec_id, stream=True)
+
+    def __iter__(self):
+        return iter(self._chunks)
+
+    def close(self):
+        self._chunks.close()
+
+    def exit_code(self) -> Optional[int]:
+        """Exit code of the finished command, -1 if the daemon never reports one.
+
+        The daemon can still mark the exec as running, without an exit code,
+        for a short while after its output stream ended.
+        """
+        deadline = time.monotonic() + self.exit_timeout
+        while True:
+            info = self._api.exec_inspect(self._exec_id)
+            if not info.get("Running") and info.get("ExitCode") is not None:
+                return info["ExitCode"]
+            if time.monotonic() >= deadline:
+                print(f"Exec {self._exec_id} reported no exit code, counting it failed")
+                return -1
+            time.sleep(self.exit_poll_interval)
+
+
+class DockerNode(NodeHandle):
+    """A test node running as a Docker container."""
+
+    def __init__(self, name: str, container):
+        self.name = name
+        self.container = container
+
+    def exec_run(self, command) -> ExecResult:
+        result = self.container.exec_run(command)
+        return ExecResult(result.exit_code, result.output)
+
+    def exec_stream(self, command) -> StreamingExec:
+        return DockerStreamingExec(self.container, command)
+
+
+class DockerBackend(ExecBackend):
+    """Runs commands through `exec` in the compose project's containers."""
+
+    def __init__(self, client, project: str, name_pattern: str):
+        self.client = client or docker.from_env()
+        self.registry = ContainerRegistry.shared(self.client, project, name_pattern)
+
+    def get(self, node: str) -> NodeHandle:
+        try:
+            return DockerNode(node, self.registry.get(node))
+        except NotFound:
+            raise NodeNotFound(node)
+
+    def invalidate(self, node: Optional[str] = None):
+        self.registry.invalidate(node)
+
+    def is_stale_error(self, error: Exception) -> bool:
+        return ContainerRegistry.is_stale_handle_error(error)
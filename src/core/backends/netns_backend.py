@@ -0,0 +1,203 @@
+# src/core/backends/netns_backend.py
+import shlex
+import subprocess
+import threading
+from typing import List, Optional, Set
+
+from src.core.backends.base import (
+    ExecBackend,
+    ExecResult,
+    NodeHandle,
+    NodeNotFound,
+    StreamingExec,
+)
+
+
+def _argv(command) -> List[str]:
+    # Strings are split like the docker SDK does, without a shell
+    return shlex.split(command) if isinstance(command, str) else list(command)
+
+
+def _ip_batch(namespace: Optional[str], lines: List[str]) -> ExecResult:
+    """Feed lines to `ip -force -batch -` on the host or in a namespace."""
+    argv = ["ip", "-force", "-batch", "-"]
+    if namespace is not None:
+        argv[1:1] = ["-n", namespace]
+    result = subprocess.run(
+        argv,
+        input="\n".join(lines).encode() + b"\n",
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    return ExecResult(result.returncode, result.stdout)
+
+
+class NamespaceStreamingExec(StreamingExec):
+    # How long a command may take to exit after its output stream ended
+    exit_timeout = 5.0
+
+    def __init__(self, argv: List[str]):
+        self._process = subprocess.Popen(
+            argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        self._drained = False
+
+    def __iter__(self):
+        while True:
+            chunk = self._process.stdout.read1(64 * 1024)
+            if not chunk:
+                self._drained = True
+                return
+            yield chunk
+
+    def close(self):
+        """Reap the command, killing it if reading stopped before its end."""
+        self._process.stdout.close()
+        if self._drained:
+            try:
+                self._process.wait(timeout=self.exit_timeout)
+                return
+            except subprocess.TimeoutExpired:
+                print(f"{self._process.args} did not exit after its output ended")
+        try:
+            self._process.kill()
+        except ProcessLookupError:
+            pass  # Exited in the meantime
+        self._process.wait()
+
+    def exit_code(self) -> Optional[int]:
+        """Exit code of the command, None if it is still running.
+
+        The output stream ends when the command closes it, which can be
+        shortly before the process exits.
+        """
+        try:
+            return self._process.wait(timeout=self.exit_timeout)
+        except subprocess.TimeoutExpired:
+            return None
+
+
+class NamespaceNode(NodeHandle):
+    """A test node living in a network namespace of the host."""
+
+    def __init__(self, name: str, namespace: str):
+        self.name = name
+        self.namespace = namespace
+
+    def _wrap(self, command) -> List[str]:
+        return ["ip", "netns", "exec", self.namespace, *_argv(command)]
+
+    def exec_run(self, command) -> ExecResult:
+        result = subprocess.run(
+            self._wrap(command), stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        return ExecResult(result.returncode, result.stdout)
+
+    def exec_stream(self, command) -> StreamingExec:
+        return NamespaceStreamingExec(self._wrap(command))
+
+    def exec_ip_batch(self, lines: List[str]) -> ExecResult:
+        return _ip_batch(self.namespace, lines)
+
+
+class NamespaceBackend(ExecBackend):
+    """Runs commands directly in host network namespaces, without a daemon.
+
+    Requires root (or CAP_SYS_ADMIN and CAP_NET_ADMIN). `build_topology` wires
+    the namespaces of a Topology to a shared bridge through veth pairs.
+    """
+
+    def __init__(self, name_pattern: str, project: str):
+        self.name_pattern = name_pattern
+        self.project = project
+        # Like ContainerRegistry, lookups are served from memory and the
+        # namespaces are only listed again when a node is missing
+        self._known: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def namespace(self, node: str) -> str:
+        return self.name_pattern.format(project=self.project, node=node)
+
+    def _namespaces(self) -> List[str]:
+        result = subprocess.run(
+            ["ip", "netns", "list"], stdout=subprocess.PIPE, text=True, check=True
+        )
+        return [line.split()[0] for line in result.stdout.splitlines() if line]
+
+    def refresh(self):
+        """Reload the host's namespaces in one list call."""
+        namespaces = set(self._namespaces())
+        with self._lock:
+            self._known = namespaces
+
+    def _is_known(self, namespace: str) -> bool:
+        with self._lock:
+            return namespace in self._known
+
+    def get(self, node: str) -> NodeHandle:
+        namespace = self.namespace(node)
+        if not self._is_known(namespace):
+            # The namespace may have been created since the last listing
+            self.refresh()
+            if not self._is_known(namespace):
+                raise NodeNotFound(node)
+        return NamespaceNode(node, namespace)
+
+    def invalidate(self, node: Optional[str] = None):
+        with self._lock:
+            if node is None:
+                self._known.clear()
+            else:
+                self._known.discard(self.namespace(node))
+
+    def build_topology(self, topology, bridge: str = "ntf-br0"):
+        """Create a namespace per node, attached to `bridge` as eth0."""
+        prefixlen = topology.subnet.split("/")[1]
+        self.refresh()
+        bridge_lines = [f"link set {bridge} up"]
+        if not self._link_exists(bridge):
+            bridge_lines.insert(0, f"link add {bridge} type bridge")
+        self._require_ip_batch(None, bridge_lines)
+        for index, (node, address) in enumerate(topology.nodes.items()):
+            namespace = self.namespace(node)
+            if self._is_known(namespace):
+                continue
+            subprocess.run(["ip", "netns", "add", namespace], check=True)
+            with self._lock:
+                self._known.add(namespace)
+            host_end = f"ntf{index}"
+            self._require_ip_batch(
+                None,
+                [
+                    f"link add {host_end} type veth peer name eth0 netns {namespace}",
+                    f"link set {host_end} master {bridge}",
+                    f"link set {host_end} up",
+                ],
+            )
+            self._require_ip_batch(
+                namespace,
+                [
+                    "link set lo up",
+                    f"addr add {address}/{prefixlen} dev eth0",
+                    "link set eth0 up",
+                ],
+            )
+
+    @staticmethod
+    def _link_exists(name: str) -> bool:
+        result = subprocess.run(
+            ["ip", "link", "show", name],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        return result.returncode == 0
+
+    @staticmethod
+    def _require_ip_batch(namespace: Optional[str], lines: List[str]):
+        result = _ip_batch(namespace, lines)
+        if result.exit_code != 0:
+            where = f" in {namespace}" if namespace else ""
+            raise Exception(
+                f"ip -batch failed{where} with exit code {result.exit_code}: "
+                f"{result.output.decode(errors='replace').strip()}"
+            )
@@ -0,0 +1,735 @@
+# src/core/backends/simulated.py
+import ipaddress
+import json
+import shlex
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.core.backends.base import (
+    ExecBackend,
+    ExecResult,
+    NodeHandle,
+    NodeNotFound,
+    StreamingExec,
+)
+from src.core.batch import BatchEntry
+
+# Segment shared by the eth0 interfaces of all nodes, like the compose network
+LAN = ("lan",)
+
+_OBJECTS = {
+    "link": "link",
+    "l": "link",
+    "li": "link",
+    "lin": "link",
+    "addr": "addr",
+    "address": "addr",
+    "a": "addr",
+    "ad": "addr",
+    "route": "route",
+    "r": "route",
+    "ro": "route",
+    "rou": "route",
+}
+
+
+class CommandError(Exception):
+    """A simulated command failure, carrying ip/ping style output."""
+
+    def __init__(self, message: str, exit_code: int = 1):
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+@dataclass
+class SimInterface:
+    name: str
+    index: int
+    mac: str
+    link_type: str = "ether"
+    parent: Optional[str] = None
+    vlan_id: Optional[int] = None
+    up: bool = False
+    mtu: int = 1500
+    addresses: List[ipaddress.IPv4Interface] = field(default_factory=list)
+
+
+@dataclass
+class SimRoute:
+    dst: str  # prefix or "default"
+    dev: str
+    gateway: Optional[str] = None
+
+
+class SimNode:
+    def __init__(self, name: str, node_index: int):
+        self.name = name
+        self.node_index = node_index
+        self.interfaces: Dict[str, SimInterface] = {}
+        self.routes: List[SimRoute] = []  # Static routes; connected ones derive
+        self._next_index = 1
+
+    def add_interface(self, name: str, **kwargs) -> SimInterface:
+        index = self._next_index
+        self._next_index += 1
+        mac = (
+            f"02:42:ac:{self.node_index % 256:02x}:{index // 256:02x}:{index % 256:02x}"
+        )
+        interface = SimInterface(name=name, index=index, mac=mac, **kwargs)
+        self.interfaces[name] = interface
+        return interface
+
+    def device(self, name: str) -> SimInterface:
+        if name not in self.interfaces:
+            raise CommandError(f'Cannot find device "{name}"', 1)
+        return self.interfaces[name]
+
+
+class SimulatedNetwork:
+    """In-memory model of the nodes' interfaces, VLANs, routes and reachability.
+
+    It understands the `ip` and `ping` invocations the framework issues and
+    answers them with output in iproute2/iputils format, so the test suite can
+    run without containers.
+    """
+
+    base_rtt_ms = 0.05
+
+    def __init__(self, topology):
+        self.lock = threading.RLock()
+        self.listeners = set()  # (node, port) of running iperf3 servers
+        self.nodes: Dict[str, SimNode] = {}
+        network = ipaddress.ip_network(topology.subnet)
+        gateway = str(next(network.hosts()))
+        for node_index, (name, address) in enumerate(topology.nodes.items()):
+            node = SimNode(name, node_index)
+            node.add_interface("lo", link_type="loopback", up=True, mtu=65536)
+            node.interfaces["lo"].addresses.append(
+                ipaddress.ip_interface("127.0.0.1/8")
+            )
+            eth0 = node.add_interface("eth0", up=True)
+            eth0.addresses.append(
+                ipaddress.ip_interface(f"{address}/{network.prefixlen}")
+            )
+            node.routes.append(SimRoute("default", "eth0", gateway))
+            self.nodes[name] = node
+
+    # Topology model
+
+    def _operational(self, node: SimNode, interface: SimInterface) -> bool:
+        if not interface.up:
+            return False
+        if interface.parent is None:
+            return True
+        return self._operational(node, node.interfaces[interface.parent])
+
+    def _segment(self, node: SimNode, interface: SimInterface) -> Tuple:
+        if interface.link_type == "loopback":
+            return ("loopback", node.name)
+        if interface.parent is not None:
+            parent = node.interfaces[interface.parent]
+            return self._segment(node, parent) + (interface.vlan_id,)
+        if interface.name == "eth0":
+            return LAN
+        return ("isolated", node.name, interface.name)
+
+    def reachable(
+        self, source: str, target_ip: str, bind: Optional[str] = None
+    ) -> bool:
+        """Whether `source` gets replies from `target_ip`, optionally via `bind`."""
+        target = ipaddress.ip_address(target_ip)
+        node = self.nodes[source]
+        interfaces = [node.device(bind)] if bind else list(node.interfaces.values())
+
+        for interface in interfaces:
+            if not self._operational(node, interface):
+                continue
+            if any(address.ip == target for address in interface.addresses):
+                return True
+            on_link = bind is not None or any(
+                target in address.network for address in interface.addresses
+            )
+            if not on_link:
+                continue
+
+            segment = self._segment(node, interface)
+            for peer in self.nodes.values():
+                for peer_interface in peer.interfaces.values():
+                    if (
+                        self._operational(peer, peer_interface)
+                        and self._segment(peer, peer_interface) == segment
+                        and any(a.ip == target for a in peer_interface.addresses)
+                    ):
+                        return True
+        return False
+
+    def rtt(self, source: str, target_ip: str, seq: int) -> float:
+        jitter = (zlib.crc32(f"{source}>{target_ip}".encode()) % 20) / 1000
+        return round(self.base_rtt_ms + jitter + (seq % 3) / 1000, 3)
+
+    # Command dispatch
+
+    def run(self, node_name: str, argv: List[str]) -> Tuple[int, str]:
+        if not argv:
+            return 0, ""
+        program, args = argv[0], argv[1:]
+        handler = {
+            "ip": self._ip,
+            "ping": self._ping,
+            "iperf3": self._iperf3,
+            "echo": lambda node, args: " ".join(args) + "\n",
+            "true": lambda node, args: "",
+            "sleep": lambda node, args: "",
+        }.get(program)
+        if program == "false":
+            return 1, ""
+        if handler is None:
+            return 127, f"sh: {program}: not found\n"
+
+        with self.lock:
+            try:
+                return 0, handler(self.nodes[node_name], args)
+            except CommandError as e:
+                return e.exit_code, f"{e}\n"
+
+    def run_script(self, node_name: str, script: str) -> Tuple[int, str]:
+        """Run a `sh -c` script of simple commands separated by newlines or `;`."""
+        exit_code, output = 0, []
+        for line in script.splitlines():
+            for part in line.split(";"):
+                if part.strip():
+                    exit_code, text = self.run(node_name, shlex.split(part))
+                    output.append(text)
+        return exit_code, "".join(output)
+
+    def run_ip_batch(self, node_name: str, lines: List[str]) -> Tuple[int, str]:
+        """Emulate `ip -force -batch -`: keep going and report failing lines."""
+        exit_code, output = 0, []
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            code, text = self.run(node_name, ["ip", *shlex.split(line)])
+            output.append(text)
+            if code != 0:
+                exit_code = 1
+                output.append(f"Command failed -:{line_number}\n")
+        return exit_code, "".join(output)
+
+    # ip
+
+    def _ip(self, node: SimNode, args: List[str]) -> str:
+        options = set()
+        while args and args[0].startswith("-"):
+            option = args.pop(0)
+            options.add({"-json": "-j", "-details": "-d"}.get(option, option))
+        if not args:
+            raise CommandError("Usage: ip [ OPTIONS ] OBJECT { COMMAND | help }", 255)
+
+        obj = _OBJECTS.get(args[0])
+        if obj is None:
+            raise CommandError(f'Object "{args[0]}" is unknown, try "ip help".', 255)
+        command = args[1] if len(args) > 1 else "show"
+        rest = args[2:]
+        if command == "list":
+            command = "show"
+
+        if obj == "link":
+            return self._ip_link(node, command, rest, options)
+        if obj == "addr":
+            return self._ip_addr(node, command, rest, options)
+        return self._ip_route(node, command, rest, options)
+
+    def _ip_link(self, node: SimNode, command: str, args: List[str], options) -> str:
+        params = _keywords(args)
+        if command == "add":
+            name = params.get("name") or params.get("dev")
+            parent = node.device(params["link"]) if "link" in params else None
+            if params.get("type") != "vlan" or parent is None:
+                raise CommandError("Error: Unknown device type.", 2)
+            vlan_id = int(params["id"])
+            if name in node.interfaces or any(
+                i.parent == parent.name and i.vlan_id == vlan_id
+                for i in node.interfaces.values()
+            ):
+                raise CommandError("RTNETLINK answers: File exists", 2)
+            node.add_interface(
+                name, link_type="ether", parent=parent.name, vlan_id=vlan_id
+            )
+            return ""
+
+        if command in ("delete", "del"):
+            interface = node.device(params.get("dev") or args[0])
+            for child in [
+                i for i in node.interfaces.values() if i.parent == interface.name
+            ]:
+                del node.interfaces[child.name]
+            del node.interfaces[interface.name]
+            node.routes = [r for r in node.routes if r.dev in node.interfaces]
+            return ""
+
+        if command == "set":
+            interface = node.device(params.get("dev") or args[0])
+            if "up" in args:
+                interface.up = True
+            if "down" in args:
+                interface.up = False
+            if "mtu" in params:
+                interface.mtu = int(params["mtu"])
+            return ""
+
+        if command == "show":
+            interfaces = self._select(node, args, params)
+            if "-j" in options:
+                return json.dumps(
+                    [self._link_json(node, i, "-d" in options) for i in interfaces]
+                )
+            return "".join(
+                self._link_text(node, i, "-d" in options, with_addresses=False)
+                for i in interfaces
+            )
+        raise CommandError(f'Command "{command}" is unknown, try "ip link help".', 255)
+
+    def _ip_addr(self, node: SimNode, command: str, args: List[str], options) -> str:
+        params = _keywords(args)
+        if command in ("add", "del", "delete"):
+            address = ipaddress.ip_interface(args[0])
+            interface = node.device(params["dev"])
+            if command == "add":
+                if address in interface.addresses:
+                    raise CommandError("RTNETLINK answers: File exists", 2)
+                interface.addresses.append(address)
+            else:
+                if address not in interface.addresses:
+                    raise CommandError(
+                        "RTNETLINK answers: Cannot assign requested address", 2
+                    )
+                interface.addresses.remove(address)
+            return ""
+
+        if command == "show":
+            interfaces = self._select(node, args, params)
+            if "-j" in options:
+                return json.dumps([self._addr_json(node, i) for i in interfaces])
+            return "".join(
+                self._link_text(node, i, "-d" in options, with_addresses=True)
+                for i in interfaces
+            )
+        raise CommandError(
+            f'Command "{command}" is unknown, try "ip address help".', 255
+        )
+
+    def _ip_route(self, node: SimNode, command: str, args: List[str], options) -> str:
+        params = _keywords(args)
+        if command in ("add", "del", "delete", "replace"):
+            dst = (
+                args[0] if args[0] == "default" else str(ipaddress.ip_network(args[0]))
+            )
+            dev = params.get("dev") or "eth0"
+            node.device(dev)
+            existing = [r for r in node.routes if r.dst == dst]
+            if command == "add" and existing:
+                raise CommandError("RTNETLINK answers: File exists", 2)
+            if command in ("del", "delete") and not existing:
+                raise CommandError("RTNETLINK answers: No such process", 2)
+            node.routes = [r for r in node.routes if r.dst != dst]
+            if command != "del" and command != "delete":
+                node.routes.append(SimRoute(dst, dev, params.get("via")))
+            return ""
+
+        if command == "show":
+            routes = self._routes(node)
+            if "-j" in options:
+                return json.dumps(routes)
+            return "".join(_route_text(route) + "\n" for route in routes)
+        raise CommandError(f'Command "{command}" is unknown, try "ip route help".', 255)
+
+    def _select(self, node: SimNode, args: List[str], params) -> List[SimInterface]:
+        if params.get("type") == "vlan":
+            return [i for i in node.interfaces.values() if i.vlan_id is not None]
+        name = params.get("dev") or next(
+            (a for a in args if a not in ("dev", "type", "up")), None
+        )
+        if name is not None:
+            return [node.device(name)]
+        return sorted(node.interfaces.values(), key=lambda i: i.index)
+
+    def _routes(self, node: SimNode) -> List[Dict]:
+        routes = []
+        for route in node.routes:
+            if route.dst == "default" and route.dev in node.interfaces:
+                routes.append(
+                    {"dst": "default", "gateway": route.gateway, "dev": route.dev}
+                )
+        for interface in sorted(node.interfaces.values(), key=lambda i: i.index):
+            if interface.link_type == "loopback" or not self._operational(
+                node, interface
+            ):
+                continue
+            for address in interface.addresses:
+                routes.append(
+                    {
+                        "dst": str(address.network),
+                        "dev": interface.name,
+                        "protocol": "kernel",
+                        "scope": "link",
+                        "prefsrc": str(address.ip),
+                    }
+                )
+        for route in node.routes:
+            if route.dst != "default":
+                entry = {"dst": route.dst, "dev": route.dev}
+                if route.gateway:
+                    entry["gateway"] = route.gateway
+                routes.append(entry)
+        for entry in routes:
+            entry["flags"] = []
+        return routes
+
+    def _flags(self, node: SimNode, interface: SimInterface) -> List[str]:
+        if interface.link_type == "loopback":
+            return ["LOOPBACK", "UP", "LOWER_UP"]
+        flags = ["BROADCAST", "MULTICAST"]
+        if interface.up:
+            flags.append("UP")
+            if self._operational(node, interface):
+                flags.append("LOWER_UP")
+        return flags
+
+    def _operstate(self, node: SimNode, interface: SimInterface) -> str:
+        if interface.link_type == "loopback":
+            return "UNKNOWN"
+        if self._operational(node, interface):
+            return "UP"
+        return "LOWERLAYERDOWN" if interface.up else "DOWN"
+
+    def _link_json(self, node: SimNode, interface: SimInterface, details: bool) -> Dict:
+        link = {
+            "ifindex": interface.index,
+            "ifname": interface.name,
+            "flags": self._flags(node, interface),
+            "mtu": interface.mtu,
+            "qdisc": "noqueue",
+            "operstate": self._operstate(node, interface),
+            "link_type": interface.link_type,
+            "address": interface.mac,
+            "broadcast": "ff:ff:ff:ff:ff:ff",
+        }
+        if interface.parent is not None:
+            link["link"] = interface.parent
+        if details and interface.vlan_id is not None:
+            link["linkinfo"] = {
+                "info_kind": "vlan",
+                "info_data": {
+                    "protocol": "802.1Q",
+                    "id": interface.vlan_id,
+                    "flags": ["REORDER_HDR"],
+                },
+            }
+        return link
+
+    def _addr_json(self, node: SimNode, interface: SimInterface) -> Dict:
+        link = self._link_json(node, interface, details=False)
+        link["addr_info"] = [
+            {
+                "family": "inet",
+                "local": str(address.ip),
+                "prefixlen": address.network.prefixlen,
+                "broadcast": str(address.network.broadcast_address),
+                "scope": "host" if interface.link_type == "loopback" else "global",
+                "label": interface.name,
+            }
+            for address in interface.addresses
+        ]
+        return link
+
+    def _link_text(
+        self,
+        node: SimNode,
+        interface: SimInterface,
+        details: bool,
+        with_addresses: bool,
+    ) -> str:
+        name = interface.name
+        if interface.parent is not None:
+            name += f"@{interface.parent}"
+        flags = ",".join(self._flags(node, interface))
+        lines = [
+            f"{interface.index}: {name}: <{flags}> mtu {interface.mtu} qdisc noqueue "
+            f"state {self._operstate(node, interface)} qlen 1000",
+            f"    link/{interface.link_type} {interface.mac} brd ff:ff:ff:ff:ff:ff",
+        ]
+        if details and interface.vlan_id is not None:
+            lines.append(
+                f"    vlan protocol 802.1Q id {interface.vlan_id} <REORDER_HDR>"
+            )
+        if with_addresses:
+            for address in interface.addresses:
+                lines.append(
+                    f"    inet {address} brd {address.network.broadcast_address} "
+                    f"scope global {interface.name}"
+                )
+                lines.append("       valid_lft forever preferred_lft forever")
+        return "\n".join(lines) + "\n"
+
+    # ping
+
+    def _ping(self, node: SimNode, args: List[str]) -> str:
+        options, target = _ping_options(args)
+        if target is None:
+            raise CommandError("ping: usage error: Destination address required", 2)
+        try:
+            ipaddress.ip_address(target)
+        except ValueError:
+            raise CommandError(f"ping: {target}: Name or service not known", 2)
+        bind = options.get("-I")
+        if bind is not None and bind not in node.interfaces:
+            raise CommandError(f"ping: SO_BINDTODEVICE {bind}: No such device", 2)
+
+        count = int(options["-c"]) if "-c" in options else None
+        interval = float(options.get("-i", 1.0))
+        deadline = float(options["-w"]) if "-w" in options else None
+        reachable = self.reachable(node.name, target, bind)
+
+        if not reachable and deadline is not None:
+            # Without replies, ping keeps probing every interval until the deadline
+            transmitted = max(1, int(deadline / interval))
+        else:
+            transmitted = count or 4
+        received = transmitted if reachable else 0
+
+        lines = [f"PING {target} ({target}) 56(84) bytes of data."]
+        rtts = [self.rtt(node.name, target, seq) for seq in range(1, received + 1)]
+        if "-q" not in options:
+            for seq, rtt in enumerate(rtts, start=1):
+                lines.append(
+                    f"64 bytes from {target}: icmp_seq={seq} ttl=64 time={rtt} ms"
+                )
+        loss = 100 - int(received * 100 / transmitted)
+        elapsed = int((transmitted - 1) * interval * 1000)
+        lines += [
+            "",
+            f"--- {target} ping statistics ---",
+            f"{transmitted} packets transmitted, {received} received, "
+            f"{loss}% packet loss, time {elapsed}ms",
+        ]
+        if rtts:
+            mean = sum(rtts) / len(rtts)
+            mdev = (sum((r - mean) ** 2 for r in rtts) / len(rtts)) ** 0.5
+            lines.append(
+                f"rtt min/avg/max/mdev = {min(rtts):.3f}/{mean:.3f}/"
+                f"{max(rtts):.3f}/{mdev:.3f} ms"
+            )
+        output = "\n".join(lines) + "\n"
+        if not reachable:
+            raise CommandError(output.rstrip("\n"), 1)
+        return output
+
+    # iperf3
+
+    link_rate_bps = 10e9
+    udp_packet_size = 1448
+
+    def _iperf3(self, node: SimNode, args: List[str]) -> str:
+        options = _iperf3_options(args)
+        port = int(options.get("-p", 5201))
+        if "-s" in options:
+            self.listeners.add((node.name, port))
+            return ""
+
+        target_ip = options["-c"]
+        owner = next(
+            (
+                peer.name
+                for peer in self.nodes.values()
+                for interface in peer.interfaces.values()
+                if any(str(a.ip) == target_ip for a in interface.addresses)
+            ),
+            None,
+        )
+        if (
+            owner is None
+            or (owner, port) not in self.listeners
+            or not self.reachable(node.name, target_ip, options.get("--bind-dev"))
+        ):
+            raise CommandError(
+                json.dumps(
+                    {
+                        "start": {},
+                        "intervals": [],
+                        "end": {},
+                        "error": "unable to connect to server: Connection refused",
+                    }
+                ),
+                1,
+            )
+        self.listeners.discard((owner, port))
+        return json.dumps(_iperf3_report(options, self.link_rate_bps))
+
+
+def _iperf3_options(args: List[str]) -> Dict[str, str]:
+    options, iterator = {}, iter(args)
+    for arg in iterator:
+        if arg in ("-c", "-p", "-t", "-P", "-b", "-i", "--bind-dev"):
+            options[arg] = next(iterator, "")
+        else:
+            options[arg] = ""
+    return options
+
+
+def _iperf3_report(options: Dict[str, str], link_rate_bps: float) -> Dict:
+    """Build an iperf3 -J client report for traffic at the simulated rate."""
+    duration = int(options.get("-t", 10))
+    streams = int(options.get("-P", 1))
+    udp = "-u" in options
+    if udp:
+        rate = options.get("-b", "1M")
+        scale = {"K": 1e3, "M": 1e6, "G": 1e9}.get(rate[-1:].upper(), 1)
+        bps = min(float(rate.rstrip("KkMmGg")) * scale, link_rate_bps)
+    else:
+        bps = link_rate_bps
+    pps = bps / (SimulatedNetwork.udp_packet_size * 8)
+
+    def interval_sum(start: int, seconds: float) -> Dict:
+        total = {
+            "start": start,
+            "end": start + seconds,
+            "seconds": seconds,
+            "bytes": int(bps * seconds / 8),
+            "bits_per_second": bps,
+            "omitted": False,
+        }
+        if udp:
+            total["packets"] = int(pps * seconds)
+        else:
+            total["retransmits"] = 0
+        return total
+
+    report = {
+        "start": {
+            "test_start": {
+                "protocol": "UDP" if udp else "TCP",
+                "num_streams": streams,
+                "duration": duration,
+            }
+        },
+        "intervals": [
+            {"streams": [], "sum": interval_sum(second, 1.0)}
+            for second in range(duration)
+        ],
+    }
+    total = interval_sum(0, float(duration))
+    if udp:
+        total.update(jitter_ms=0.01, lost_packets=0, lost_percent=0.0)
+        report["end"] = {"sum": total}
+        if "--get-server-output" in options:
+            report["server_output_json"] = {
+                "intervals": [
+                    {"sum": {**interval["sum"], "lost_packets": 0, "lost_percent": 0.0}}
+                    for interval in report["intervals"]
+                ]
+            }
+    else:
+        report["end"] = {"sum_sent": total, "sum_received": dict(total)}
+    return report
+
+
+def _keywords(args: List[str]) -> Dict[str, str]:
+    """Map `keyword value` pairs of an ip command line."""
+    return {args[i]: args[i + 1] for i in range(len(args) - 1)}
+
+
+def _route_text(route: Dict) -> str:
+    parts = [route["dst"]]
+    if route.get("gateway"):
+        parts.append(f"via {route['gateway']}")
+    parts.append(f"dev {route['dev']}")
+    if route.get("protocol"):
+        parts.append(f"proto {route['protocol']}")
+    if route.get("scope"):
+        parts.append(f"scope {route['scope']}")
+    if route.get("prefsrc"):
+        parts.append(f"src {route['prefsrc']}")
+    return " ".join(parts)
+
+
+def _ping_options(args: List[str]) -> Tuple[Dict[str, str], Optional[str]]:
+    options, target = {}, None
+    iterator = iter(args)
+    for arg in iterator:
+        if arg in ("-q", "-n"):
+            options[arg] = ""
+        elif arg.startswith("-"):
+            options[arg[:2]] = arg[2:] or next(iterator, "")
+        else:
+            target = arg
+    return options, target
+
+
+class SimulatedStreamingExec(StreamingExec):
+    def __init__(self, result: ExecResult):
+        self._result = result
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter([self._result.output])
+
+    def close(self):
+        pass
+
+    def exit_code(self) -> Optional[int]:
+        return self._result.exit_code
+
+
+class SimulatedNode(NodeHandle):
+    """A node of the simulated network."""
+
+    def __init__(self, name: str, network: SimulatedNetwork):
+        self.name = name
+        self.network = network
+
+    def exec_run(self, command) -> ExecResult:
+        argv = shlex.split(command) if isinstance(command, str) else list(command)
+        if argv[:2] == ["sh", "-c"] and len(argv) > 2:
+            exit_code, output = self.network.run_script(self.name, argv[2])
+        else:
+            exit_code, output = self.network.run(self.name, argv)
+        return ExecResult(exit_code, output.encode())
+
+    def exec_stream(self, command) -> StreamingExec:
+        return SimulatedStreamingExec(self.exec_run(command))
+
+    def exec_batch(self, commands: List[str], parallel: int = 1):
+        entries = []
+        for command in commands:
+            result = self.exec_run(["sh", "-c", command])
+            entries.append(
+                BatchEntry(command, result.exit_code, result.output.decode(), 0.0)
+            )
+        return entries
+
+    def exec_ip_batch(self, lines: List[str]) -> ExecResult:
+        exit_code, output = self.network.run_ip_batch(self.name, lines)
+        return ExecResult(exit_code, output.encode())
+
+
+class SimulatedBackend(ExecBackend):
+    """Backend answering commands from an in-memory SimulatedNetwork.
+
+    Every backend created for the same topology in a process shares one
+    network, the way test classes share the same containers.
+    """
+
+    _networks: Dict[str, SimulatedNetwork] = {}
+    _networks_lock = threading.Lock()
+
+    def __init__(self, topology):
+        with self._networks_lock:
+            if topology.hash not in self._networks:
+                self._networks[topology.hash] = SimulatedNetwork(topology)
+            self.network = self._networks[topology.hash]
+
+    def get(self, node: str) -> NodeHandle:
+        if node not in self.network.nodes:
+            raise NodeNotFound(node)
+        return SimulatedNode(node, self.network)
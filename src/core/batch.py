@@ -0,0 +1,106 @@
+# src/core/batch.py
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass
+class BatchEntry:
+    """Result of a single command executed as part of a batch."""
+
+    command: str
+    exit_code: int
+    output: str
+    duration: float
+
+
+def build_batch_script(commands: List[str], token: str, parallel: int = 1) -> str:
+    """Build a shell script running commands, delimited by markers.
+
+    Every command's output is followed by a marker line carrying its exit code
+    and start/end timestamps, so the combined output can be split back per
+    command. With parallel > 1 the commands run in background waves of that
+    size, writing to temporary files that are printed in order at the end.
+    """
+    marker = f'printf "\\n{token}:%s:%s:%s\\n"'
+    if parallel <= 1:
+        return "\n".join(
+            f"s=$(date +%s.%N); {{ {command}\n}} 2>&1; rc=$?; "
+            f'{marker} "$rc" "$s" "$(date +%s.%N)"'
+            for command in commands
+        )
+
+    lines = ["d=$(mktemp -d)"]
+    for index, command in enumerate(commands):
+        lines.append(
+            f'( s=$(date +%s.%N); {{ {command}\n}} > "$d/{index}" 2>&1; '
+            f'echo "$? $s $(date +%s.%N)" > "$d/{index}.rc" ) &'
+        )
+        if (index + 1) % parallel == 0:
+            lines.append("wait")
+    lines.append("wait")
+    for index in range(len(commands)):
+        lines.append(
+            f'cat "$d/{index}"; read rc s e < "$d/{index}.rc"; '
+            f'{marker} "$rc" "$s" "$e"'
+        )
+    lines.append('rm -rf "$d"')
+    return "\n".join(lines)
+
+
+def parse_batch_output(
+    commands: List[str], output: str, token: str, total_duration: float
+) -> List[BatchEntry]:
+    """Split the output of a batch script into one entry per command."""
+    marker = re.compile(rf"(?:^|\n){re.escape(token)}:([^:\n]*):([^:\n]*):([^\n]*)\n")
+    parts = marker.split(output)
+    # parts: [out1, rc1, start1, end1, out2, rc2, start2, end2, ..., trailer]
+    segments = [tuple(parts[i : i + 4]) for i in range(0, len(parts) - 1, 4)]
+
+    fallback_duration = total_duration / len(commands) if commands else 0.0
+    entries = []
+    for index, command in enumerate(commands):
+        if index >= len(segments):
+            # The script stopped before reaching this command
+            trailer = parts[-1] if index == len(segments) else ""
+            entries.append(BatchEntry(command, -1, trailer, 0.0))
+            continue
+
+        segment, exit_code, start, end = segments[index]
+        start, end = _parse_timestamp(start), _parse_timestamp(end)
+        entries.append(
+            BatchEntry(
+                command=command,
+                exit_code=int(exit_code) if exit_code.lstrip("-").isdigit() else -1,
+                output=segment,
+                duration=(
+                    end - start
+                    if start is not None and end is not None
+                    else fallback_duration
+                ),
+            )
+        )
+    return entries
+
+
+def _parse_timestamp(value: str):
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def run_batch(container, commands: List[str], parallel: int = 1) -> List[BatchEntry]:
+    """Run several commands in a container using a single exec."""
+    token = f"__NTF_{uuid.uuid4().hex}__"
+    script = build_batch_script(commands, token, parallel)
+
+    start_time = time.time()
+    result = container.exec_run(["sh", "-c", script])
+    duration = time.time() - start_time
+
+    return parse_batch_output(
+        commands, result.output.decode("utf-8", errors="replace"), token, duration
+    )
@@ -0,0 +1,81 @@
+# src/core/blobs.py
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+class BlobStore:
+    """Append-only, content-addressed store for command outputs.
+
+    Blobs are appended to `<name>.blob` in the execution directory and indexed
+    by the SHA-256 of their content in `<name>.idx` (one JSON line per blob), so
+    identical outputs are stored once. Lookups also consult the index files of
+    other writers in the same directory, e.g. parallel worker processes.
+    """
+
+    def __init__(self, directory: Path, name: str = "command_output"):
+        self.directory = Path(directory)
+        self.blob_path = self.directory / f"{name}.blob"
+        self.index_path = self.directory / f"{name}.idx"
+        # ref -> (blob file, offset, length)
+        self._index: Dict[str, Tuple[Path, int, int]] = {}
+        self._lock = threading.Lock()
+        self._blob_file = None
+        self._index_file = None
+
+    def put(self, text: str) -> str:
+        """Store a text blob and return its reference."""
+        data = text.encode("utf-8")
+        ref = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if ref in self._index:
+                return ref
+            if self._blob_file is None:
+                self._blob_file = open(self.blob_path, "ab")
+                self._index_file = open(self.index_path, "a")
+
+            offset = self._blob_file.tell()
+            self._blob_file.write(data)
+            self._blob_file.flush()
+            self._index_file.write(
+                json.dumps({"ref": ref, "offset": offset, "length": len(data)}) + "\n"
+            )
+            self._index_file.flush()
+            self._index[ref] = (self.blob_path, offset, len(data))
+        return ref
+
+    def get(self, ref: Optional[str]) -> Optional[str]:
+        """Read a blob back, or None if the reference is unknown."""
+        if ref is None:
+            return None
+        with self._lock:
+            if ref not in self._index:
+                self._load_indexes()
+            location = self._index.get(ref)
+        if location is None:
+            return None
+
+        blob_path, offset, length = location
+        with open(blob_path, "rb") as f:
+            f.seek(offset)
+            return f.read(length).decode("utf-8")
+
+    def _load_indexes(self):
+        for index_path in self.directory.glob("*.idx"):
+            blob_path = index_path.with_suffix(".blob")
+            with open(index_path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._index.setdefault(
+                            entry["ref"], (blob_path, entry["offset"], entry["length"])
+                        )
+
+    def close(self):
+        with self._lock:
+            if self._blob_file is not None:
+                self._blob_file.close()
+                self._index_file.close()
+                self._blob_file = self._index_file = None
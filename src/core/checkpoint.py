@@ -0,0 +1,107 @@
+# src/core/checkpoint.py
+import hashlib
+import ipaddress
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from src.core.snapshot import InterfaceState, NodeSnapshot
+
+
+@dataclass
+class InterfaceSpec:
+    """Desired state of a stacked interface, e.g. a VLAN on eth0."""
+
+    name: str
+    parent: str
+    vlan_id: int
+    addresses: List[str] = field(default_factory=list)  # CIDRs, e.g. 10.0.0.1/24
+
+
+@dataclass
+class Checkpoint:
+    """Interface, VLAN and address state the nodes of a test should be in.
+
+    A checkpoint owns every VLAN interface of the nodes it lists: live VLANs it
+    does not declare, such as leftovers of a crashed run, are deleted when it
+    is applied. Everything else (eth0, lo, routes) is left alone.
+    """
+
+    name: str
+    nodes: Dict[str, List[InterfaceSpec]]  # node -> interfaces
+
+    @property
+    def hash(self) -> str:
+        """Stable hash of the desired state."""
+        data = json.dumps(
+            {
+                node: sorted((asdict(spec) for spec in specs), key=lambda s: s["name"])
+                for node, specs in self.nodes.items()
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+
+def _managed_addresses(interface: InterfaceState) -> List[str]:
+    # IPv6 link-local addresses are assigned by the kernel, not by checkpoints
+    return [
+        address.cidr
+        for address in interface.addresses
+        if not ipaddress.ip_address(address.local).is_link_local
+    ]
+
+
+def _matches(spec: InterfaceSpec, live: Optional[InterfaceState]) -> bool:
+    return (
+        live is not None
+        and live.kind == "vlan"
+        and live.parent == spec.parent
+        and live.vlan_id == spec.vlan_id
+    )
+
+
+def plan_changes(specs: List[InterfaceSpec], live: NodeSnapshot) -> List[str]:
+    """`ip -batch` lines taking a node from its live state to the desired one.
+
+    Returns no lines when the node is already in the desired state.
+    """
+    wanted = {spec.name: spec for spec in specs}
+    deletes = []
+    adds = []
+    for interface in live.interfaces.values():
+        if interface.kind != "vlan":
+            continue
+        spec = wanted.get(interface.name)
+        if spec is None or not _matches(spec, interface):
+            deletes.append(f"link delete {interface.name}")
+
+    for spec in specs:
+        interface = live.interface(spec.name)
+        if not _matches(spec, interface):
+            if interface is not None and interface.kind != "vlan":
+                raise Exception(
+                    f"{live.node}: {spec.name} exists and is not a VLAN interface"
+                )
+            adds.append(
+                f"link add link {spec.parent} name {spec.name}"
+                f" type vlan id {spec.vlan_id}"
+            )
+            adds.extend(f"addr add {cidr} dev {spec.name}" for cidr in spec.addresses)
+            adds.append(f"link set {spec.name} up")
+            continue
+
+        current = _managed_addresses(interface)
+        adds.extend(
+            f"addr del {cidr} dev {spec.name}"
+            for cidr in current
+            if cidr not in spec.addresses
+        )
+        adds.extend(
+            f"addr add {cidr} dev {spec.name}"
+            for cidr in spec.addresses
+            if cidr not in current
+        )
+        if not interface.is_up:
+            adds.append(f"link set {spec.name} up")
+    return deletes + adds
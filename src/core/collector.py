@@ -0,0 +1,146 @@
+# src/core/collector.py
+import os
+import secrets
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Set for worker processes: where their results should be sent, and the key
+# authenticating them to the collector
+COLLECTOR_ADDRESS_ENV = "NETWORK_TEST_COLLECTOR"
+COLLECTOR_KEY_ENV = "NETWORK_TEST_COLLECTOR_KEY"
+
+
+class ResultCollector:
+    """Receives batches of result records from worker processes.
+
+    Listens on a local TCP port; every worker connection is served by its own
+    thread, which hands each record to `on_record`. Workers find the collector
+    through the environment set by `export_env`.
+    """
+
+    def __init__(self, on_record: Callable[[Dict], None]):
+        self.on_record = on_record
+        self.authkey = secrets.token_bytes(16)
+        self._listener = Listener(("127.0.0.1", 0), authkey=self.authkey)
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        self._accept_thread = threading.Thread(target=self._accept, daemon=True)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._listener.address
+
+    def start(self) -> "ResultCollector":
+        self._accept_thread.start()
+        return self
+
+    def export_env(self, env: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Point worker processes started with `env` (default: ours) here."""
+        env = os.environ if env is None else env
+        host, port = self.address
+        env[COLLECTOR_ADDRESS_ENV] = f"{host}:{port}"
+        env[COLLECTOR_KEY_ENV] = self.authkey.hex()
+        return env
+
+    def _accept(self):
+        while True:
+            try:
+                connection = self._listener.accept()
+            except Exception:
+                # Failed handshake, or the listener was closed by stop()
+                if self._stopping:
+                    return
+                continue
+            if self._stopping:
+                connection.close()
+                return
+            thread = threading.Thread(
+                target=self._serve, args=(connection,), daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _serve(self, connection: Connection):
+        with connection:
+            while True:
+                try:
+                    batch = connection.recv()
+                except (EOFError, OSError):
+                    return
+                for record in batch:
+                    self.on_record(record)
+
+    def stop(self, timeout: float = 30.0):
+        """Stop accepting workers and wait for connected ones to disconnect."""
+        self._stopping = True
+        try:
+            # Wake the accept loop up
+            Client(self.address, authkey=self.authkey).close()
+        except OSError:
+            pass
+        self._accept_thread.join(timeout)
+        self._listener.close()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+
+class ResultSender:
+    """Sends result records to a ResultCollector in batches.
+
+    A batch goes out once it holds `batch_size` records or `flush_interval`
+    seconds after the previous one, whichever comes first, and on flush().
+    """
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        authkey: bytes,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+    ):
+        self._connection = Client(address, authkey=authkey)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[Dict] = []
+        self._last_send = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["ResultSender"]:
+        """Connect to the collector named by the environment, if any."""
+        address = os.environ.get(COLLECTOR_ADDRESS_ENV)
+        if not address:
+            return None
+        host, port = address.rsplit(":", 1)
+        authkey = bytes.fromhex(os.environ[COLLECTOR_KEY_ENV])
+        return cls((host, int(port)), authkey)
+
+    def send(self, record: Dict):
+        with self._lock:
+            self._pending.append(record)
+            if (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._last_send >= self.flush_interval
+            ):
+                self._send_pending()
+
+    def flush(self):
+        with self._lock:
+            self._send_pending()
+
+    def _send_pending(self):
+        # Called with the lock held
+        if self._pending and self._connection is not None:
+            self._connection.send(self._pending)
+            self._pending = []
+        self._last_send = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            self._send_pending()
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -1,10 +1,40 @@
 # src/core/config.py
-from dataclasses import dataclass
+import functools
+import hashlib
+import inspect
+import ipaddress
+import os
+import pickle
+import threading
+import typing
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+from src.core.topology import NODE_IMAGE, Topology
+
+# Seconds a test may take when its config does not set a timeout
+DEFAULT_TIMEOUT = 30
+
+# libyaml's loader is much faster than the pure-Python one, when available
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Allowed values of framework settings with a fixed set of choices
+BACKENDS = ("docker", "netns", "simulated")
+KEEP_OUTPUT = ("all", "failures")
+
+# Compiled configs cached on disk are only valid for this version of the
+# modules defining the pickled classes: this one and topology.py
+_SCHEMA_HASH = hashlib.sha256(
+    b"".join(Path(path).read_bytes() for path in (__file__, inspect.getfile(Topology)))
+).hexdigest()[:8]
+
+
+class ConfigError(Exception):
+    """The test configuration is invalid."""
+
 
 @dataclass
 class NetworkConfig:
@@ -13,47 +43,384 @@ class NetworkConfig:
     gateway: Optional[str] = None
 
 
+@dataclass
+class FrameworkConfig:
+    """Framework-wide settings from the optional `framework` config section."""
+
+    compose_project: str = "network-test-framework"
+    container_name_pattern: str = "{project}-{node}-1"
+    # Characters of command output kept per command (head and tail halves)
+    max_output_size: Optional[int] = 1024 * 1024
+    # "all" keeps every command output, "failures" only those of failing tests
+    keep_output: str = "all"
+    # Image of generated topology nodes, built from docker/node when missing
+    # (the default image is also rebuilt when docker/node changes)
+    node_image: str = NODE_IMAGE
+    # Where commands run: "docker", "netns" (local network namespaces) or
+    # "simulated" (in-memory model, no privileges needed)
+    backend: str = "docker"
+    # Network namespace name of each node for the netns backend
+    netns_name_pattern: str = "{node}"
+    # Database every run's results are added to: "sqlite" (results.db in the
+    # reports directory), "sqlite:///<path>", "postgresql://..." or null
+    results_store: Optional[str] = "sqlite"
+    # Docker daemons (DOCKER_HOST URLs or context names) to shard modules
+    # across; each gets its own copy of the topology. Empty uses DOCKER_HOST.
+    docker_hosts: List[str] = field(default_factory=list)
+    # Local port serving Prometheus metrics while the runner is running
+    metrics_port: Optional[int] = None
+    # Write spans of every test phase to trace.json (Chrome/Perfetto format)
+    trace: bool = False
+
+
+@dataclass
+class ThroughputConfig:
+    """Traffic parameters and pass/fail thresholds of throughput tests."""
+
+    duration: int = 5  # Seconds of traffic per measurement
+    parallel: int = 1  # Concurrent streams
+    protocol: str = "tcp"  # "tcp" or "udp"
+    bandwidth: Optional[str] = None  # UDP target rate, e.g. "100M"
+    min_bandwidth_mbps: Optional[float] = None
+    min_packets_per_second: Optional[float] = None  # UDP only
+    max_loss_percent: Optional[float] = None  # UDP only
+    max_retransmits: Optional[int] = None  # TCP only
+
+
+@dataclass
+class ProbeConfig:
+    """Deadlines of reachability probes, in seconds."""
+
+    # Interval between probes; iputils only allows less than 0.2 s for root
+    interval: float = 0.2
+    # Positive checks stop at the first reply, so this is only hit on failure
+    positive_deadline: int = 5
+    # Negative checks always wait this long for a reply that should not come
+    negative_deadline: int = 1
+
+
 @dataclass
 class TestConfig:
     name: str
     description: str
     nodes: Dict[str, NetworkConfig]
-    timeout: int = 30
+    timeout: int = DEFAULT_TIMEOUT  # Time budget of each test, in seconds
+    throughput: Optional[ThroughputConfig] = None
+    probe: ProbeConfig = field(default_factory=ProbeConfig)
+
+
+@dataclass
+class CompiledConfig:
+    """Validated configuration, as cached in memory and on disk."""
+
+    framework: FrameworkConfig
+    tests: Dict[str, TestConfig]
+    # None when the nodes do not form a topology; topology() then raises
+    topology: Optional[Topology] = None
+
+
+def build_topology(
+    framework: FrameworkConfig, tests: Dict[str, TestConfig]
+) -> Topology:
+    """Generate the topology holding every node of every test config.
+
+    Tests share the nodes, so a node must have the same address in every test
+    that uses it, and no two nodes may share an address.
+    """
+    nodes: Dict[str, NetworkConfig] = {}
+    owners: Dict[str, str] = {}  # node -> first test declaring it
+    addresses: Dict[str, str] = {}  # ip address -> node
+    for test_name, cfg in tests.items():
+        for node_name, node in cfg.nodes.items():
+            known = nodes.get(node_name)
+            if known is None:
+                if node.ip_address in addresses:
+                    raise ConfigError(
+                        f"{test_name}.nodes.{node_name}: {node.ip_address} is "
+                        f"already used by {addresses[node.ip_address]}"
+                    )
+                nodes[node_name] = node
+                owners[node_name] = test_name
+                addresses[node.ip_address] = node_name
+            elif known.ip_address != node.ip_address:
+                raise ConfigError(
+                    f"{test_name}.nodes.{node_name}: address {node.ip_address} "
+                    f"differs from {known.ip_address} in {owners[node_name]}"
+                )
+    return Topology.from_nodes(framework.compose_project, framework.node_image, nodes)
+
+
+def _type_name(expected) -> str:
+    if typing.get_origin(expected) is not None:
+        return str(expected).replace("typing.", "")
+    return expected.__name__
+
+
+def _has_type(value: Any, expected) -> bool:
+    origin = typing.get_origin(expected)
+    if origin is typing.Union:
+        return any(_has_type(value, arg) for arg in typing.get_args(expected))
+    if origin in (list, List):
+        (item,) = typing.get_args(expected)
+        return isinstance(value, list) and all(_has_type(v, item) for v in value)
+    if expected is type(None):
+        return value is None
+    if expected is float:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if expected is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, expected)
+
+
+@functools.lru_cache(maxsize=None)
+def _settings(cls) -> Dict[str, Any]:
+    """Field name -> type hint of a settings dataclass."""
+    return typing.get_type_hints(cls)
+
+
+@functools.lru_cache(maxsize=None)
+def _is_valid_mask(mask: str) -> bool:
+    try:
+        ipaddress.IPv4Network(f"0.0.0.0/{mask}")
+        return True
+    except ValueError:
+        return False
+
+
+def _build(cls, raw: Any, where: str):
+    """Create a settings dataclass from a mapping, checking keys and types."""
+    if not isinstance(raw, dict):
+        raise ConfigError(f"{where}: expected a mapping, got {raw!r}")
+    hints = _settings(cls)
+    unknown = sorted(str(key) for key in raw if key not in hints)
+    if unknown:
+        raise ConfigError(f"{where}: unknown settings {', '.join(unknown)}")
+    for key, value in raw.items():
+        if not _has_type(value, hints[key]):
+            raise ConfigError(
+                f"{where}.{key}: expected {_type_name(hints[key])}, got {value!r}"
+            )
+    return cls(**raw)
+
+
+def _check_choice(value: str, choices: Tuple[str, ...], where: str):
+    if value not in choices:
+        raise ConfigError(
+            f"{where}: expected one of {', '.join(choices)}, got {value!r}"
+        )
+
+
+def _check_positive(settings, names: Tuple[str, ...], where: str):
+    """Require the named numeric settings to be positive, unless None."""
+    for name in names:
+        value = getattr(settings, name)
+        if value is not None and value <= 0:
+            raise ConfigError(
+                f"{where}.{name}: expected a positive value, got {value!r}"
+            )
+
+
+def _compile_framework(raw: Any) -> FrameworkConfig:
+    where = ConfigManager.FRAMEWORK_SECTION
+    framework = _build(FrameworkConfig, raw, where)
+    _check_choice(framework.backend, BACKENDS, f"{where}.backend")
+    _check_choice(framework.keep_output, KEEP_OUTPUT, f"{where}.keep_output")
+    _check_positive(framework, ("max_output_size", "metrics_port"), where)
+    return framework
+
+
+def _check_address(value: Any, where: str) -> str:
+    try:
+        return str(ipaddress.IPv4Address(value))
+    except (ipaddress.AddressValueError, ValueError):
+        raise ConfigError(f"{where}: invalid IPv4 address {value!r}")
+
+
+def _compile_node(raw: Any, where: str) -> NetworkConfig:
+    if not isinstance(raw, dict):
+        raise ConfigError(f"{where}: expected a mapping, got {raw!r}")
+    for key in ("ip_address", "subnet_mask"):
+        if key not in raw:
+            raise ConfigError(f"{where}: missing {key}")
+    node = _build(NetworkConfig, raw, where)
+    _check_address(node.ip_address, f"{where}.ip_address")
+    if not _is_valid_mask(str(node.subnet_mask)):
+        raise ConfigError(f"{where}.subnet_mask: invalid mask {node.subnet_mask!r}")
+    if node.gateway is not None:
+        _check_address(node.gateway, f"{where}.gateway")
+    return node
+
+
+def _compile_test(name: str, raw: Any) -> TestConfig:
+    if not isinstance(raw, dict):
+        raise ConfigError(f"{name}: expected a mapping, got {raw!r}")
+    unknown = sorted(
+        str(key)
+        for key in raw
+        if key not in ("description", "nodes", "timeout", "throughput", "probe")
+    )
+    if unknown:
+        raise ConfigError(f"{name}: unknown settings {', '.join(unknown)}")
+
+    raw_nodes = raw.get("nodes")
+    if not isinstance(raw_nodes, dict) or not raw_nodes:
+        raise ConfigError(f"{name}.nodes: expected a mapping of node names to nodes")
+    nodes = {}
+    addresses: Dict[str, str] = {}  # ip address -> node
+    for node_name, raw_node in raw_nodes.items():
+        node = _compile_node(raw_node, f"{name}.nodes.{node_name}")
+        if node.ip_address in addresses:
+            raise ConfigError(
+                f"{name}.nodes: {node.ip_address} is used by both "
+                f"{addresses[node.ip_address]} and {node_name}"
+            )
+        addresses[node.ip_address] = node_name
+        nodes[str(node_name)] = node
+
+    description = raw.get("description", "")
+    if not isinstance(description, str):
+        raise ConfigError(f"{name}.description: expected str, got {description!r}")
+    timeout = raw.get("timeout", DEFAULT_TIMEOUT)
+    if not _has_type(timeout, int) or timeout <= 0:
+        raise ConfigError(f"{name}.timeout: expected a positive int, got {timeout!r}")
+
+    throughput = None
+    if raw.get("throughput"):
+        throughput = _build(ThroughputConfig, raw["throughput"], f"{name}.throughput")
+        _check_choice(
+            throughput.protocol, ("tcp", "udp"), f"{name}.throughput.protocol"
+        )
+        _check_positive(throughput, ("duration", "parallel"), f"{name}.throughput")
+
+    probe = _build(ProbeConfig, raw.get("probe") or {}, f"{name}.probe")
+    _check_positive(
+        probe, ("interval", "positive_deadline", "negative_deadline"), f"{name}.probe"
+    )
+
+    return TestConfig(
+        name=name,
+        description=description,
+        nodes=nodes,
+        timeout=timeout,
+        throughput=throughput,
+        probe=probe,
+    )
+
+
+def compile_config(raw_config: Any) -> CompiledConfig:
+    """Validate a parsed config file, raising ConfigError on the first problem."""
+    if raw_config is None:
+        raw_config = {}
+    if not isinstance(raw_config, dict):
+        raise ConfigError(f"expected a mapping of test configs, got {raw_config!r}")
+    raw_config = dict(raw_config)
+    framework = _compile_framework(
+        raw_config.pop(ConfigManager.FRAMEWORK_SECTION, None) or {}
+    )
+    tests = {
+        str(name): _compile_test(str(name), raw) for name, raw in raw_config.items()
+    }
+    try:
+        topology = build_topology(framework, tests)
+    except ValueError:
+        topology = None
+    return CompiledConfig(framework=framework, tests=tests, topology=topology)
 
 
 class ConfigManager:
+    """Loads the test configuration.
+
+    Configs are validated and compiled once per file content. The result is
+    kept in memory, keyed by the file's mtime and size, and pickled to a
+    `.cache` directory next to the file, keyed by its SHA-256, so other
+    processes (e.g. parallel workers) skip parsing and validation. Instances
+    loading the same file share the compiled objects; treat them as read-only.
+    """
+
+    FRAMEWORK_SECTION = "framework"
+    CACHE_DIR = ".cache"
+
+    # resolved path -> (mtime_ns, size, sha256, compiled config)
+    _compiled: Dict[Path, Tuple[int, int, str, CompiledConfig]] = {}
+    _compiled_lock = threading.Lock()
+
     def __init__(self, config_path: str = "config/test_config.yaml"):
         self.config_path = Path(config_path)
+        self.framework = FrameworkConfig()
+        self._compiled_config: Optional[CompiledConfig] = None
         self.config = self._load_config()
 
     def _load_config(self) -> Dict[str, TestConfig]:
         if not self.config_path.exists():
             return self._create_default_config()
 
-        with open(self.config_path, "r") as f:
-            raw_config = yaml.safe_load(f)
-            return self._parse_config(raw_config)
-
-    @staticmethod
-    def _parse_config(raw_config: dict) -> Dict[str, TestConfig]:
-        configs = {}
-        for name, cfg in raw_config.items():
-            nodes = {
-                node_name: NetworkConfig(
-                    ip_address=node_cfg["ip_address"],
-                    subnet_mask=node_cfg["subnet_mask"],
-                    gateway=node_cfg.get("gateway"),
-                )
-                for node_name, node_cfg in cfg["nodes"].items()
-            }
-
-            configs[name] = TestConfig(
-                name=name,
-                description=cfg.get("description", ""),
-                nodes=nodes,
-                timeout=cfg.get("timeout", 30),
-            )
-        return configs
+        self._compiled_config = self._load_compiled()
+        self.framework = self._compiled_config.framework
+        return self._compiled_config.tests
+
+    def _load_compiled(self) -> CompiledConfig:
+        key = self.config_path.resolve()
+        stat = key.stat()
+        with self._compiled_lock:
+            cached = self._compiled.get(key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[3]
+
+        data = key.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if cached is not None and cached[2] == digest:
+            compiled = cached[3]
+        else:
+            compiled = self._read_cache(digest)
+            if compiled is None:
+                compiled = self._compile(data)
+                self._write_cache(digest, compiled)
+
+        with self._compiled_lock:
+            self._compiled[key] = (stat.st_mtime_ns, stat.st_size, digest, compiled)
+        return compiled
+
+    def _compile(self, data: bytes) -> CompiledConfig:
+        try:
+            raw_config = yaml.load(data, Loader=_YAML_LOADER)
+        except yaml.YAMLError as e:
+            raise ConfigError(f"{self.config_path}: invalid YAML: {e}")
+        try:
+            return compile_config(raw_config)
+        except ConfigError as e:
+            raise ConfigError(f"{self.config_path}: {e}")
+
+    def _cache_path(self, digest: str) -> Path:
+        name = f"{self.config_path.stem}.{_SCHEMA_HASH}.{digest[:16]}.pickle"
+        return self.config_path.parent / self.CACHE_DIR / name
+
+    def _read_cache(self, digest: str) -> Optional[CompiledConfig]:
+        try:
+            with open(self._cache_path(digest), "rb") as f:
+                compiled = pickle.load(f)
+        except Exception:
+            return None
+        return compiled if isinstance(compiled, CompiledConfig) else None
+
+    def _write_cache(self, digest: str, compiled: CompiledConfig):
+        """Pickle a compiled config; a cache that cannot be written is skipped."""
+        path = self._cache_path(digest)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            for stale in path.parent.glob(f"{self.config_path.stem}.*.pickle"):
+                stale.unlink(missing_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def topology(self) -> Topology:
+        """Generate the topology holding every node of every test config."""
+        if self._compiled_config is not None and self._compiled_config.topology:
+            return self._compiled_config.topology
+        return build_topology(self.framework, self.config)
 
     def _create_default_config(self) -> Dict[str, TestConfig]:
         default_config = {
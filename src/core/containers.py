@@ -0,0 +1,88 @@
+# src/core/containers.py
+import threading
+from typing import Dict, Optional, Tuple
+
+from docker.errors import APIError, NotFound
+from docker.models.containers import Container
+
+
+class ContainerRegistry:
+    """In-memory cache of the container handles of a compose project.
+
+    The project's containers are fetched with a single label-filtered
+    `containers.list` call and lookups are then served from memory. An entry is
+    only refreshed when it is missing or explicitly invalidated, e.g. after the
+    container was recreated or restarted.
+    """
+
+    _shared: Dict[Tuple[str, str, str], "ContainerRegistry"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, client, project: str, name_pattern: str):
+        self.client = client
+        self.project = project
+        self.name_pattern = name_pattern
+        self._containers: Dict[str, Container] = {}  # container name -> handle
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, client, project: str, name_pattern: str) -> "ContainerRegistry":
+        """Get the registry shared by every test class using the same daemon."""
+        key = (client.api.base_url, project, name_pattern)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(client, project, name_pattern)
+            return cls._shared[key]
+
+    def container_name(self, node: str) -> str:
+        return self.name_pattern.format(project=self.project, node=node)
+
+    def refresh(self):
+        """Reload every container of the project in one list call."""
+        containers = self.client.containers.list(
+            filters={"label": f"com.docker.compose.project={self.project}"}
+        )
+        with self._lock:
+            self._containers = {c.name: c for c in containers}
+            self._loaded = True
+
+    def get(self, node: str) -> Container:
+        """Get the container for a node, raising NotFound if it does not exist."""
+        name = self.container_name(node)
+        container = self._lookup(name)
+        if container is not None:
+            return container
+
+        if not self._loaded:
+            self.refresh()
+            container = self._lookup(name)
+            if container is not None:
+                return container
+
+        # Not part of the project listing, fall back to a direct inspect
+        container = self.client.containers.get(name)
+        with self._lock:
+            self._containers[name] = container
+        return container
+
+    def invalidate(self, node: Optional[str] = None):
+        """Drop a cached handle, or all of them when no node is given."""
+        with self._lock:
+            if node is None:
+                self._containers.clear()
+                self._loaded = False
+            else:
+                self._containers.pop(self.container_name(node), None)
+
+    def _lookup(self, name: str) -> Optional[Container]:
+        with self._lock:
+            return self._containers.get(name)
+
+    @staticmethod
+    def is_stale_handle_error(error: Exception) -> bool:
+        """Whether an exec error means the cached handle no longer matches."""
+        if isinstance(error, NotFound):
+            return True
+        # 409 Conflict: the container is not running, e.g. it was restarted
+        return isinstance(error, APIError) and error.status_code == 409
@@ -0,0 +1,154 @@
+# src/core/latency.py
+import json
+import math
+import statistics
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (source node, ping target, bound interface or None)
+Pair = Tuple[str, str, Optional[str]]
+
+
+@dataclass
+class LatencyRegression:
+    """A node pair whose RTTs are significantly higher than in the baseline."""
+
+    source: str
+    target: str
+    interface: Optional[str]
+    baseline_median: float
+    current_median: float
+    increase_percent: float
+    p_value: float
+    baseline_samples: int
+    current_samples: int
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    def describe(self) -> str:
+        via = f" via {self.interface}" if self.interface else ""
+        return (
+            f"{self.source} -> {self.target}{via}: {self.baseline_median:.3f} ms -> "
+            f"{self.current_median:.3f} ms (+{self.increase_percent:.0f}%, "
+            f"p={self.p_value:.4f})"
+        )
+
+
+def latency_samples(details: Iterable[Optional[Dict]]) -> Dict[Pair, List[float]]:
+    """Group the RTT samples in test result details by node pair."""
+    samples: Dict[Pair, List[float]] = {}
+    for detail in details:
+        for probe in (detail or {}).get("latency", []):
+            if probe.get("target") is None:
+                continue
+            pair = (probe["source"], probe["target"], probe.get("interface"))
+            rtts = probe.get("rtts") or (
+                [probe["rtt_avg"]] if probe.get("rtt_avg") is not None else []
+            )
+            samples.setdefault(pair, []).extend(rtts)
+    return samples
+
+
+def load_baseline(
+    reports_dir: Path, exclude: Optional[Path] = None, max_runs: int = 5
+) -> Dict[Pair, List[float]]:
+    """Collect RTT samples from the most recent previous execution directories."""
+    runs = sorted(
+        (d for d in reports_dir.glob("execution_*") if d.is_dir() and d != exclude),
+        reverse=True,
+    )
+
+    details = []
+    for run in runs[:max_runs]:
+        log_file = run / "results.jsonl"
+        if not log_file.exists():
+            continue
+        with open(log_file) as f:
+            for line in f:
+                if line.strip():
+                    details.append(json.loads(line).get("details"))
+    return latency_samples(details)
+
+
+def mann_whitney_greater(current: List[float], baseline: List[float]) -> float:
+    """One-sided Mann-Whitney U p-value for `current` being larger than baseline.
+
+    Uses the normal approximation with tie and continuity corrections, which is
+    good enough for the handful of samples a ping run produces per pair.
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0  # Nothing to compare
+    ranked = sorted(
+        [(value, 0) for value in current] + [(value, 1) for value in baseline]
+    )
+
+    ranks = [0.0] * len(ranked)
+    tie_term = 0.0
+    i = 0
+    while i < len(ranked):
+        j = i
+        while j + 1 < len(ranked) and ranked[j + 1][0] == ranked[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_term += ties**3 - ties
+        i = j + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, ranked) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def detect_regressions(
+    current: Dict[Pair, List[float]],
+    baseline: Dict[Pair, List[float]],
+    alpha: float = 0.01,
+    min_increase_percent: float = 20.0,
+    min_samples: int = 3,
+) -> List[LatencyRegression]:
+    """Flag pairs whose RTTs rose significantly, both statistically and in size.
+
+    A pair regresses when its samples are larger than the baseline's at
+    significance `alpha` and the median grew by at least `min_increase_percent`,
+    so tiny but consistent shifts on sub-millisecond links are not reported.
+    """
+    regressions = []
+    for pair, samples in sorted(current.items(), key=lambda item: str(item[0])):
+        reference = baseline.get(pair, [])
+        if len(samples) < min_samples or len(reference) < min_samples:
+            continue
+
+        baseline_median = statistics.median(reference)
+        current_median = statistics.median(samples)
+        if baseline_median <= 0:
+            continue
+        increase = (current_median - baseline_median) / baseline_median * 100
+        if increase < min_increase_percent:
+            continue
+
+        p_value = mann_whitney_greater(samples, reference)
+        if p_value < alpha:
+            source, target, interface = pair
+            regressions.append(
+                LatencyRegression(
+                    source=source,
+                    target=target,
+                    interface=interface,
+                    baseline_median=baseline_median,
+                    current_median=current_median,
+                    increase_percent=increase,
+                    p_value=p_value,
+                    baseline_samples=len(reference),
+                    current_samples=len(samples),
+                )
+            )
+    return regressions
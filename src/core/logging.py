@@ -1,55 +1,97 @@
 # src/core/logging.py
+import sys
+import threading
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+from src.core.blobs import BlobStore
 
-@dataclass
+
+@dataclass(slots=True)
 class CommandLog:
     """Represents a single command execution log."""
 
     node: str
     command: str
     exit_code: int
-    output: str
+    output: Optional[str]  # None once spilled to the blob store or dropped
     timestamp: datetime
     duration: float
+    truncated: int = 0  # Characters dropped from the middle of the output
+    output_ref: Optional[str] = None  # Blob store reference of the output
+
+    def to_dict(self) -> Dict:
+        record = {
+            "node": self.node,
+            "command": self.command,
+            "exit_code": self.exit_code,
+            "timestamp": self.timestamp.isoformat(),
+            "duration": self.duration,
+            "truncated": self.truncated,
+        }
+        if self.output is not None:
+            record["output"] = self.output
+        else:
+            record["output_ref"] = self.output_ref
+        return record
 
 
 class TestCommandLogger:
-    """Manages command logging for test executions."""
+    """Manages command logging for test executions.
+
+    With a blob store, outputs only stay in memory while their test runs;
+    `finalize` moves them to the store and leaves references behind.
+    """
 
-    def __init__(self):
+    def __init__(self, blob_store: Optional[BlobStore] = None):
         self.logs: Dict[str, List[CommandLog]] = {}  # test_name -> [logs]
+        self.blob_store = blob_store
+        # Commands may be fanned out to several nodes from worker threads
+        self._lock = threading.Lock()
 
     def add_log(self, test_name: str, log: CommandLog):
         """Add a command log to a specific test."""
-        if test_name not in self.logs:
-            self.logs[test_name] = []
-        self.logs[test_name].append(log)
+        # Node names and commands repeat across thousands of logs
+        log.node = sys.intern(log.node)
+        log.command = sys.intern(log.command)
+        with self._lock:
+            if test_name not in self.logs:
+                self.logs[test_name] = []
+            self.logs[test_name].append(log)
 
     def get_logs(self, test_name: str) -> List[CommandLog]:
         """Get all logs for a specific test."""
-        return self.logs.get(test_name, [])
+        with self._lock:
+            return list(self.logs.get(test_name, []))
 
     def clear_logs(self, test_name: str):
         """Clear logs for a specific test."""
-        if test_name in self.logs:
-            del self.logs[test_name]
+        with self._lock:
+            if test_name in self.logs:
+                del self.logs[test_name]
+
+    def finalize(self, test_name: str, keep_output: bool = True) -> List[Dict]:
+        """Spill a finished test's outputs and return its report records.
+
+        Outputs are written to the blob store when there is one, or dropped
+        entirely when `keep_output` is False. The test's logs are cleared.
+        """
+        with self._lock:
+            logs = self.logs.pop(test_name, [])
+
+        for log in logs:
+            if not keep_output:
+                log.output = None
+            elif self.blob_store is not None and log.output is not None:
+                log.output_ref = self.blob_store.put(log.output)
+                log.output = None
+        return [log.to_dict() for log in logs]
 
     def to_dict(self) -> Dict:
         """Convert logs to dictionary format for reporting."""
-        return {
-            test_name: [
-                {
-                    "node": log.node,
-                    "command": log.command,
-                    "exit_code": log.exit_code,
-                    "output": log.output,
-                    "timestamp": log.timestamp.isoformat(),
-                    "duration": log.duration,
-                }
-                for log in logs
-            ]
-            for test_name, logs in self.logs.items()
-        }
+        with self._lock:
+            return {
+                test_name: [log.to_dict() for log in logs]
+                for test_name, logs in self.logs.items()
+            }
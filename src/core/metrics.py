@@ -0,0 +1,272 @@
+# src/core/metrics.py
+import bisect
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Buckets in seconds, for execs, commands, tests and report writes
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Buckets in seconds, for round-trip times
+RTT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1, 1)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_SAMPLE = re.compile(r"^([^\s{]+(?:\{.*\})?)\s+(\S+)$")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DURATION_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> ([count per bucket, +Inf last], sum)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = {key: (list(c), total) for key, (c, total) in self._values.items()}
+        names = self.labelnames + ("le",)
+        lines = []
+        for key, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def merge_exposition(texts: List[str]) -> str:
+    """Merge Prometheus text expositions by adding up identical samples.
+
+    Counters and histogram buckets, sums and counts are all additive, so this
+    combines the metrics of worker processes into those of the whole run.
+    """
+    headers: Dict[str, List[str]] = {}  # family -> HELP/TYPE lines
+    samples: Dict[str, Dict[str, float]] = {}  # family -> sample key -> value
+    family = ""
+    for text in texts:
+        for line in text.splitlines():
+            if line.startswith("# HELP "):
+                family = line.split()[2]
+                headers.setdefault(family, [])
+                samples.setdefault(family, {})
+                if line not in headers[family]:
+                    headers[family].append(line)
+            elif line.startswith("# TYPE "):
+                if line not in headers.setdefault(family, []):
+                    headers[family].append(line)
+            elif line.strip():
+                match = _SAMPLE.match(line)
+                if match is None:
+                    continue
+                key, value = match.groups()
+                family_samples = samples.setdefault(family, {})
+                family_samples[key] = family_samples.get(key, 0) + float(value)
+
+    lines = []
+    for name, header in headers.items():
+        lines.extend(header)
+        lines.extend(
+            f"{key} {_format_value(value)}" for key, value in samples[name].items()
+        )
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class MetricsRegistry:
+    """Metrics of this process, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DURATION_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            samples = metric.render()
+            if samples:
+                lines.extend(metric.header() + samples)
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_textfile(self, path: Path, extra: Sequence[str] = ()):
+        """Atomically write the metrics, plus extra expositions, to a file.
+
+        The file can be picked up by node_exporter's textfile collector.
+        """
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(merge_exposition([self.render(), *extra]))
+        os.replace(tmp_path, path)
+
+
+def start_http_server(port: int, render: Callable[[], str], host: str = "127.0.0.1"):
+    """Serve render() at /metrics from a daemon thread until shutdown()."""
+    # Imported here: most runs never serve metrics
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+REGISTRY = MetricsRegistry()
+
+EXEC_SECONDS = REGISTRY.histogram(
+    "network_test_exec_seconds",
+    "Time from starting an exec on a node to its completion",
+    ["node"],
+)
+EXEC_ERRORS = REGISTRY.counter(
+    "network_test_exec_errors_total",
+    "Execs that raised instead of completing",
+    ["node"],
+)
+COMMAND_SECONDS = REGISTRY.histogram(
+    "network_test_command_seconds",
+    "Duration of logged commands by node and program",
+    ["node", "program"],
+)
+COMMAND_FAILURES = REGISTRY.counter(
+    "network_test_command_failures_total",
+    "Logged commands that exited non-zero",
+    ["node", "program"],
+)
+TEST_SECONDS = REGISTRY.histogram(
+    "network_test_test_seconds", "Duration of tests", ["module", "test"]
+)
+TESTS = REGISTRY.counter(
+    "network_test_tests_total", "Finished tests by outcome", ["module", "status"]
+)
+REPORTER_WRITE_SECONDS = REGISTRY.histogram(
+    "network_test_reporter_write_seconds",
+    "Time spent writing results and reports",
+    ["operation"],
+)
+PROBE_RTT_SECONDS = REGISTRY.histogram(
+    "network_test_probe_rtt_seconds",
+    "Round-trip times of the pings run by tests",
+    ["source", "target"],
+    buckets=RTT_BUCKETS,
+)
+PROBE_LOST = REGISTRY.counter(
+    "network_test_probe_lost_total",
+    "Ping probes that got no reply",
+    ["source", "target"],
+)
@@ -0,0 +1,112 @@
+# src/core/output.py
+import codecs
+from collections import deque
+from typing import Callable, Iterable, Optional, Tuple
+
+
+class BoundedOutput:
+    """Accumulates command output, keeping only its head and tail past a cap.
+
+    Up to `max_size` characters are kept: the first half of the output and its
+    most recent half. Everything in between is dropped and counted in
+    `truncated`.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size
+        self.truncated = 0
+        self._head_limit = max_size // 2 if max_size is not None else None
+        self._tail_limit = max_size - self._head_limit if max_size is not None else 0
+        self._head = []
+        self._head_size = 0
+        self._tail = deque()
+        self._tail_size = 0
+
+    def write(self, text: str):
+        if not text:
+            return
+        if self._head_limit is None or self._head_size < self._head_limit:
+            room = (
+                len(text)
+                if self._head_limit is None
+                else self._head_limit - self._head_size
+            )
+            self._head.append(text[:room])
+            self._head_size += len(text[:room])
+            text = text[room:]
+            if not text:
+                return
+
+        self._tail.append(text)
+        self._tail_size += len(text)
+        while self._tail_size > self._tail_limit:
+            excess = self._tail_size - self._tail_limit
+            first = self._tail[0]
+            if len(first) <= excess:
+                self._tail.popleft()
+                self._tail_size -= len(first)
+                self.truncated += len(first)
+            else:
+                self._tail[0] = first[excess:]
+                self._tail_size -= excess
+                self.truncated += excess
+
+    def getvalue(self) -> str:
+        head = "".join(self._head)
+        tail = "".join(self._tail)
+        if not self.truncated:
+            return head + tail
+        return f"{head}\n... [{self.truncated} characters truncated] ...\n{tail}"
+
+
+def bound_output(text: str, max_size: Optional[int]) -> Tuple[str, int]:
+    """Apply the head/tail cap to an already captured output."""
+    if max_size is None or len(text) <= max_size:
+        return text, 0
+    captured = BoundedOutput(max_size)
+    captured.write(text)
+    return captured.getvalue(), captured.truncated
+
+
+def capture_stream(
+    chunks: Iterable[bytes],
+    max_size: Optional[int] = None,
+    on_line: Optional[Callable[[str], bool]] = None,
+) -> Tuple[BoundedOutput, bool]:
+    """Decode a stream of output chunks incrementally into a BoundedOutput.
+
+    `on_line` is called with every complete line; returning True stops reading.
+    Returns the captured output and whether the callback stopped the stream.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    captured = BoundedOutput(max_size)
+    pending = ""
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        captured.write(text)
+        if on_line is None:
+            continue
+
+        pending += text
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            if on_line(line):
+                return captured, True
+        if max_size is not None and len(pending) > max_size:
+            # A runaway line without newlines, hand it over as it is
+            if on_line(pending):
+                return captured, True
+            pending = ""
+
+    # Bytes held back by the decoder, e.g. a truncated UTF-8 sequence
+    text = decoder.decode(b"", final=True)
+    captured.write(text)
+    if on_line is None:
+        return captured, False
+
+    # The tail may complete lines, and the last line may lack a newline
+    *lines, last = (pending + text).split("\n")
+    for line in lines + ([last] if last else []):
+        if on_line(line):
+            return captured, True
+    return captured, False
@@ -1,11 +1,27 @@
 # src/core/reporter.py
+import atexit
 import json
+import os
+import shutil
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from jinja2 import Environment, FileSystemLoader
+from src.core.blobs import BlobStore
+from src.core.collector import ResultCollector, ResultSender
+from src.core.config import ConfigManager
+from src.core.latency import (
+    LatencyRegression,
+    detect_regressions,
+    latency_samples,
+    load_baseline,
+)
+from src.core.metrics import REGISTRY, REPORTER_WRITE_SECONDS, merge_exposition
+from src.core.results_store import open_results_store
+from src.core.tracing import TRACER, span
 
 
 @dataclass
@@ -23,51 +39,264 @@ class TestReporter:
     _instance = None
     _execution_dir = None
 
+    # Tests per details sidecar of the HTML report
+    details_chunk_size = 200
+
+    # Set by the CLI runner (and src/tests/conftest.py under pytest-xdist) for
+    # worker processes: workers keep their command outputs in the shared
+    # execution directory, send their results to the collector of the process
+    # owning it (or to results.<worker>.jsonl without one), and leave the
+    # summaries to that process.
+    EXECUTION_DIR_ENV = "NETWORK_TEST_EXECUTION_DIR"
+    WORKER_ID_ENV = "NETWORK_TEST_WORKER_ID"
+    # Docker host a sharded worker runs against, recorded with each result
+    SHARD_ENV = "NETWORK_TEST_SHARD"
+
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super(TestReporter, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self, output_dir: str = "reports", template_dir: str = "templates"):
+    def __init__(
+        self,
+        output_dir: str = "reports",
+        template_dir: str = "templates",
+        flush_interval: Optional[float] = 30.0,
+    ):
         if not hasattr(self, "initialized"):
             self.base_output_dir = Path(output_dir)
             self.base_output_dir.mkdir(exist_ok=True)
             self.template_dir = Path(template_dir)
             self.results: Dict[str, List[TestResult]] = {}
-            self.template_env = Environment(loader=FileSystemLoader(template_dir))
-            # Create execution directory immediately
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self._execution_dir = self.base_output_dir / f"execution_{timestamp}"
-            self._execution_dir.mkdir(exist_ok=True)
-            self._copy_static_files()
+            self.latency_regressions: List[LatencyRegression] = []
+            # Results in arrival order; a test's position picks its sidecar chunk
+            self._ordered_results: List[Tuple[str, TestResult]] = []
+            self._complete_chunks = 0  # Full chunks already written
+            self._written_outputs = 0  # Tests whose output sidecar is written
+            self._template_env = None
+            self.worker_id = os.environ.get(self.WORKER_ID_ENV)
+            self.shard = os.environ.get(self.SHARD_ENV)
+            shared_dir = os.environ.get(self.EXECUTION_DIR_ENV)
+            if shared_dir:
+                self._execution_dir = Path(shared_dir)
+                self._execution_dir.mkdir(parents=True, exist_ok=True)
+            else:
+                # Create execution directory immediately
+                self._execution_dir = self._create_execution_dir()
+            if self.worker_id is None:
+                self._copy_static_files()
+            # Results are streamed to a JSONL log as they arrive; the JSON and
+            # HTML summaries are only rebuilt on flush (at most once per
+            # flush_interval seconds, and always from generate_summary).
+            self.flush_interval = flush_interval
+            self._dirty = False
+            self._last_flush = time.monotonic()
+            # Results may arrive from collector threads as well as tests
+            self._lock = threading.RLock()
+            self._sender = ResultSender.from_env() if self.worker_id else None
+            self._results_log = None
+            if self._sender is None:
+                log_name = (
+                    f"results.{self.worker_id}.jsonl"
+                    if self.worker_id
+                    else "results.jsonl"
+                )
+                self._results_log = open(self._execution_dir / log_name, "a")
+            # Command outputs are kept out of the results, which only hold refs
+            self.blob_store = BlobStore(
+                self._execution_dir,
+                (
+                    f"command_output.{self.worker_id}"
+                    if self.worker_id
+                    else "command_output"
+                ),
+            )
+            # Metrics textfiles of finished workers, merged into metrics.prom
+            self._worker_metrics: List[str] = []
+            # Spans go to trace.json; the runner appends those of its workers
+            if self.worker_id is None:
+                TRACER.configure(self._execution_dir / "trace.json", "runner")
+            else:
+                TRACER.configure(
+                    self._execution_dir / f"trace.{self.worker_id}.worker",
+                    f"worker {self.worker_id}",
+                )
+            atexit.register(self.flush)
             self.initialized = True
 
     @property
     def execution_dir(self) -> Path:
         return self._execution_dir
 
+    def _create_execution_dir(self) -> Path:
+        """Create a new execution_<timestamp> directory, suffixed if taken.
+
+        mkdir is atomic, so processes starting within the same second still
+        get directories of their own.
+        """
+        name = f"execution_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        path = self.base_output_dir / name
+        suffix = 0
+        while True:
+            try:
+                path.mkdir()
+                return path
+            except FileExistsError:
+                suffix += 1
+                path = self.base_output_dir / f"{name}_{suffix}"
+
+    def start_collector(self) -> ResultCollector:
+        """Collect the results of worker processes into this report.
+
+        Workers need the environment from the collector's export_env, plus
+        EXECUTION_DIR_ENV set to this execution directory and a unique
+        WORKER_ID_ENV. Stop the collector once they are done, then call
+        collect_worker_results.
+        """
+        return ResultCollector(self._receive_record).start()
+
+    def _receive_record(self, record: Dict):
+        module_name = record.pop("module")
+        self.add_result(module_name, self._result_from_dict(module_name, record))
+
+    @property
+    def template_env(self):
+        """Jinja environment, only set up once a report is actually rendered."""
+        if self._template_env is None:
+            from jinja2 import Environment, FileSystemLoader
+
+            self._template_env = Environment(
+                loader=FileSystemLoader(str(self.template_dir))
+            )
+        return self._template_env
+
     def _copy_static_files(self):
         """Copy static CSS and JS files to execution directory."""
-        # Copy CSS file
-        css_template = self.template_env.get_template("report.css")
-        css_content = css_template.render()
-        css_file = self.execution_dir / "report.css"
-        with open(css_file, "w") as f:
-            f.write(css_content)
-
-        # Copy JS file
-        js_template = self.template_env.get_template("report.js")
-        js_content = js_template.render()
-        js_file = self.execution_dir / "report.js"
-        with open(js_file, "w") as f:
-            f.write(js_content)
+        for name in ("report.css", "report.js"):
+            shutil.copyfile(self.template_dir / name, self.execution_dir / name)
 
     def add_result(self, module_name: str, result: TestResult):
         """Add a test result to the current module."""
-        if module_name not in self.results:
-            self.results[module_name] = []
-        self.results[module_name].append(result)
-        self._save_results()
+        if self.shard and isinstance(result.details, dict):
+            result.details["shard"] = self.shard
+        with self._lock:
+            if module_name not in self.results:
+                self.results[module_name] = []
+            self.results[module_name].append(result)
+            self._ordered_results.append((module_name, result))
+            self._append_result(module_name, result)
+            self._dirty = True
+
+            if (
+                self.flush_interval is not None
+                and time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self.flush()
+
+    @staticmethod
+    def _result_to_dict(result: TestResult) -> Dict:
+        """Convert a test result to its JSON report representation."""
+        return {
+            "test_name": result.test_name,
+            "status": result.status,
+            "duration": result.duration,
+            "timestamp": result.timestamp.isoformat(),
+            "error_message": result.error_message,
+            "details": result.details,
+        }
+
+    @staticmethod
+    def _result_from_dict(module_name: str, data: Dict) -> TestResult:
+        """Rebuild a test result from its JSON report representation."""
+        return TestResult(
+            module_name=module_name,
+            test_name=data["test_name"],
+            status=data["status"],
+            duration=data["duration"],
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            error_message=data.get("error_message"),
+            details=data.get("details"),
+        )
+
+    def collect_worker_results(self):
+        """Merge what worker processes left in the execution directory.
+
+        That is their traces and metrics, and the results of workers that ran
+        without a collector.
+        """
+        for log_file in sorted(self.execution_dir.glob("results.*.jsonl")):
+            with open(log_file) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    module_name = record.pop("module")
+                    self.add_result(
+                        module_name, self._result_from_dict(module_name, record)
+                    )
+            log_file.unlink()
+        for trace_file in sorted(self.execution_dir.glob("trace.*.worker")):
+            TRACER.absorb(trace_file)
+            trace_file.unlink()
+        for metrics_file in sorted(self.execution_dir.glob("metrics.*.worker")):
+            self._worker_metrics.append(metrics_file.read_text())
+            metrics_file.unlink()
+
+    def _append_result(self, module_name: str, result: TestResult):
+        """Append a single result to the streaming JSONL log."""
+        record = {"module": module_name, **self._result_to_dict(result)}
+        with REPORTER_WRITE_SECONDS.time(operation="append_result"), span(
+            "append_result", "reporter", test=result.test_name
+        ):
+            if self._sender is not None:
+                self._sender.send(record)
+            else:
+                self._results_log.write(json.dumps(record, default=str) + "\n")
+                self._results_log.flush()
+
+    def flush(self):
+        """Rebuild the summaries and the store's rows if new results arrived.
+
+        Workers only write their metrics, which the runner merges into its own.
+        Buffered trace spans are written in both cases.
+        """
+        with self._lock:
+            if self._sender is not None:
+                self._sender.flush()
+            if self._dirty:
+                if self.worker_id is None:
+                    with REPORTER_WRITE_SECONDS.time(operation="summary"), span(
+                        "save_results", "reporter", tests=len(self._ordered_results)
+                    ):
+                        self._save_results()
+                    self.store_results()
+                self.write_metrics()
+                self._dirty = False
+                self._last_flush = time.monotonic()
+        TRACER.flush()
+
+    def metrics_text(self) -> str:
+        """Prometheus metrics of this process and of every worker so far."""
+        live = [f.read_text() for f in self.execution_dir.glob("metrics.*.worker")]
+        return merge_exposition([REGISTRY.render(), *self._worker_metrics, *live])
+
+    def write_metrics(self):
+        """Write metrics.prom, or a worker's share of it, to the execution dir."""
+        if self.worker_id is not None:
+            path, extra = self.execution_dir / f"metrics.{self.worker_id}.worker", []
+        else:
+            path, extra = self.execution_dir / "metrics.prom", self._worker_metrics
+        with span("write_metrics", "reporter"):
+            REGISTRY.write_textfile(path, extra)
+
+    def close(self):
+        """Release the result log and blob store without writing summaries."""
+        atexit.unregister(self.flush)
+        if self._sender is not None:
+            self._sender.close()
+        if self._results_log is not None:
+            self._results_log.close()
+        self.blob_store.close()
 
     def _save_results(self):
         """Save both JSON and HTML reports."""
@@ -75,27 +304,19 @@ class TestReporter:
         json_data = {
             "execution_timestamp": self._execution_dir.name,
             "modules": {
-                module: [
-                    {
-                        "test_name": r.test_name,
-                        "status": r.status,
-                        "duration": r.duration,
-                        "timestamp": r.timestamp.isoformat(),
-                        "error_message": r.error_message,
-                        "details": r.details,
-                    }
-                    for r in results
-                ]
+                module: [self._result_to_dict(r) for r in results]
                 for module, results in self.results.items()
             },
+            "latency_regressions": [r.to_dict() for r in self.latency_regressions],
         }
 
         json_file = self.execution_dir / "test_report.json"
-        with open(json_file, "w") as f:
+        with span("write_json_report", "reporter"), open(json_file, "w") as f:
             json.dump(json_data, f, indent=2)
 
         # Generate and save HTML report
-        self._generate_html_report()
+        with span("write_html_report", "reporter"):
+            self._generate_html_report()
 
     def _get_template_data(self):
         """Prepare data for the HTML template."""
@@ -128,27 +349,114 @@ class TestReporter:
                 "total_modules": len(self.results),
             },
             "modules": {
-                module: {
-                    "stats": module_stats[module],
-                    "tests": [
-                        {
-                            "name": r.test_name,
-                            "status": r.status,
-                            "duration": f"{r.duration:.2f}",
-                            "timestamp": r.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                            "error_message": r.error_message,
-                            "details": r.details,
-                            "status_class": "pass" if r.status == "PASS" else "fail",
-                        }
-                        for r in tests
-                    ],
-                }
-                for module, tests in self.results.items()
+                module: {"stats": module_stats[module]} for module in self.results
             },
+            "latency_regressions": [r.describe() for r in self.latency_regressions],
         }
 
+    def detect_latency_regressions(self) -> List[LatencyRegression]:
+        """Compare this run's ping RTTs with those of previous executions."""
+        current = latency_samples(
+            r.details for results in self.results.values() for r in results
+        )
+        if not current:
+            return []
+        baseline = load_baseline(self.base_output_dir, exclude=self.execution_dir)
+        return detect_regressions(current, baseline)
+
+    def save_to_store(self, store):
+        """Bulk-insert this execution's results into a ResultsStore."""
+        store.record_execution(self.execution_dir.name, self.results)
+
+    def store_results(self):
+        """Replace this execution's rows in the configured results store.
+
+        Runs on every flush of the process owning the execution directory,
+        i.e. the CLI runner, a plain pytest run or the xdist controller. A
+        connection is opened each time, as flushes can come from any thread.
+        """
+        try:
+            url = ConfigManager().framework.results_store
+            if not url:
+                return
+            with span("store_results", "reporter"):
+                store = open_results_store(url, self.base_output_dir)
+                try:
+                    self.save_to_store(store)
+                finally:
+                    store.close()
+        except Exception as e:
+            print(f"Error storing results: {str(e)}")
+
+    def _write_report_data(self):
+        """Write the sidecars the HTML report loads its test rows from.
+
+        index.js lists every test in a compact form. Each chunk_NNNNN.js file
+        holds the details of `details_chunk_size` consecutive tests, with
+        command outputs as blob references. Full chunks never change, so only
+        the last partial chunk and newer ones are rewritten on flush.
+
+        The outputs of a test are in outputs/<position>.js, loaded only when
+        its command logs are shown. A test's outputs never change either, so
+        each sidecar is written once.
+        """
+        data_dir = self.execution_dir / "report_data"
+        data_dir.mkdir(exist_ok=True)
+        size = self.details_chunk_size
+
+        for position in range(self._written_outputs, len(self._ordered_results)):
+            self._write_output_sidecar(data_dir, position)
+        self._written_outputs = len(self._ordered_results)
+
+        chunk_id = self._complete_chunks
+        while chunk_id * size < len(self._ordered_results):
+            chunk = self._ordered_results[chunk_id * size : (chunk_id + 1) * size]
+            tests = json.dumps(
+                [self._report_details(result) for _, result in chunk], default=str
+            )
+            with open(data_dir / f"chunk_{chunk_id:05d}.js", "w") as f:
+                f.write(f"reportChunkLoaded({chunk_id}, {tests});\n")
+            chunk_id += 1
+        self._complete_chunks = len(self._ordered_results) // size
+
+        index: Dict[str, List] = {module: [] for module in self.results}
+        for position, (module, result) in enumerate(self._ordered_results):
+            logs = (result.details or {}).get("command_logs", [])
+            index[module].append(
+                [
+                    result.test_name,
+                    result.status,
+                    round(result.duration, 3),
+                    len(logs),
+                    position,
+                ]
+            )
+        with open(data_dir / "index.js", "w") as f:
+            report_index = {"chunkSize": size, "modules": index}
+            f.write(f"window.REPORT_INDEX = {json.dumps(report_index)};\n")
+
+    def _report_details(self, result: TestResult) -> Dict:
+        """A test's details for the report chunk."""
+        return {"error_message": result.error_message, "details": result.details}
+
+    def _write_output_sidecar(self, data_dir: Path, position: int):
+        """Write the command outputs of the test at `position`, by reference."""
+        _, result = self._ordered_results[position]
+        outputs = {}
+        for log in (result.details or {}).get("command_logs", []):
+            ref = log.get("output_ref")
+            if ref and ref not in outputs:
+                outputs[ref] = self.blob_store.get(ref)
+        if not outputs:
+            return
+        outputs_dir = data_dir / "outputs"
+        outputs_dir.mkdir(exist_ok=True)
+        with open(outputs_dir / f"{position}.js", "w") as f:
+            f.write(f"reportOutputsLoaded({position}, {json.dumps(outputs)});\n")
+
     def _generate_html_report(self):
         """Generate the HTML report using the template."""
+        self._write_report_data()
         template_data = self._get_template_data()
         template = self.template_env.get_template("report.html")
         html_content = template.render(**template_data)
@@ -159,6 +467,9 @@ class TestReporter:
 
     def generate_summary(self):
         """Print execution summary to console."""
+        self.latency_regressions = self.detect_latency_regressions()
+        self._dirty = True
+        self.flush()
         template_data = self._get_template_data()
         summary = template_data["summary"]
 
@@ -179,4 +490,9 @@ class TestReporter:
             print(f"  Failed: {stats['failed']}")
             print(f"  Success Rate: {stats['success_rate']}%")
 
+        if self.latency_regressions:
+            print("\nLatency Regressions:")
+            for regression in template_data["latency_regressions"]:
+                print(f"  {regression}")
+
         print(f"\nDetailed report available at: {self.execution_dir}/test_report.html")
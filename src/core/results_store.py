@@ -0,0 +1,229 @@
+# src/core/results_store.py
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS executions (
+        execution_id TEXT PRIMARY KEY,
+        finished_at TEXT NOT NULL,
+        total INTEGER NOT NULL,
+        passed INTEGER NOT NULL,
+        failed INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS test_results (
+        execution_id TEXT NOT NULL
+            REFERENCES executions (execution_id) ON DELETE CASCADE,
+        module TEXT NOT NULL,
+        test_name TEXT NOT NULL,
+        status TEXT NOT NULL,
+        duration DOUBLE PRECISION NOT NULL,
+        timestamp TEXT NOT NULL,
+        error_message TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_executions_finished ON executions (finished_at)",
+    "CREATE INDEX IF NOT EXISTS idx_results_execution ON test_results (execution_id)",
+    """
+    CREATE INDEX IF NOT EXISTS idx_results_test
+        ON test_results (module, test_name, timestamp)
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_results_status ON test_results (status, timestamp)",
+    # duration_trend without a module
+    """
+    CREATE INDEX IF NOT EXISTS idx_results_test_name
+        ON test_results (test_name, timestamp)
+    """,
+]
+
+_PASSED = "SUM(CASE WHEN r.status = 'PASS' THEN 1 ELSE 0 END)"
+_FAILED = "SUM(CASE WHEN r.status = 'PASS' THEN 0 ELSE 1 END)"
+
+
+@dataclass
+class FlakyTest:
+    module: str
+    test_name: str
+    passed: int
+    failed: int
+
+
+@dataclass
+class TrendPoint:
+    execution_id: str
+    timestamp: str
+    duration: float
+    status: str
+
+
+class ResultsStore:
+    """Test results of all executions in an indexed SQL database.
+
+    Subclasses provide a DB-API connection; queries are written with `?`
+    placeholders and portable SQL, so they run unchanged on SQLite and
+    PostgreSQL.
+    """
+
+    placeholder = "?"
+
+    def __init__(self, connection):
+        self.connection = connection
+        with self.connection:
+            cursor = self.connection.cursor()
+            for statement in SCHEMA:
+                cursor.execute(statement)
+
+    def _sql(self, sql: str) -> str:
+        return sql.replace("?", self.placeholder)
+
+    def _execute(self, sql: str, params=()):
+        cursor = self.connection.cursor()
+        cursor.execute(self._sql(sql), params)
+        return cursor
+
+    def record_execution(
+        self,
+        execution_id: str,
+        results: Dict[str, List],
+        finished_at: Optional[datetime] = None,
+    ):
+        """Replace an execution's results with `results` in one transaction."""
+        rows = [
+            (
+                execution_id,
+                module,
+                result.test_name,
+                result.status,
+                result.duration,
+                result.timestamp.isoformat(),
+                result.error_message,
+            )
+            for module, module_results in results.items()
+            for result in module_results
+        ]
+        passed = sum(1 for row in rows if row[3] == "PASS")
+
+        with self.connection:
+            self._execute(
+                "DELETE FROM test_results WHERE execution_id = ?", (execution_id,)
+            )
+            self._execute(
+                "DELETE FROM executions WHERE execution_id = ?", (execution_id,)
+            )
+            self._execute(
+                "INSERT INTO executions (execution_id, finished_at, total, passed,"
+                " failed) VALUES (?, ?, ?, ?, ?)",
+                (
+                    execution_id,
+                    (finished_at or datetime.now()).isoformat(),
+                    len(rows),
+                    passed,
+                    len(rows) - passed,
+                ),
+            )
+            self.connection.cursor().executemany(
+                self._sql(
+                    "INSERT INTO test_results (execution_id, module, test_name,"
+                    " status, duration, timestamp, error_message)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                ),
+                rows,
+            )
+
+    def has_execution(self, execution_id: str) -> bool:
+        cursor = self._execute(
+            "SELECT 1 FROM executions WHERE execution_id = ?", (execution_id,)
+        )
+        return cursor.fetchone() is not None
+
+    def latest_execution(self) -> Optional[str]:
+        """Id of the most recently recorded execution."""
+        row = self._execute(
+            "SELECT execution_id FROM executions ORDER BY finished_at DESC LIMIT 1"
+        ).fetchone()
+        return row[0] if row else None
+
+    def flaky_tests(self, runs: int = 500) -> List[FlakyTest]:
+        """Tests that both passed and failed within the last `runs` executions."""
+        cursor = self._execute(
+            f"""
+            SELECT r.module, r.test_name, {_PASSED}, {_FAILED}
+            FROM test_results r
+            JOIN (
+                SELECT execution_id FROM executions
+                ORDER BY finished_at DESC LIMIT ?
+            ) e ON r.execution_id = e.execution_id
+            GROUP BY r.module, r.test_name
+            HAVING {_PASSED} > 0 AND {_FAILED} > 0
+            ORDER BY {_FAILED} DESC, r.module, r.test_name
+            """,
+            (runs,),
+        )
+        return [FlakyTest(*row) for row in cursor.fetchall()]
+
+    def duration_trend(
+        self, test_name: str, module: Optional[str] = None, limit: int = 100
+    ) -> List[TrendPoint]:
+        """Durations of a test's last `limit` runs, oldest first."""
+        sql = (
+            "SELECT execution_id, timestamp, duration, status FROM test_results"
+            " WHERE test_name = ?"
+        )
+        params = [test_name]
+        if module is not None:
+            sql += " AND module = ?"
+            params.append(module)
+        sql += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(limit)
+        rows = self._execute(sql, tuple(params)).fetchall()
+        return [TrendPoint(*row) for row in reversed(rows)]
+
+    def close(self):
+        self.connection.close()
+
+
+class SQLiteResultsStore(ResultsStore):
+    """Results store in a local SQLite file."""
+
+    def __init__(self, path: Path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(path))
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.execute("PRAGMA journal_mode = WAL")
+        super().__init__(connection)
+
+
+class PostgresResultsStore(ResultsStore):
+    """Results store in a PostgreSQL database, via psycopg2."""
+
+    placeholder = "%s"
+
+    def __init__(self, dsn: str):
+        try:
+            import psycopg2
+        except ImportError:
+            raise Exception(
+                "PostgreSQL results store requires psycopg2 "
+                "(pip install psycopg2-binary)"
+            )
+        super().__init__(psycopg2.connect(dsn))
+
+
+def open_results_store(url: str, reports_dir: Path) -> ResultsStore:
+    """Open the store configured as framework.results_store.
+
+    "sqlite" keeps the database next to the reports, "sqlite:///<path>" puts
+    it elsewhere and "postgresql://..." connects to a PostgreSQL server.
+    """
+    if url == "sqlite":
+        return SQLiteResultsStore(Path(reports_dir) / "results.db")
+    if url.startswith("sqlite:///"):
+        return SQLiteResultsStore(Path(url[len("sqlite:///") :]))
+    if url.startswith(("postgresql://", "postgres://")):
+        return PostgresResultsStore(url)
+    raise Exception(f"Unsupported results store: {url}")
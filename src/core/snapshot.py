@@ -0,0 +1,165 @@
+# src/core/snapshot.py
+import ipaddress
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Commands whose output the snapshot is built from, run together in one exec
+SNAPSHOT_COMMANDS = ["ip -j addr", "ip -d -j link", "ip -j route"]
+
+# `ip` invocations that change interface, address or route state
+_MUTATING_IP_COMMAND = re.compile(
+    r"(?:^|[;&|]\s*)ip\s+(?:-\S+\s+)*"
+    r"(?:l|li|lin|link|a|ad|add|addr|address|r|ro|rou|route|neigh|neighbor)\s+"
+    r"(?:add|del|delete|set|change|replace|flush|append)\b"
+    r"|ip\s+(?:-\S+\s+)*-batch\b"
+)
+
+
+def is_mutating_command(command: str) -> bool:
+    """Whether a command may change the state captured by a snapshot."""
+    return _MUTATING_IP_COMMAND.search(command) is not None
+
+
+@dataclass
+class InterfaceAddress:
+    family: str  # "inet" or "inet6"
+    local: str
+    prefixlen: int
+
+    @property
+    def cidr(self) -> str:
+        return f"{self.local}/{self.prefixlen}"
+
+
+@dataclass
+class InterfaceState:
+    name: str
+    index: int
+    flags: List[str]
+    operstate: str
+    mtu: int
+    mac: Optional[str] = None
+    parent: Optional[str] = None  # Lower device of stacked links (eth0.10@eth0)
+    kind: Optional[str] = None  # Link kind from `ip -d`, e.g. "vlan"
+    vlan_id: Optional[int] = None
+    addresses: List[InterfaceAddress] = field(default_factory=list)
+
+    @property
+    def is_up(self) -> bool:
+        return "UP" in self.flags
+
+    def has_address(self, cidr: str) -> bool:
+        return any(address.cidr == cidr for address in self.addresses)
+
+    def describe(self) -> str:
+        addresses = " ".join(address.cidr for address in self.addresses)
+        state = "UP" if self.is_up else "DOWN"
+        return f"{self.name}: {state} mtu {self.mtu} {addresses}".rstrip()
+
+
+@dataclass
+class RouteEntry:
+    dst: str  # Normalized prefix, or "default"
+    dev: Optional[str] = None
+    gateway: Optional[str] = None
+    protocol: Optional[str] = None
+    scope: Optional[str] = None
+    prefsrc: Optional[str] = None
+
+    def describe(self) -> str:
+        parts = [self.dst]
+        if self.gateway:
+            parts.append(f"via {self.gateway}")
+        if self.dev:
+            parts.append(f"dev {self.dev}")
+        if self.protocol:
+            parts.append(f"proto {self.protocol}")
+        if self.scope:
+            parts.append(f"scope {self.scope}")
+        if self.prefsrc:
+            parts.append(f"src {self.prefsrc}")
+        return " ".join(parts)
+
+
+def normalize_prefix(prefix: str) -> str:
+    """Normalize a route destination, e.g. "10.0.0.1" -> "10.0.0.1/32"."""
+    if prefix == "default":
+        return prefix
+    try:
+        return str(ipaddress.ip_network(prefix, strict=False))
+    except ValueError:
+        return prefix
+
+
+@dataclass
+class NodeSnapshot:
+    """Structured interface and routing state of a node at one point in time."""
+
+    node: str
+    interfaces: Dict[str, InterfaceState]  # interface name -> state
+    routes: Dict[str, List[RouteEntry]]  # normalized prefix -> routes
+
+    @classmethod
+    def parse(
+        cls, node: str, addr_output: str, link_output: str, route_output: str
+    ) -> "NodeSnapshot":
+        interfaces = {}
+        for link in json.loads(addr_output or "[]"):
+            if "ifname" not in link:
+                continue
+            interfaces[link["ifname"]] = InterfaceState(
+                name=link["ifname"],
+                index=link.get("ifindex", 0),
+                flags=link.get("flags", []),
+                operstate=link.get("operstate", "UNKNOWN"),
+                mtu=link.get("mtu", 0),
+                mac=link.get("address"),
+                parent=link.get("link"),
+                addresses=[
+                    InterfaceAddress(
+                        family=info["family"],
+                        local=info["local"],
+                        prefixlen=info["prefixlen"],
+                    )
+                    for info in link.get("addr_info", [])
+                    if "local" in info
+                ],
+            )
+
+        for link in json.loads(link_output or "[]"):
+            interface = interfaces.get(link.get("ifname"))
+            if interface is None:
+                continue
+            linkinfo = link.get("linkinfo", {})
+            interface.kind = linkinfo.get("info_kind")
+            if interface.kind == "vlan":
+                interface.vlan_id = linkinfo.get("info_data", {}).get("id")
+
+        routes: Dict[str, List[RouteEntry]] = {}
+        for route in json.loads(route_output or "[]"):
+            entry = RouteEntry(
+                dst=normalize_prefix(route.get("dst", "default")),
+                dev=route.get("dev"),
+                gateway=route.get("gateway"),
+                protocol=route.get("protocol"),
+                scope=route.get("scope"),
+                prefsrc=route.get("prefsrc"),
+            )
+            routes.setdefault(entry.dst, []).append(entry)
+
+        return cls(node=node, interfaces=interfaces, routes=routes)
+
+    def interface(self, name: str) -> Optional[InterfaceState]:
+        return self.interfaces.get(name)
+
+    def has_route(self, prefix: str, dev: Optional[str] = None) -> bool:
+        """Exact route lookup by destination prefix, optionally via a device."""
+        entries = self.routes.get(normalize_prefix(prefix), [])
+        return any(dev is None or entry.dev == dev for entry in entries)
+
+    def describe_routes(self) -> str:
+        return "\n".join(
+            entry.describe() for entries in self.routes.values() for entry in entries
+        )
@@ -1,88 +1,381 @@
 # src/core/test_base.py
 
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-import docker
-from docker.errors import NotFound
-
-from src.core.config import ConfigManager
+from src.core.backends.base import NodeNotFound, create_backend
+from src.core.batch import BatchEntry
+from src.core.checkpoint import Checkpoint, plan_changes
+from src.core.config import DEFAULT_TIMEOUT, ConfigManager, ProbeConfig
 from src.core.logging import CommandLog, TestCommandLogger
+from src.core.metrics import (
+    COMMAND_FAILURES,
+    COMMAND_SECONDS,
+    EXEC_ERRORS,
+    EXEC_SECONDS,
+    PROBE_LOST,
+    PROBE_RTT_SECONDS,
+    TEST_SECONDS,
+    TESTS,
+)
+from src.core.output import BoundedOutput, bound_output, capture_stream
 from src.core.reporter import TestReporter, TestResult
+from src.core.snapshot import SNAPSHOT_COMMANDS, NodeSnapshot, is_mutating_command
+from src.core.tracing import span
+from src.protocol.probe import (
+    ProbeResult,
+    ReachabilityProbe,
+    parse_ping_output,
+    ping_command,
+)
+
+# Interface a ping is bound to, e.g. "ping -I eth0.10 -c 3 192.168.10.2"
+_PING_INTERFACE = re.compile(r"\s-I\s*(\S+)")
 
 
 class NetworkTestBase:
-    def __init__(self):
-        self.docker_client = docker.from_env()
+    # Upper bound on concurrent execs when fanning commands out to many nodes
+    max_fanout_workers = 32
+
+    def __init__(
+        self,
+        docker_client=None,
+        config_name: Optional[str] = None,
+        module_name: Optional[str] = None,
+    ):
         self.config_manager = ConfigManager()
+        framework = self.config_manager.framework
+        # Time budget and probe deadlines come from the named test config
+        test_config = self.config_manager.config.get(config_name)
+        self.timeout = test_config.timeout if test_config else DEFAULT_TIMEOUT
+        self.probe_config = test_config.probe if test_config else ProbeConfig()
+        self._test_started: Optional[float] = None
+        # Runs node commands in containers, namespaces or a simulated network
+        self.backend = create_backend(self.config_manager, docker_client)
+        self.max_output_size = framework.max_output_size
         self.reporter = TestReporter()
-        self.current_module = self.__class__.__module__.split(".")[-1]
-        self.command_logger = TestCommandLogger()
+        # Results are recorded under the test module's short name, which also
+        # keys its duration for scheduling (pass request.module.__name__)
+        module_name = module_name or self.__class__.__module__
+        self.current_module = module_name.split(".")[-1]
+        self.command_logger = TestCommandLogger(self.reporter.blob_store)
+        self.keep_output = framework.keep_output
         self.current_test_name = None  # Add this to track current test
+        self.current_details: Dict[str, Any] = {}  # Extra result details
+        self.current_latency: List[Dict] = []  # RTT stats of the test's pings
+        self._latency_lock = threading.Lock()
+        self._snapshots: Dict[str, NodeSnapshot] = {}  # node -> current state
+        self._snapshot_lock = threading.Lock()
 
     def _execute_command(
-        self, container, command: str, node_name: str
+        self,
+        container,
+        command: str,
+        node_name: str,
+        stream: bool = False,
+        on_line: Optional[Callable[[str], bool]] = None,
     ) -> Tuple[int, str]:
-        """Execute a command in a container and log it."""
+        """Execute a command in a container and log it.
+
+        With `stream` (implied by `on_line`), output is read and decoded as it
+        arrives. `on_line` is called for every output line; returning True stops
+        reading early and counts the command as successful. In both modes the
+        kept output is capped at the configured max_output_size.
+        """
         start_time = time.time()
 
         try:
-            result = container.exec_run(command)
-            duration = time.time() - start_time
+            with span("execute_command", node=node_name, command=command):
+                if stream or on_line is not None:
+                    exit_code, captured = self._exec_with_refresh(
+                        container,
+                        node_name,
+                        lambda c: self._stream_exec(c, command, on_line),
+                    )
+                    output, truncated = captured.getvalue(), captured.truncated
+                else:
+                    result = self._exec_with_refresh(
+                        container, node_name, lambda c: c.exec_run(command)
+                    )
+                    exit_code = result.exit_code
+                    with span("decode_output", size=len(result.output)):
+                        output, truncated = bound_output(
+                            result.output.decode("utf-8", errors="replace"),
+                            self.max_output_size,
+                        )
+                duration = time.time() - start_time
 
-            if self.current_test_name:  # Use the tracked test name
-                log = CommandLog(
-                    node=node_name,
-                    command=command,
-                    exit_code=result.exit_code,
-                    output=result.output.decode("utf-8"),
-                    timestamp=datetime.now(),
-                    duration=duration,
+                self._log_command(
+                    node_name, command, exit_code, output, duration, truncated
                 )
-
-                self.command_logger.add_log(self.current_test_name, log)
-            else:
-                print("No current test name available for logging command")
-
-            return result.exit_code, result.output.decode("utf-8")
+                return exit_code, output
         except Exception as e:
             print(f"Error executing command on {node_name}: {str(e)}")
             raise
 
+    def _stream_exec(
+        self, container, command: str, on_line: Optional[Callable[[str], bool]]
+    ) -> Tuple[int, BoundedOutput]:
+        """Run a command through a streaming exec and capture its output."""
+        execution = container.exec_stream(command)
+        try:
+            captured, stopped = capture_stream(execution, self.max_output_size, on_line)
+        finally:
+            execution.close()
+
+        if stopped:
+            return 0, captured
+        return execution.exit_code(), captured
+
+    def _execute_commands(
+        self, container, commands: List[str], node_name: str, parallel: int = 1
+    ) -> List[BatchEntry]:
+        """Execute several commands in a single exec and log each of them.
+
+        With parallel > 1, up to that many of the commands run concurrently
+        inside the container.
+        """
+        with span("execute_commands", node=node_name, commands=len(commands)):
+            try:
+                entries = self._exec_with_refresh(
+                    container, node_name, lambda c: c.exec_batch(commands, parallel)
+                )
+            except Exception as e:
+                print(f"Error executing commands on {node_name}: {str(e)}")
+                raise
+
+            for entry in entries:
+                entry.output, truncated = bound_output(
+                    entry.output, self.max_output_size
+                )
+                self._log_command(
+                    node_name,
+                    entry.command,
+                    entry.exit_code,
+                    entry.output,
+                    entry.duration,
+                    truncated,
+                )
+            return entries
+
+    def get_container(self, node: str):
+        """Get the backend handle of a test node."""
+        with span("get_container", node=node):
+            try:
+                return self.backend.get(node)
+            except NodeNotFound:
+                raise Exception(f"Container {node} not found")
+
+    def _exec_with_refresh(self, container, node_name: str, exec_func: Callable):
+        """Run exec_func(container), retrying once if the handle went stale."""
+        start = time.perf_counter()
+        try:
+            try:
+                with span("exec", node=node_name):
+                    return exec_func(container)
+            except Exception as e:
+                if not self.backend.is_stale_error(e):
+                    raise
+                self.backend.invalidate(node_name)
+                with span("exec", node=node_name, retry=True):
+                    return exec_func(self.get_container(node_name))
+        except Exception:
+            EXEC_ERRORS.inc(node=node_name)
+            raise
+        finally:
+            EXEC_SECONDS.observe(time.perf_counter() - start, node=node_name)
+
+    def map_nodes(
+        self, func: Callable, nodes: List[str], max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Call func(node) for every node concurrently and map node -> result."""
+        workers = min(max_workers or self.max_fanout_workers, len(nodes)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {node: executor.submit(func, node) for node in nodes}
+            return {node: future.result() for node, future in futures.items()}
+
+    def run_on_nodes(
+        self,
+        commands: Union[str, Dict[str, str]],
+        nodes: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Tuple[int, str]]:
+        """Run commands on many nodes concurrently.
+
+        `commands` is either a single command run on every node in `nodes`, or a
+        mapping of node name to the command to run on that node. Returns a map of
+        node name to (exit_code, output).
+        """
+        if isinstance(commands, str):
+            if nodes is None:
+                raise ValueError("nodes must be given when running a single command")
+            commands = {node: commands for node in nodes}
+
+        def run(node: str) -> Tuple[int, str]:
+            return self._execute_command(self.get_container(node), commands[node], node)
+
+        return self.map_nodes(run, list(commands), max_workers)
+
+    def remaining_budget(self) -> float:
+        """Seconds left of the current test's time budget."""
+        if self._test_started is None:
+            return float(self.timeout)
+        return self.timeout - (time.time() - self._test_started)
+
+    def probe_reachability(self, probes: List[ReachabilityProbe]) -> List[ProbeResult]:
+        """Run reachability probes concurrently within the test's time budget.
+
+        Positive probes finish at the first reply, negative ones after the
+        configured short deadline; deadlines are cut to the remaining budget.
+        All probes of a node run in one exec. Results are in `probes` order.
+        """
+        remaining = self.remaining_budget()
+        if remaining < 1:
+            raise Exception(f"Time budget of {self.timeout}s exhausted")
+
+        commands = []
+        for probe in probes:
+            deadline = probe.deadline or (
+                self.probe_config.positive_deadline
+                if probe.expect_reachable
+                else self.probe_config.negative_deadline
+            )
+            commands.append(
+                ping_command(
+                    probe.target,
+                    min(deadline, int(remaining)),
+                    self.probe_config.interval,
+                    probe.interface,
+                )
+            )
+
+        by_node: Dict[str, List[int]] = {}
+        for index, probe in enumerate(probes):
+            by_node.setdefault(probe.node, []).append(index)
+        results: List[Optional[ProbeResult]] = [None] * len(probes)
+
+        def run(node: str):
+            indexes = by_node[node]
+            entries = self._execute_commands(
+                self.get_container(node),
+                [commands[i] for i in indexes],
+                node,
+                parallel=len(indexes),
+            )
+            for index, entry in zip(indexes, entries):
+                stats = parse_ping_output(entry.output)
+                results[index] = ProbeResult(
+                    probe=probes[index],
+                    reachable=stats is not None and stats.reachable,
+                    duration=entry.duration,
+                    stats=stats,
+                    error=entry.output.strip() if stats is None else None,
+                )
+
+        self.map_nodes(run, list(by_node))
+        return results
+
+    def _log_command(
+        self,
+        node_name: str,
+        command: str,
+        exit_code: int,
+        output: str,
+        duration: float,
+        truncated: int = 0,
+    ):
+        """Record a command execution against the current test."""
+        program = command.split(None, 1)[0] if command.strip() else ""
+        COMMAND_SECONDS.observe(duration, node=node_name, program=program)
+        if exit_code != 0:
+            COMMAND_FAILURES.inc(node=node_name, program=program)
+        if is_mutating_command(command):
+            self.invalidate_snapshot(node_name)
+        if command.lstrip().startswith("ping"):
+            self._record_latency(node_name, command, output)
+
+        if self.current_test_name:  # Use the tracked test name
+            log = CommandLog(
+                node=node_name,
+                command=command,
+                exit_code=exit_code,
+                output=output,
+                timestamp=datetime.now(),
+                duration=duration,
+                truncated=truncated,
+            )
+
+            self.command_logger.add_log(self.current_test_name, log)
+        else:
+            print("No current test name available for logging command")
+
+    def _record_latency(self, node_name: str, command: str, output: str):
+        """Keep the RTT statistics of a ping for the current test's result."""
+        stats = parse_ping_output(output)
+        if stats is None:
+            return
+        target = stats.target or ""
+        for rtt in stats.samples:
+            PROBE_RTT_SECONDS.observe(rtt / 1000, source=node_name, target=target)
+        if stats.transmitted > stats.received:
+            PROBE_LOST.inc(
+                stats.transmitted - stats.received, source=node_name, target=target
+            )
+        if self.current_test_name is None:
+            return
+        interface = _PING_INTERFACE.search(command)
+        probe = {
+            "source": node_name,
+            "interface": interface.group(1) if interface else None,
+            **stats.to_dict(),
+        }
+        with self._latency_lock:
+            self.current_latency.append(probe)
+
+    def attach_details(self, key: str, value: Any):
+        """Attach structured data to the current test's result details."""
+        self.current_details[key] = value
+
     def run_test(self, test_name: str, test_func, *args, **kwargs):
         """Run a test with command logging."""
+        with span("run_test", "test", module=self.current_module, test=test_name):
+            self._run_test(test_name, test_func, *args, **kwargs)
+
+    def _run_test(self, test_name: str, test_func, *args, **kwargs):
         self.current_test_name = test_name  # Set the current test name
+        self.current_details = {}
+        self.current_latency = []
+        self.invalidate_snapshot()
         start_time = time.time()
+        self._test_started = start_time
         error_message = None
         status = "PASS"
 
         try:
-            test_func(*args, **kwargs)
+            with span("test_body", "test", test=test_name):
+                test_func(*args, **kwargs)
         except Exception as e:
             status = "FAIL"
             error_message = str(e)
             print(f"Test failed: {str(e)}")
         finally:
             duration = time.time() - start_time
+            TEST_SECONDS.observe(duration, module=self.current_module, test=test_name)
+            TESTS.inc(module=self.current_module, status=status)
 
-            # Get command logs for this test
-            test_logs = self.command_logger.get_logs(test_name)
-
-            # Convert command logs to dictionary format
-            command_logs = [
-                {
-                    "node": log.node,
-                    "command": log.command,
-                    "exit_code": log.exit_code,
-                    "output": log.output,
-                    "timestamp": log.timestamp.isoformat(),
-                    "duration": log.duration,
-                }
-                for log in test_logs
-            ]
+            # Spill command outputs to the blob store; the result only keeps
+            # references (and no output at all if the policy drops it)
+            keep_output = self.keep_output == "all" or status == "FAIL"
+            with span("finalize_logs", test=test_name):
+                command_logs = self.command_logger.finalize(test_name, keep_output)
 
-            details = {"command_logs": command_logs}
+            details = {"command_logs": command_logs, **self.current_details}
+            if self.current_latency:
+                details["latency"] = self.current_latency
 
             result = TestResult(
                 module_name=self.current_module,
@@ -96,40 +389,97 @@ class NetworkTestBase:
 
             self.reporter.add_result(self.current_module, result)
 
-            # Clear logs for this test
-            self.command_logger.clear_logs(test_name)
             self.current_test_name = None  # Clear the current test name
+            self.current_details = {}
+            self.current_latency = []
+            self._test_started = None
+            self.invalidate_snapshot()
 
-    def verify_interface(self, node: str, interface: str) -> Dict[str, str]:
-        """Verify interface configuration with logging."""
-        cmd = f"ip addr show {interface}"
+    def snapshot(self, node: str) -> NodeSnapshot:
+        """Get the node's interface and route state, cached for the current test.
 
-        try:
-            container = self.docker_client.containers.get(
-                f"network-test-framework-{node}-1"
-            )
-            exit_code, output = self._execute_command(container, cmd, node)
+        The cache is dropped at test boundaries and after mutating `ip`
+        commands run through this class; call invalidate_snapshot after changing
+        a node by other means.
+        """
+        with self._snapshot_lock:
+            cached = self._snapshots.get(node)
+        if cached is not None:
+            return cached
 
-            if exit_code != 0:
-                raise Exception(f"Failed to get interface information: {output}")
+        entries = self._execute_commands(
+            self.get_container(node), SNAPSHOT_COMMANDS, node
+        )
+        for entry in entries:
+            if entry.exit_code != 0:
+                raise Exception(
+                    f"Failed to read state of {node} ({entry.command}): {entry.output}"
+                )
 
-            return {"status": "UP" if "UP" in output else "DOWN", "details": output}
-        except NotFound:
-            raise Exception(f"Container {node} not found")
+        snapshot = NodeSnapshot.parse(node, *(entry.output for entry in entries))
+        with self._snapshot_lock:
+            self._snapshots[node] = snapshot
+        return snapshot
 
-    def check_routing_table(self, node: str) -> Dict[str, str]:
-        """Check routing table with logging."""
-        cmd = "ip route"
+    def invalidate_snapshot(self, node: Optional[str] = None):
+        """Drop the cached snapshot of a node, or of all nodes."""
+        with self._snapshot_lock:
+            if node is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(node, None)
 
-        try:
-            container = self.docker_client.containers.get(
-                f"network-test-framework-{node}-1"
+    def apply_checkpoint(self, checkpoint: Checkpoint) -> Dict[str, int]:
+        """Bring the checkpoint's nodes to its state, changing only what differs.
+
+        The state is left in place afterwards, so the next test asking for the
+        same checkpoint only pays for reading the nodes' live state. Returns
+        the number of `ip` changes made per node; raises if any of them failed.
+        """
+
+        def apply(node: str) -> int:
+            lines = plan_changes(checkpoint.nodes[node], self.snapshot(node))
+            if not lines:
+                return 0
+
+            start_time = time.time()
+            result = self._exec_with_refresh(
+                self.get_container(node), node, lambda c: c.exec_ip_batch(lines)
+            )
+            output = result.output.decode("utf-8", errors="replace")
+            command = "ip -force -batch -\n" + "\n".join(lines)
+            self._log_command(
+                node, command, result.exit_code, output, time.time() - start_time
             )
-            exit_code, output = self._execute_command(container, cmd, node)
+            if result.exit_code != 0:
+                raise Exception(
+                    f"Failed to apply checkpoint {checkpoint.name} on {node}: "
+                    f"{output.strip()}"
+                )
+            return len(lines)
+
+        with span("apply_checkpoint", checkpoint=checkpoint.name):
+            changes = self.map_nodes(apply, list(checkpoint.nodes))
+        self.attach_details(
+            "checkpoint",
+            {"name": checkpoint.name, "hash": checkpoint.hash, "changes": changes},
+        )
+        return changes
 
-            if exit_code != 0:
-                raise Exception(f"Failed to get routing table: {output}")
+    def verify_interface(self, node: str, interface: str) -> Dict[str, str]:
+        """Verify interface configuration with logging."""
+        state = self.snapshot(node).interface(interface)
+        if state is None:
+            raise Exception(
+                f"Failed to get interface information: {interface} not found"
+            )
+
+        return {"status": "UP" if state.is_up else "DOWN", "details": state.describe()}
+
+    def check_routing_table(self, node: str) -> Dict[str, str]:
+        """Check routing table with logging."""
+        return {"status": "SUCCESS", "routes": self.snapshot(node).describe_routes()}
 
-            return {"status": "SUCCESS", "routes": output}
-        except NotFound:
-            raise Exception(f"Container {node} not found")
+    def has_route(self, node: str, prefix: str, dev: Optional[str] = None) -> bool:
+        """Check for an exact route prefix in a node's routing table."""
+        return self.snapshot(node).has_route(prefix, dev)
@@ -0,0 +1,271 @@
+# src/core/topology.py
+import functools
+import hashlib
+import ipaddress
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+NODE_IMAGE_DIR = Path(__file__).parent.parent.parent / "docker" / "node"
+# Tag of the image built from NODE_IMAGE_DIR
+NODE_IMAGE = "network-test-node:latest"
+# Network of the nodes in docker-compose.yml
+COMPOSE_NETWORK = "test_net"
+
+
+@functools.lru_cache(maxsize=None)
+def node_image_hash() -> str:
+    """Hash of the node image's build context, e.g. its Dockerfile."""
+    digest = hashlib.sha256()
+    for path in sorted(NODE_IMAGE_DIR.rglob("*")):
+        if path.is_file():
+            digest.update(str(path.relative_to(NODE_IMAGE_DIR)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class Topology:
+    """Set of test nodes on one subnet, as generated from the YAML config."""
+
+    project: str
+    image: str
+    subnet: str
+    nodes: Dict[str, str]  # node name -> IPv4 address
+
+    @classmethod
+    def from_nodes(cls, project: str, image: str, nodes: Dict) -> "Topology":
+        """Build a topology from NetworkConfig entries sharing one subnet."""
+        subnets = {
+            str(
+                ipaddress.ip_network(
+                    f"{node.ip_address}/{node.subnet_mask}", strict=False
+                )
+            )
+            for node in nodes.values()
+        }
+        if len(subnets) != 1:
+            raise ValueError(f"Topology nodes must share one subnet, got {subnets}")
+
+        return cls(
+            project=project,
+            image=image,
+            subnet=subnets.pop(),
+            nodes={name: node.ip_address for name, node in sorted(nodes.items())},
+        )
+
+    @property
+    def network_name(self) -> str:
+        # Same name docker compose gives the `test_net` network
+        return f"{self.project}_{COMPOSE_NETWORK}"
+
+    @property
+    def hash(self) -> str:
+        """Stable hash of everything that requires recreating the containers."""
+        data = json.dumps(
+            {
+                "image": self.image,
+                # Changes to the built image must reach warm containers too
+                "build": node_image_hash() if self.image == NODE_IMAGE else None,
+                "subnet": self.subnet,
+                "nodes": self.nodes,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+
+class TopologyManager:
+    """Brings a topology up from a pre-baked image and keeps it warm.
+
+    The docker SDK is imported lazily so loading the configuration, which
+    generates topologies, does not pay for it.
+
+    Containers are labelled with the topology hash. When every node is already
+    running with the current hash it is reused as is; otherwise only the stale
+    or missing containers are (re)created, concurrently.
+
+    The network and containers carry the labels docker compose gives them, so
+    `docker-compose up` accepts a topology started here. Containers started by
+    compose have no topology hash and are recreated once.
+    """
+
+    HASH_LABEL = "network-test.topology-hash"
+    IMAGE_HASH_LABEL = "network-test.image-hash"
+    PROJECT_LABEL = "com.docker.compose.project"
+    SERVICE_LABEL = "com.docker.compose.service"
+    NETWORK_LABEL = "com.docker.compose.network"
+    ONEOFF_LABEL = "com.docker.compose.oneoff"
+    NUMBER_LABEL = "com.docker.compose.container-number"
+
+    max_workers = 16
+
+    def __init__(self, client, topology: Topology, name_pattern: str):
+        self.client = client
+        self.topology = topology
+        self.name_pattern = name_pattern
+
+    def container_name(self, node: str) -> str:
+        return self.name_pattern.format(project=self.topology.project, node=node)
+
+    def _project_containers(self) -> Dict[str, object]:
+        containers = self.client.containers.list(
+            all=True, filters={"label": f"{self.PROJECT_LABEL}={self.topology.project}"}
+        )
+        return {c.name: c for c in containers}
+
+    def stale_nodes(self) -> List[str]:
+        """Nodes whose container is missing, stopped or from another topology."""
+        containers = self._project_containers()
+        stale = []
+        for node in self.topology.nodes:
+            container = containers.get(self.container_name(node))
+            if (
+                container is None
+                or container.status != "running"
+                or container.labels.get(self.HASH_LABEL) != self.topology.hash
+            ):
+                stale.append(node)
+        return stale
+
+    def is_warm(self) -> bool:
+        return not self.stale_nodes()
+
+    def ensure_up(self, timeout: float = 60.0) -> bool:
+        """Reuse or (re)create the topology's containers and wait until ready."""
+        stale = self.stale_nodes()
+        if stale:
+            self._ensure_image()
+            network, created = self._ensure_network()
+            if created:
+                # A replaced network took every container with it
+                stale = list(self.topology.nodes)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                list(executor.map(lambda node: self._create_node(node, network), stale))
+        return self.wait_ready(timeout)
+
+    def _ensure_image(self):
+        """Build the node image when missing, or when built from an older context.
+
+        Other images than NODE_IMAGE are only built when missing, so an image
+        configured from a registry is left alone.
+        """
+        from docker.errors import ImageNotFound
+
+        build_hash = node_image_hash()
+        try:
+            image = self.client.images.get(self.topology.image)
+            if self.topology.image != NODE_IMAGE:
+                return
+            if (image.labels or {}).get(self.IMAGE_HASH_LABEL) == build_hash:
+                return
+        except ImageNotFound:
+            pass
+        self.client.images.build(
+            path=str(NODE_IMAGE_DIR),
+            tag=self.topology.image,
+            labels={self.IMAGE_HASH_LABEL: build_hash},
+        )
+
+    def _ensure_network(self) -> Tuple[object, bool]:
+        """Get the topology's network, creating it if needed.
+
+        Returns the network and whether it was created. A network on another
+        subnet, or without the compose labels, is replaced.
+        """
+        # greedy fetches each network in full, listing its attached containers
+        networks = self.client.networks.list(
+            names=[self.topology.network_name], greedy=True
+        )
+        for network in networks:
+            configs = network.attrs.get("IPAM", {}).get("Config") or []
+            labels = network.attrs.get("Labels") or {}
+            if (
+                any(cfg.get("Subnet") == self.topology.subnet for cfg in configs)
+                and labels.get(self.NETWORK_LABEL) == COMPOSE_NETWORK
+            ):
+                return network, False
+            # Containers attached to the old network must go first
+            for container in network.containers:
+                container.remove(force=True)
+            network.remove()
+
+        network = self.client.networks.create(
+            self.topology.network_name,
+            ipam={"Config": [{"Subnet": self.topology.subnet}]},
+            labels={
+                self.PROJECT_LABEL: self.topology.project,
+                self.NETWORK_LABEL: COMPOSE_NETWORK,
+            },
+        )
+        return network, True
+
+    def _create_node(self, node: str, network):
+        from docker.errors import NotFound
+
+        name = self.container_name(node)
+        try:
+            self.client.containers.get(name).remove(force=True)
+        except NotFound:
+            pass
+
+        api = self.client.api
+        container = api.create_container(
+            self.topology.image,
+            name=name,
+            hostname=node,
+            detach=True,
+            labels={
+                self.PROJECT_LABEL: self.topology.project,
+                self.SERVICE_LABEL: node,
+                self.ONEOFF_LABEL: "False",
+                self.NUMBER_LABEL: "1",
+                self.HASH_LABEL: self.topology.hash,
+            },
+            host_config=api.create_host_config(cap_add=["NET_ADMIN"]),
+            networking_config=api.create_networking_config(
+                {
+                    network.name: api.create_endpoint_config(
+                        ipv4_address=self.topology.nodes[node]
+                    )
+                }
+            ),
+        )
+        api.start(container["Id"])
+
+    def wait_ready(self, timeout: float = 60.0) -> bool:
+        """Probe every node until its eth0 carries the configured address."""
+        from docker.errors import APIError
+
+        deadline = time.monotonic() + timeout
+
+        def probe(node: str) -> bool:
+            while time.monotonic() < deadline:
+                try:
+                    container = self.client.containers.get(self.container_name(node))
+                    if container.status == "running":
+                        result = container.exec_run("ip -j addr show eth0")
+                        if (
+                            result.exit_code == 0
+                            and f'"{self.topology.nodes[node]}"'
+                            in result.output.decode()
+                        ):
+                            return True
+                except APIError:
+                    pass
+                time.sleep(0.2)
+            return False
+
+        workers = min(self.max_workers, len(self.topology.nodes)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return all(executor.map(probe, self.topology.nodes))
+
+    def down(self):
+        """Remove the topology's containers and network."""
+        for container in self._project_containers().values():
+            container.remove(force=True)
+        for network in self.client.networks.list(names=[self.topology.network_name]):
+            network.remove()
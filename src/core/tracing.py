@@ -0,0 +1,146 @@
+# src/core/tracing.py
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Set to "1" to record spans; inherited by the runner's worker processes
+TRACE_ENV = "NETWORK_TEST_TRACE"
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.time_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(
+            {
+                "name": self.name,
+                "cat": self.category,
+                "ph": "X",
+                "ts": self.start / 1000,
+                "dur": (end - self.start) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": self.args,
+            }
+        )
+        return False
+
+
+class Tracer:
+    """Records nested spans as Chrome trace events (chrome://tracing, Perfetto).
+
+    Spans are "complete" events on the recording thread, so nesting follows
+    from their timestamps. Events are appended to a JSON array file without the
+    closing bracket, which both viewers accept, so the trace can be streamed
+    and merged without rewriting it. When disabled, span() returns a shared
+    no-op context manager.
+    """
+
+    # Buffered events that trigger a write to the trace file
+    flush_threshold = 10000
+
+    def __init__(self):
+        self.enabled = os.environ.get(TRACE_ENV) == "1"
+        self.path: Optional[Path] = None
+        self.process_name: Optional[str] = None
+        self._events: List[Dict] = []
+        self._lock = threading.Lock()
+        self._file = None
+
+    def enable(self):
+        """Start recording spans, here and in worker processes started later."""
+        os.environ[TRACE_ENV] = "1"
+        self.enabled = True
+
+    def configure(self, path: Path, process_name: str):
+        """Set the trace file spans are written to."""
+        self.path = Path(path)
+        self.process_name = process_name
+
+    def span(self, name: str, category: str = "framework", **args):
+        """Context manager recording the duration of its block."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name, category, args)
+
+    def _record(self, event: Dict):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._events.append(event)
+            pending = len(self._events)
+        if pending >= self.flush_threshold:
+            self.flush()
+
+    def flush(self):
+        """Append buffered events to the trace file."""
+        with self._lock:
+            if not self._events or self.path is None:
+                return
+            events, self._events = self._events, []
+            self._write("".join(json.dumps(e, default=str) + ",\n" for e in events))
+
+    def absorb(self, trace_file: Path):
+        """Append the events of another process's trace file to this one."""
+        self.flush()
+        with open(trace_file) as f:
+            events = [line for line in f if line.strip() not in ("", "[")]
+        if not events or self.path is None:
+            return
+        with self._lock:
+            self._write("".join(events))
+
+    def _write(self, data: str):
+        # Called with the lock held
+        if self._file is None:
+            self._file = open(self.path, "a")
+            if self._file.tell() == 0:
+                name = {"name": self.process_name or f"pid {os.getpid()}"}
+                metadata = {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "args": name,
+                }
+                self._file.write(f"[\n{json.dumps(metadata)},\n")
+        self._file.write(data)
+        self._file.flush()
+
+
+TRACER = Tracer()
+
+
+def span(name: str, category: str = "framework", **args):
+    """Record a span on the process-wide tracer."""
+    if not TRACER.enabled:
+        return _NO_SPAN
+    return _Span(TRACER, name, category, args)
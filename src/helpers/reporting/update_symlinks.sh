@@ -10,11 +10,17 @@ elif [ -L "$REPORTS_DIR/last" ]; then
     unlink "$REPORTS_DIR/last"
 fi
 
+# Ask the results store for the latest execution
+latest=$(python -m src.cli.results --report-dir "$REPORTS_DIR" latest 2>/dev/null)
+
 # Navigate to the reports directory
 cd "$REPORTS_DIR" || { echo "Error: Cannot access reports directory"; exit 1; }
 
-# Get the latest folder sorted by modification time
-latest=$(ls -t | head -n 1)
+# Without a store, fall back to the newest execution directory
+if [ -z "$latest" ] || [ ! -d "$latest" ]; then
+    latest=$(ls -td execution_*/ 2>/dev/null | head -n 1)
+    latest=${latest%/}
+fi
 
 # Check if we have at least 1 directory
 if [ -z "$latest" ]; then
@@ -0,0 +1,146 @@
+# src/protocol/mesh.py
+import math
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from src.core.config import NetworkConfig
+from src.protocol.probe import parse_ping_output
+
+NOT_PROBED = -1
+
+
+class ConnectivityMatrix:
+    """N x N probe results stored in flat typed arrays.
+
+    Cell (i, j) holds the result of probing node j from node i. Reachability is
+    -1 (not probed), 0 or 1; loss is a percentage and RTT the average in ms,
+    both NaN when unknown.
+    """
+
+    def __init__(self, nodes: List[str]):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        size = len(self.nodes) ** 2
+        self.reachable = array("b", [NOT_PROBED]) * size
+        self.loss = array("f", [math.nan]) * size
+        self.rtt_avg = array("f", [math.nan]) * size
+
+    def _cell(self, source: str, target: str) -> int:
+        return self.index[source] * len(self.nodes) + self.index[target]
+
+    def set(
+        self,
+        source: str,
+        target: str,
+        reachable: bool,
+        loss: Optional[float],
+        rtt_avg: Optional[float],
+    ):
+        cell = self._cell(source, target)
+        self.reachable[cell] = int(reachable)
+        self.loss[cell] = math.nan if loss is None else loss
+        self.rtt_avg[cell] = math.nan if rtt_avg is None else rtt_avg
+
+    def get(self, source: str, target: str) -> Dict:
+        cell = self._cell(source, target)
+        return {
+            "reachable": _optional_flag(self.reachable[cell]),
+            "loss": _optional_float(self.loss[cell]),
+            "rtt_avg": _optional_float(self.rtt_avg[cell]),
+        }
+
+    def unreachable_pairs(self) -> List[Tuple[str, str]]:
+        """Probed (source, target) pairs that got no reply."""
+        size = len(self.nodes)
+        return [
+            (self.nodes[cell // size], self.nodes[cell % size])
+            for cell, value in enumerate(self.reachable)
+            if value == 0
+        ]
+
+    def to_dict(self) -> Dict:
+        """Row-major lists for the JSON report, with null for unknown cells."""
+        size = len(self.nodes)
+
+        def rows(values, convert):
+            return [
+                [convert(values[i * size + j]) for j in range(size)]
+                for i in range(size)
+            ]
+
+        return {
+            "nodes": self.nodes,
+            "reachable": rows(self.reachable, _optional_flag),
+            "loss": rows(self.loss, _optional_float),
+            "rtt_avg": rows(self.rtt_avg, _optional_float),
+        }
+
+
+def _optional_flag(value: int) -> Optional[bool]:
+    return None if value == NOT_PROBED else bool(value)
+
+
+def _optional_float(value: float) -> Optional[float]:
+    return None if math.isnan(value) else round(value, 3)
+
+
+class ConnectivityMesh:
+    """Probes every ordered pair of nodes and fills a ConnectivityMatrix.
+
+    Each source node runs all of its probes in a single exec, with at most
+    `per_source_limit` pings in flight at once, and the sources themselves are
+    probed concurrently, so a full mesh takes about as long as its slowest row.
+    """
+
+    def __init__(
+        self,
+        network_test,
+        nodes: Dict[str, NetworkConfig],
+        per_source_limit: int = 16,
+        count: int = 3,
+        timeout: int = 1,
+        max_concurrent_sources: Optional[int] = None,
+    ):
+        self.network_test = network_test
+        self.nodes = nodes
+        self.per_source_limit = per_source_limit
+        self.count = count
+        self.timeout = timeout
+        # By default every row is probed at once
+        self.max_concurrent_sources = max_concurrent_sources or len(nodes)
+
+    def probe(self) -> ConnectivityMatrix:
+        matrix = ConnectivityMatrix(list(self.nodes))
+        self.network_test.map_nodes(
+            lambda source: self._probe_row(matrix, source),
+            list(self.nodes),
+            max_workers=self.max_concurrent_sources,
+        )
+        return matrix
+
+    def _probe_row(self, matrix: ConnectivityMatrix, source: str):
+        targets = [node for node in self.nodes if node != source]
+        commands = [
+            f"ping -c {self.count} -W {self.timeout} "
+            f"{self.nodes[target].ip_address}"
+            for target in targets
+        ]
+        entries = self.network_test._execute_commands(
+            self.network_test.get_container(source),
+            commands,
+            source,
+            parallel=self.per_source_limit,
+        )
+
+        for target, entry in zip(targets, entries):
+            stats = parse_ping_output(entry.output)
+            if stats is None:
+                matrix.set(source, target, False, None, None)
+            else:
+                matrix.set(
+                    source,
+                    target,
+                    stats.reachable,
+                    stats.loss_percent,
+                    stats.rtt_avg,
+                )
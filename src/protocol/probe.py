@@ -0,0 +1,124 @@
+# src/protocol/probe.py
+import math
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+# Summary lines of iputils and busybox ping, e.g.
+#   3 packets transmitted, 3 received, 0% packet loss, time 2003ms
+#   3 packets transmitted, 3 packets received, 0% packet loss
+_PACKETS = re.compile(
+    r"(\d+) packets transmitted, (\d+) (?:packets )?received"
+    r"(?:, \+\d+ \w+)*, ([\d.]+)% packet loss"
+)
+#   rtt min/avg/max/mdev = 0.054/0.067/0.081/0.011 ms
+#   round-trip min/avg/max = 0.084/0.097/0.113 ms
+_RTT = re.compile(r"min/avg/max(?:/mdev)? = ([\d.]+)/([\d.]+)/([\d.]+)(?:/([\d.]+))?")
+#   PING 172.20.0.3 (172.20.0.3) 56(84) bytes of data.
+_TARGET = re.compile(r"^PING (\S+)", re.MULTILINE)
+#   64 bytes from 172.20.0.3: icmp_seq=1 ttl=64 time=0.081 ms
+_REPLY = re.compile(r"bytes from .*time[=<]([\d.]+) ?ms")
+
+
+@dataclass
+class PingStats:
+    """Summary statistics of a single ping run."""
+
+    transmitted: int
+    received: int
+    loss_percent: float
+    rtt_min: Optional[float] = None
+    rtt_avg: Optional[float] = None
+    rtt_max: Optional[float] = None
+    rtt_mdev: Optional[float] = None
+    target: Optional[str] = None
+    rtts: List[float] = field(default_factory=list)  # Per reply, in ms
+
+    @property
+    def samples(self) -> List[float]:
+        """Per-packet RTTs, or the average when ping ran with -q."""
+        if self.rtts:
+            return self.rtts
+        return [self.rtt_avg] if self.rtt_avg is not None else []
+
+    @property
+    def reachable(self) -> bool:
+        return self.received > 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def parse_ping_output(output: str) -> Optional[PingStats]:
+    """Parse the summary of iputils or busybox ping output.
+
+    Returns None when the output has no statistics block, e.g. when ping could
+    not resolve the target or was not found.
+    """
+    packets = _PACKETS.search(output)
+    if packets is None:
+        return None
+
+    stats = PingStats(
+        transmitted=int(packets.group(1)),
+        received=int(packets.group(2)),
+        loss_percent=float(packets.group(3)),
+    )
+    rtt = _RTT.search(output)
+    if rtt is not None:
+        stats.rtt_min = float(rtt.group(1))
+        stats.rtt_avg = float(rtt.group(2))
+        stats.rtt_max = float(rtt.group(3))
+        stats.rtt_mdev = float(rtt.group(4)) if rtt.group(4) else None
+    target = _TARGET.search(output)
+    if target is not None:
+        stats.target = target.group(1)
+    stats.rtts = [float(value) for value in _REPLY.findall(output)]
+    return stats
+
+
+def ping_command(
+    target: str, deadline: int, interval: float, interface: Optional[str] = None
+) -> str:
+    """Ping that exits at the first reply, or after `deadline` seconds without one.
+
+    Probes are sent every `interval` seconds until then, so a lost packet does
+    not fail the check while the deadline has not passed.
+    """
+    command = f"ping -c 1 -w {max(1, math.ceil(deadline))} -i {interval:g}"
+    if interface:
+        command += f" -I {interface}"
+    return f"{command} {target}"
+
+
+@dataclass
+class ReachabilityProbe:
+    """Check of whether `target` answers `node`, expected to succeed or not."""
+
+    node: str
+    target: str
+    expect_reachable: bool = True
+    interface: Optional[str] = None
+    deadline: Optional[int] = None  # Seconds; defaults to the ProbeConfig's
+
+
+@dataclass
+class ProbeResult:
+    probe: ReachabilityProbe
+    reachable: bool
+    duration: float
+    stats: Optional[PingStats] = None
+    error: Optional[str] = None  # Set when ping itself failed to run
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None and self.reachable == self.probe.expect_reachable
+
+    def describe(self) -> str:
+        via = f" via {self.probe.interface}" if self.probe.interface else ""
+        pair = f"{self.probe.node} -> {self.probe.target}{via}"
+        if self.error is not None:
+            return f"{pair}: {self.error}"
+        state = "reachable" if self.reachable else "unreachable"
+        expected = "reachable" if self.probe.expect_reachable else "unreachable"
+        return f"{pair}: {state} (expected {expected}) after {self.duration:.2f}s"
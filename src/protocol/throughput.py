@@ -0,0 +1,198 @@
+# src/protocol/throughput.py
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from src.core.config import ThroughputConfig
+
+DEFAULT_PORT = 5201
+
+
+@dataclass
+class ThroughputInterval:
+    """Traffic of one reporting interval, summed over all streams."""
+
+    start: float
+    end: float
+    bits_per_second: float
+    packets_per_second: Optional[float] = None  # UDP only
+    lost_percent: Optional[float] = None  # UDP only
+    retransmits: Optional[int] = None  # TCP only
+
+
+@dataclass
+class ThroughputResult:
+    """Summary and per-interval metrics of one iperf3 measurement."""
+
+    source: str
+    target: str
+    protocol: str
+    streams: int
+    duration: float
+    bits_per_second: float
+    packets_per_second: Optional[float] = None
+    lost_percent: Optional[float] = None
+    retransmits: Optional[int] = None
+    interface: Optional[str] = None
+    intervals: List[ThroughputInterval] = field(default_factory=list)
+
+    @property
+    def mbps(self) -> float:
+        return self.bits_per_second / 1e6
+
+    def violations(self, config: ThroughputConfig) -> List[str]:
+        """Describe every threshold of `config` this measurement misses."""
+        problems = []
+        if config.min_bandwidth_mbps is not None:
+            if self.mbps < config.min_bandwidth_mbps:
+                problems.append(
+                    f"bandwidth {self.mbps:.1f} Mbit/s below "
+                    f"{config.min_bandwidth_mbps} Mbit/s"
+                )
+        if config.min_packets_per_second is not None:
+            if (self.packets_per_second or 0) < config.min_packets_per_second:
+                problems.append(
+                    f"{self.packets_per_second} packets/s below "
+                    f"{config.min_packets_per_second}"
+                )
+        if config.max_loss_percent is not None and self.lost_percent is not None:
+            if self.lost_percent > config.max_loss_percent:
+                problems.append(
+                    f"loss {self.lost_percent}% above {config.max_loss_percent}%"
+                )
+        if config.max_retransmits is not None and self.retransmits is not None:
+            if self.retransmits > config.max_retransmits:
+                problems.append(
+                    f"{self.retransmits} retransmits above {config.max_retransmits}"
+                )
+        return problems
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["mbps"] = round(self.mbps, 3)
+        return data
+
+
+def parse_iperf3_json(output: str, source: str, target: str) -> ThroughputResult:
+    """Parse the `-J` report of an iperf3 client.
+
+    UDP loss per interval comes from the server's report, which the client
+    includes with --get-server-output.
+    """
+    try:
+        report = json.loads(output)
+    except ValueError:
+        raise Exception(f"iperf3 did not produce a JSON report: {output.strip()}")
+    if report.get("error"):
+        raise Exception(f"iperf3 failed: {report['error']}")
+
+    test_start = report["start"]["test_start"]
+    protocol = test_start["protocol"].lower()
+    end = report["end"]
+
+    server_intervals = (report.get("server_output_json") or {}).get("intervals", [])
+    intervals = []
+    for index, interval in enumerate(report.get("intervals", [])):
+        total = interval["sum"]
+        seconds = total["seconds"] or 1
+        entry = ThroughputInterval(
+            start=total["start"],
+            end=total["end"],
+            bits_per_second=total["bits_per_second"],
+            retransmits=total.get("retransmits"),
+        )
+        if protocol == "udp":
+            entry.packets_per_second = total.get("packets", 0) / seconds
+            if index < len(server_intervals):
+                entry.lost_percent = server_intervals[index]["sum"].get("lost_percent")
+        intervals.append(entry)
+
+    if protocol == "udp":
+        total = end["sum"]
+        return ThroughputResult(
+            source=source,
+            target=target,
+            protocol=protocol,
+            streams=test_start["num_streams"],
+            duration=total["seconds"],
+            bits_per_second=total["bits_per_second"],
+            packets_per_second=total["packets"] / (total["seconds"] or 1),
+            lost_percent=total["lost_percent"],
+            intervals=intervals,
+        )
+
+    # TCP: what the receiver got is the achieved throughput
+    received = end["sum_received"]
+    return ThroughputResult(
+        source=source,
+        target=target,
+        protocol=protocol,
+        streams=test_start["num_streams"],
+        duration=received["seconds"],
+        bits_per_second=received["bits_per_second"],
+        retransmits=end["sum_sent"].get("retransmits"),
+        intervals=intervals,
+    )
+
+
+class ThroughputTester:
+    """Measures bandwidth between two nodes with an iperf3 server/client pair."""
+
+    # Attempts to reach the server, which may still be starting up
+    connect_attempts = 3
+
+    def __init__(self, network_test, port: int = DEFAULT_PORT):
+        self.network_test = network_test
+        self.port = port
+
+    def measure(
+        self,
+        source: str,
+        target: str,
+        target_ip: Optional[str] = None,
+        config: Optional[ThroughputConfig] = None,
+        interface: Optional[str] = None,
+    ) -> ThroughputResult:
+        """Send traffic from `source` to `target` and collect its metrics.
+
+        `target_ip` defaults to the target's configured address; pass the
+        address on a VLAN and its `interface` to measure over that VLAN.
+        """
+        config = config or ThroughputConfig()
+        if target_ip is None:
+            target_ip = self.network_test.config_manager.topology().nodes[target]
+
+        # One-off server in the background: it exits after serving this test
+        self._run(target, f"iperf3 -s -1 -D -p {self.port}")
+
+        command = self._client_command(target_ip, config, interface)
+        for attempt in range(self.connect_attempts):
+            exit_code, output = self._run(source, command)
+            if "Connection refused" not in output:
+                break
+            time.sleep(0.2 * (attempt + 1))
+
+        result = parse_iperf3_json(output, source, target)
+        result.interface = interface
+        return result
+
+    def _client_command(
+        self, target_ip: str, config: ThroughputConfig, interface: Optional[str]
+    ) -> str:
+        command = (
+            f"iperf3 -c {target_ip} -p {self.port} -t {config.duration}"
+            f" -P {config.parallel} -i 1 -J"
+        )
+        if config.protocol == "udp":
+            command += " -u --get-server-output"
+            if config.bandwidth:
+                command += f" -b {config.bandwidth}"
+        if interface:
+            command += f" --bind-dev {interface}"
+        return command
+
+    def _run(self, node: str, command: str):
+        return self.network_test._execute_command(
+            self.network_test.get_container(node), command, node
+        )
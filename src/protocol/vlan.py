@@ -1,7 +1,16 @@
-from dataclasses import dataclass
-from typing import List, Optional
+import ipaddress
+import json
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-from docker.models.containers import Container
+from src.core.backends.base import NodeHandle
+from src.core.checkpoint import Checkpoint, InterfaceSpec
+from src.core.tracing import span
+from src.protocol.probe import ReachabilityProbe
+
+if TYPE_CHECKING:
+    from src.core.test_base import NetworkTestBase
 
 
 @dataclass
@@ -12,45 +21,194 @@ class VLANConfig:
     tagged_ports: List[str]
     untagged_ports: Optional[List[str]] = None
 
+    def interface_address(self, host_index: int) -> str:
+        """Address of the host_index-th node on the VLAN, e.g. 192.168.10.2/24."""
+        network = ipaddress.ip_network(self.ip_network, strict=False)
+        return f"{network[host_index]}/{network.prefixlen}"
+
+
+def vlan_checkpoint(
+    name: str, configs: List[VLANConfig], nodes: List[str], parent: str = "eth0"
+) -> Checkpoint:
+    """Checkpoint with every VLAN on every node, numbering nodes from .1 up."""
+    return Checkpoint(
+        name=name,
+        nodes={
+            node: [
+                InterfaceSpec(
+                    name=f"{parent}.{config.vlan_id}",
+                    parent=parent,
+                    vlan_id=config.vlan_id,
+                    addresses=[config.interface_address(host_index)],
+                )
+                for config in configs
+            ]
+            for host_index, node in enumerate(nodes, start=1)
+        },
+    )
+
+
+@dataclass
+class VLANBatchResult:
+    """Per-VLAN outcome of a bulk VLAN operation."""
+
+    succeeded: List[int] = field(default_factory=list)
+    failed: Dict[int, str] = field(default_factory=dict)  # vlan_id -> error
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
 
 class VLANManager:
-    def __init__(self, container: Container):
+    # VLANs per `ip -batch` exec; keeps the generated script well below the
+    # kernel's 128 KiB limit for a single exec argument.
+    batch_chunk_size = 500
+
+    _BATCH_FAILURE = re.compile(r"^Command failed -:(\d+)$")
+
+    def __init__(self, container: NodeHandle):
         self.container = container
 
     def create_vlan(self, config: VLANConfig) -> bool:
         """Create a VLAN interface on the container."""
-        try:
-            # Create VLAN interface
-            self.container.exec_run(
-                f"ip link add link eth0 name eth0.{config.vlan_id} type vlan id {config.vlan_id}"
-            )
+        result = self.create_vlans([config])
+        for vlan_id, error in result.failed.items():
+            print(f"Error creating VLAN {vlan_id}: {error}")
+        return result.ok
 
-            # Set IP address for VLAN interface
-            self.container.exec_run(
-                f"ip addr add {config.ip_network} dev eth0.{config.vlan_id}"
-            )
+    def delete_vlan(self, vlan_id: int) -> bool:
+        """Delete a VLAN interface from the container."""
+        result = self.delete_vlans([vlan_id])
+        for failed_id, error in result.failed.items():
+            print(f"Error deleting VLAN {failed_id}: {error}")
+        return result.ok
 
-            # Bring up the VLAN interface
-            self.container.exec_run(f"ip link set eth0.{config.vlan_id} up")
+    def create_vlans(self, configs: List[VLANConfig]) -> VLANBatchResult:
+        """Create many VLAN interfaces using `ip -batch`, one exec per chunk."""
+        commands = []
+        for config in configs:
+            interface = f"eth0.{config.vlan_id}"
+            commands.extend(
+                [
+                    (
+                        config.vlan_id,
+                        f"link add link eth0 name {interface}"
+                        f" type vlan id {config.vlan_id}",
+                    ),
+                    (config.vlan_id, f"addr add {config.ip_network} dev {interface}"),
+                    (config.vlan_id, f"link set {interface} up"),
+                ]
+            )
+        with span("create_vlans", "vlan", vlans=len(configs)):
+            return self._run_ip_batch(commands, commands_per_vlan=3)
 
-            return True
-        except Exception as e:
-            print(f"Error creating VLAN: {e}")
-            return False
+    def delete_vlans(self, vlan_ids: List[int]) -> VLANBatchResult:
+        """Delete many VLAN interfaces using `ip -batch`, one exec per chunk."""
+        commands = [(vlan_id, f"link delete eth0.{vlan_id}") for vlan_id in vlan_ids]
+        with span("delete_vlans", "vlan", vlans=len(vlan_ids)):
+            return self._run_ip_batch(commands, commands_per_vlan=1)
 
-    def delete_vlan(self, vlan_id: int) -> bool:
-        """Delete a VLAN interface from the container."""
+    def verify_vlans(self, vlan_ids: List[int]) -> VLANBatchResult:
+        """Check that VLAN interfaces exist, carry the right tag and are up."""
+        result = VLANBatchResult()
         try:
-            self.container.exec_run(f"ip link delete eth0.{vlan_id}")
-            return True
+            with span("verify_vlans", "vlan", vlans=len(vlan_ids)):
+                exec_result = self.container.exec_run("ip -d -j link show type vlan")
+            output = exec_result.output.decode()
+            if exec_result.exit_code != 0:
+                raise Exception(output.strip())
+            # Links filtered out by "type vlan" show up as empty objects
+            links = {
+                link["ifname"]: link
+                for link in json.loads(output or "[]")
+                if "ifname" in link
+            }
         except Exception as e:
-            print(f"Error deleting VLAN: {e}")
-            return False
+            result.failed = {
+                vlan_id: f"Failed to list links: {e}" for vlan_id in vlan_ids
+            }
+            return result
+
+        for vlan_id in vlan_ids:
+            link = links.get(f"eth0.{vlan_id}")
+            if link is None:
+                result.failed[vlan_id] = "interface missing"
+                continue
+
+            tag = link.get("linkinfo", {}).get("info_data", {}).get("id")
+            if tag != vlan_id:
+                result.failed[vlan_id] = f"interface tagged with VLAN {tag}"
+            elif "UP" not in link.get("flags", []):
+                result.failed[vlan_id] = "interface is down"
+            else:
+                result.succeeded.append(vlan_id)
+        return result
+
+    def _run_ip_batch(
+        self, commands: List[Tuple[int, str]], commands_per_vlan: int
+    ) -> VLANBatchResult:
+        """Run (vlan_id, ip command) pairs through `ip -force -batch`.
+
+        With -force, ip keeps going after a failing line and reports it as
+        "Command failed -:<line>", preceded by the error message, which lets
+        failures be attributed to the VLAN the line belongs to.
+        """
+        result = VLANBatchResult()
+        chunk_size = self.batch_chunk_size * commands_per_vlan
+        for start in range(0, len(commands), chunk_size):
+            chunk = commands[start : start + chunk_size]
+            try:
+                with span("ip_batch", "vlan", lines=len(chunk)):
+                    exec_result = self.container.exec_ip_batch(
+                        [command for _, command in chunk]
+                    )
+                output = exec_result.output.decode(errors="replace")
+            except Exception as e:
+                for vlan_id, _ in chunk:
+                    result.failed.setdefault(vlan_id, str(e))
+                continue
+
+            errors = self._parse_batch_errors(output)
+            for line_number, (vlan_id, command) in enumerate(chunk, start=1):
+                if line_number in errors:
+                    message = f"{command}: {errors[line_number]}"
+                    if vlan_id in result.failed:
+                        result.failed[vlan_id] += f"; {message}"
+                    else:
+                        result.failed[vlan_id] = message
+
+            if exec_result.exit_code != 0 and not errors:
+                # ip did not get to report per-line failures (e.g. not found)
+                for vlan_id, _ in chunk:
+                    result.failed.setdefault(vlan_id, output.strip())
+
+        seen = set()
+        for vlan_id, _ in commands:
+            if vlan_id not in result.failed and vlan_id not in seen:
+                result.succeeded.append(vlan_id)
+            seen.add(vlan_id)
+        return result
+
+    @classmethod
+    def _parse_batch_errors(cls, output: str) -> Dict[int, str]:
+        """Map failed batch line numbers to the error messages ip printed."""
+        errors = {}
+        pending: List[str] = []
+        for line in output.splitlines():
+            match = cls._BATCH_FAILURE.match(line.strip())
+            if match:
+                errors[int(match.group(1))] = " ".join(pending) or "failed"
+                pending = []
+            elif line.strip():
+                pending.append(line.strip())
+        return errors
 
     def get_vlan_info(self, vlan_id: int) -> dict:
         """Get information about a specific VLAN."""
         try:
-            result = self.container.exec_run(f"ip -d link show eth0.{vlan_id}")
+            with span("get_vlan_info", "vlan", vlan_id=vlan_id):
+                result = self.container.exec_run(f"ip -d link show eth0.{vlan_id}")
             return {
                 "vlan_id": vlan_id,
                 "status": result.exit_code == 0,
@@ -59,11 +217,47 @@ class VLANManager:
         except Exception as e:
             return {"error": str(e)}
 
-    def verify_vlan_connectivity(self, target_ip: str, vlan_id: int) -> bool:
-        """Verify connectivity within a VLAN."""
-        try:
-            result = self.container.exec_run(f"ping -I eth0.{vlan_id} -c 3 {target_ip}")
-            return result.exit_code == 0
-        except Exception as e:
-            print(f"Error verifying VLAN connectivity: {e}")
-            return False
+    def vlan_probe(
+        self, target_ip: str, vlan_id: int, expect_reachable: bool = True
+    ) -> ReachabilityProbe:
+        """Probe of target_ip from this node over the VLAN's interface."""
+        return ReachabilityProbe(
+            self.container.name,
+            target_ip,
+            expect_reachable=expect_reachable,
+            interface=f"eth0.{vlan_id}",
+        )
+
+    def verify_vlan_connectivity(
+        self, network_test: "NetworkTestBase", target_ip: str, vlan_id: int
+    ) -> bool:
+        """Verify connectivity within a VLAN, returning at the first reply.
+
+        The probe runs through `network_test`, within its time budget and
+        logged against the current test.
+        """
+        return self._verify(network_test, self.vlan_probe(target_ip, vlan_id))
+
+    def verify_vlan_isolation(
+        self, network_test: "NetworkTestBase", target_ip: str, vlan_id: int
+    ) -> bool:
+        """Verify that target_ip does not answer on a VLAN within a short deadline.
+
+        A probe that could not run (e.g. missing interface) proves nothing and
+        counts as a failure.
+        """
+        return self._verify(network_test, self.vlan_probe(target_ip, vlan_id, False))
+
+    @staticmethod
+    def _verify(network_test: "NetworkTestBase", probe: ReachabilityProbe) -> bool:
+        with span(
+            "verify_vlan",
+            "vlan",
+            target=probe.target,
+            interface=probe.interface,
+            expect_reachable=probe.expect_reachable,
+        ):
+            (result,) = network_test.probe_reachability([probe])
+        if not result.passed:
+            print(f"VLAN verification failed: {result.describe()}")
+        return result.passed
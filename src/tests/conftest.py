@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from src.core.reporter import TestReporter
+
+
+def _is_xdist_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def _is_xdist_controller(config) -> bool:
+    return not _is_xdist_worker(config) and bool(
+        config.getoption("numprocesses", default=None)
+    )
+
+
+def pytest_configure(config):
+    """Aggregate the results of pytest-xdist workers into one report.
+
+    The controller owns the execution directory and collects the results the
+    workers send it, so `pytest -n N` writes a single consolidated report.
+    Without xdist this is a no-op.
+    """
+    if _is_xdist_worker(config):
+        os.environ[TestReporter.WORKER_ID_ENV] = config.workerinput["workerid"]
+    elif _is_xdist_controller(config):
+        # Workers are spawned after this and inherit the environment
+        reporter = TestReporter()
+        config._result_collector = reporter.start_collector()
+        config._result_collector.export_env()
+        os.environ[TestReporter.EXECUTION_DIR_ENV] = str(reporter.execution_dir)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    config = session.config
+    if _is_xdist_worker(config):
+        if TestReporter._instance is not None:
+            TestReporter().flush()
+            TestReporter().close()
+    elif getattr(config, "_result_collector", None) is not None:
+        config._result_collector.stop()
+        reporter = TestReporter()
+        reporter.collect_worker_results()
+        reporter.generate_summary()
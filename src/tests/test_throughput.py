@@ -0,0 +1,37 @@
+import pytest
+
+from src.core.config import ThroughputConfig
+from src.core.test_base import NetworkTestBase
+from src.protocol.throughput import ThroughputTester
+
+# Saturates the node1-node2 link, which would inflate the RTTs that the other
+# modules of this group record for latency baselines.
+ISOLATION_GROUP = "node1-node2"
+
+
+class TestThroughput:
+    @pytest.fixture(scope="class")
+    def network_test(self, request):
+        return NetworkTestBase(
+            config_name="basic_connectivity", module_name=request.module.__name__
+        )
+
+    @pytest.fixture(scope="class")
+    def throughput_config(self, network_test) -> ThroughputConfig:
+        config = network_test.config_manager.config["basic_connectivity"]
+        return config.throughput or ThroughputConfig(duration=3)
+
+    def test_tcp_throughput_between_nodes(self, network_test, throughput_config):
+        """Test that node1 reaches the configured bandwidth towards node2."""
+
+        def run_throughput_test():
+            result = ThroughputTester(network_test).measure(
+                "node1", "node2", config=throughput_config
+            )
+            network_test.attach_details("throughput", result.to_dict())
+
+            assert result.bits_per_second > 0, "No traffic reached node2"
+            violations = result.violations(throughput_config)
+            assert not violations, f"Throughput below thresholds: {violations}"
+
+        network_test.run_test("test_tcp_throughput_between_nodes", run_throughput_test)
@@ -1,20 +1,23 @@
 from typing import Dict
 
-import docker
 import pytest
 
+from src.core.checkpoint import Checkpoint
 from src.core.test_base import NetworkTestBase
-from src.protocol.vlan import VLANConfig, VLANManager
+from src.protocol.probe import ReachabilityProbe
+from src.protocol.vlan import VLANConfig, VLANManager, vlan_checkpoint
 
+# Changes interfaces on node1 and node2 and records RTTs over them, so it must
+# not run alongside the other modules using that link.
+ISOLATION_GROUP = "node1-node2"
 
-class TestVLANConfiguration:
-    @pytest.fixture(scope="class")
-    def network_test(self):
-        return NetworkTestBase()
 
+class TestVLANConfiguration:
     @pytest.fixture(scope="class")
-    def docker_client(self):
-        return docker.from_env()
+    def network_test(self, request):
+        return NetworkTestBase(
+            config_name="basic_connectivity", module_name=request.module.__name__
+        )
 
     @pytest.fixture(scope="class")
     def vlan_configs(self) -> Dict[str, VLANConfig]:
@@ -33,47 +36,37 @@ class TestVLANConfiguration:
             ),
         }
 
-    @pytest.fixture(scope="function")
-    def setup_vlans(self, docker_client, vlan_configs):
-        """Setup VLANs on test containers."""
-        containers = {
-            "node1": docker_client.containers.get("network-test-framework-node1-1"),
-            "node2": docker_client.containers.get("network-test-framework-node2-1"),
-        }
-
-        vlan_managers = {}
-        for node_name, container in containers.items():
-            manager = VLANManager(container)
-            vlan_managers[node_name] = manager
-
-            # Setup VLANs on each node
-            for vlan_config in vlan_configs.values():
-                manager.create_vlan(vlan_config)
-
-        yield vlan_managers
+    @pytest.fixture(scope="class")
+    def checkpoint(self, vlan_configs) -> Checkpoint:
+        """Both VLANs on both nodes; node1 is .1 and node2 is .2 on each."""
+        return vlan_checkpoint("vlans", list(vlan_configs.values()), ["node1", "node2"])
 
-        # Cleanup
-        for manager in vlan_managers.values():
-            for vlan_config in vlan_configs.values():
-                manager.delete_vlan(vlan_config.vlan_id)
+    @pytest.fixture(scope="class")
+    def vlan_managers(self, network_test) -> Dict[str, VLANManager]:
+        return {
+            node: VLANManager(network_test.get_container(node))
+            for node in ["node1", "node2"]
+        }
 
     def test_vlan_creation_and_connectivity(
-        self, network_test, setup_vlans, vlan_configs
+        self, network_test, checkpoint, vlan_managers
     ):
         """Test VLAN creation and inter-VLAN connectivity."""
 
         def run_vlan_test():
-            vlan_managers = setup_vlans
-
-            # Test VLAN 10 connectivity
-            assert vlan_managers["node1"].verify_vlan_connectivity(
-                "192.168.10.2", vlan_configs["vlan10"].vlan_id
-            ), "VLAN 10 connectivity failed"
-
-            # Test VLAN 20 connectivity
-            assert vlan_managers["node1"].verify_vlan_connectivity(
-                "192.168.20.2", vlan_configs["vlan20"].vlan_id
-            ), "VLAN 20 connectivity failed"
+            # Only changes what differs from the live state, and leaves the
+            # VLANs in place for the next test using the same checkpoint
+            network_test.apply_checkpoint(checkpoint)
+
+            # Test VLAN 10 and VLAN 20 connectivity concurrently
+            vlan10, vlan20 = network_test.probe_reachability(
+                [
+                    ReachabilityProbe("node1", "192.168.10.2", interface="eth0.10"),
+                    ReachabilityProbe("node1", "192.168.20.2", interface="eth0.20"),
+                ]
+            )
+            assert vlan10.passed, f"VLAN 10 connectivity failed: {vlan10.describe()}"
+            assert vlan20.passed, f"VLAN 20 connectivity failed: {vlan20.describe()}"
 
             # Verify VLAN isolation
             vlan10_info = vlan_managers["node1"].get_vlan_info(10)
@@ -84,17 +77,17 @@ class TestVLANConfiguration:
 
         network_test.run_test("test_vlan_configuration", run_vlan_test)
 
-    def test_vlan_isolation(self, network_test, setup_vlans):
+    def test_vlan_isolation(self, network_test, checkpoint, vlan_managers):
         """Test that traffic is properly isolated between VLANs."""
 
         def run_isolation_test():
-            vlan_managers = setup_vlans
+            network_test.apply_checkpoint(checkpoint)
 
-            # Try to ping VLAN 20 IP from VLAN 10 interface
-            cross_vlan_ping = vlan_managers["node1"].verify_vlan_connectivity(
-                "192.168.20.2", 10
+            # VLAN 20's address must not answer on the VLAN 10 interface
+            isolated = vlan_managers["node1"].verify_vlan_isolation(
+                network_test, "192.168.20.2", 10
             )
 
-            assert not cross_vlan_ping, "VLAN isolation breach detected"
+            assert isolated, "VLAN isolation breach detected"
 
         network_test.run_test("test_vlan_isolation", run_isolation_test)
@@ -0,0 +1,92 @@
+import subprocess
+
+import pytest
+
+from src.core.backends.base import ExecResult
+from src.core.batch import build_batch_script, parse_batch_output, run_batch
+
+TOKEN = "__NTF_test__"
+
+
+class LocalShell:
+    """Runs batch scripts with the host's sh, like an exec in a node would."""
+
+    def exec_run(self, command) -> ExecResult:
+        result = subprocess.run(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        return ExecResult(result.returncode, result.stdout)
+
+
+class TestParseBatchOutput:
+    def test_splits_output_per_command(self):
+        output = (
+            "first\n"
+            f"\n{TOKEN}:0:100.0:100.5\n"
+            "second line 1\nsecond line 2\n"
+            f"\n{TOKEN}:2:100.5:101.75\n"
+        )
+        entries = parse_batch_output(["a", "b"], output, TOKEN, 2.0)
+
+        assert [(e.command, e.exit_code, e.output) for e in entries] == [
+            ("a", 0, "first\n"),
+            ("b", 2, "second line 1\nsecond line 2\n"),
+        ]
+        assert [e.duration for e in entries] == [0.5, 1.25]
+
+    def test_command_without_output(self):
+        output = f"\n{TOKEN}:0:1.0:2.0\nx\n{TOKEN}:1:2.0:3.0\n"
+        entries = parse_batch_output(["true", "echo x"], output, TOKEN, 2.0)
+        assert [e.output for e in entries] == ["", "x"]
+
+    def test_missing_timestamps_fall_back_to_even_split(self):
+        output = f"out\n{TOKEN}:0::\n"
+        (entry,) = parse_batch_output(["a"], output, TOKEN, 3.0)
+        assert entry.duration == 3.0
+
+    def test_script_stopped_early(self):
+        """Commands after the last marker fail; the first keeps the trailer."""
+        output = f"ok\n{TOKEN}:0:1.0:2.0\nKilled\n"
+        entries = parse_batch_output(["a", "b", "c"], output, TOKEN, 3.0)
+
+        assert [(e.exit_code, e.output) for e in entries] == [
+            (0, "ok"),
+            (-1, "Killed\n"),
+            (-1, ""),
+        ]
+
+    def test_marker_like_text_inside_output_is_kept(self):
+        output = f"see {TOKEN}:0:1:2 here\n\n{TOKEN}:0:1.0:2.0\n"
+        (entry,) = parse_batch_output(["a"], output, TOKEN, 1.0)
+        assert entry.output == f"see {TOKEN}:0:1:2 here\n"
+
+
+class TestRunBatch:
+    commands = [
+        "echo one",
+        "printf 'no newline'",
+        "echo err >&2; (exit 3)",
+        "true",
+        "echo five; echo more",
+    ]
+
+    @pytest.mark.parametrize("parallel", [1, 2, 5])
+    def test_serial_and_parallel_waves(self, parallel):
+        entries = run_batch(LocalShell(), self.commands, parallel)
+
+        assert [e.command for e in entries] == self.commands
+        assert [e.exit_code for e in entries] == [0, 0, 3, 0, 0]
+        assert [e.output for e in entries] == [
+            "one\n",
+            "no newline",
+            "err\n",
+            "",
+            "five\nmore\n",
+        ]
+        assert all(e.duration >= 0 for e in entries)
+
+    def test_parallel_script_waits_per_wave(self):
+        script = build_batch_script(["a", "b", "c"], TOKEN, parallel=2)
+        lines = script.splitlines()
+        # Two commands per wave, then the remaining one
+        assert [i for i, line in enumerate(lines) if line == "wait"] == [5, 8]
@@ -0,0 +1,98 @@
+import pytest
+
+from src.core.checkpoint import Checkpoint, InterfaceSpec, plan_changes
+from src.core.snapshot import InterfaceAddress, InterfaceState, NodeSnapshot
+
+VLAN10 = InterfaceSpec("eth0.10", "eth0", 10, ["192.168.10.1/24"])
+
+
+def interface(name, kind=None, parent=None, vlan_id=None, up=True, addresses=()):
+    return InterfaceState(
+        name=name,
+        index=0,
+        flags=["UP"] if up else [],
+        operstate="UP" if up else "DOWN",
+        mtu=1500,
+        parent=parent,
+        kind=kind,
+        vlan_id=vlan_id,
+        addresses=[address(cidr) for cidr in addresses],
+    )
+
+
+def address(cidr):
+    local, prefixlen = cidr.split("/")
+    return InterfaceAddress("inet6" if ":" in local else "inet", local, int(prefixlen))
+
+
+def vlan(name, vlan_id, up=True, addresses=(), parent="eth0"):
+    return interface(name, "vlan", parent, vlan_id, up, addresses)
+
+
+def snapshot(*interfaces):
+    base = [interface("lo"), interface("eth0", addresses=["172.20.0.2/16"])]
+    return NodeSnapshot(
+        "node1", {i.name: i for i in base + list(interfaces)}, routes={}
+    )
+
+
+class TestPlanChanges:
+    def test_adds_missing_vlan(self):
+        assert plan_changes([VLAN10], snapshot()) == [
+            "link add link eth0 name eth0.10 type vlan id 10",
+            "addr add 192.168.10.1/24 dev eth0.10",
+            "link set eth0.10 up",
+        ]
+
+    def test_no_changes_when_in_desired_state(self):
+        live = snapshot(
+            vlan("eth0.10", 10, addresses=["192.168.10.1/24", "fe80::1/64"])
+        )
+        assert plan_changes([VLAN10], live) == []
+
+    def test_deletes_undeclared_vlans_only(self):
+        live = snapshot(
+            vlan("eth0.10", 10, addresses=["192.168.10.1/24"]), vlan("eth0.30", 30)
+        )
+        assert plan_changes([VLAN10], live) == ["link delete eth0.30"]
+
+    def test_empty_checkpoint_deletes_every_vlan(self):
+        live = snapshot(vlan("eth0.10", 10), vlan("eth0.20", 20))
+        assert plan_changes([], live) == ["link delete eth0.10", "link delete eth0.20"]
+
+    def test_recreates_vlan_with_wrong_tag(self):
+        live = snapshot(vlan("eth0.10", 11, addresses=["192.168.10.1/24"]))
+        assert plan_changes([VLAN10], live) == [
+            "link delete eth0.10",
+            "link add link eth0 name eth0.10 type vlan id 10",
+            "addr add 192.168.10.1/24 dev eth0.10",
+            "link set eth0.10 up",
+        ]
+
+    def test_fixes_addresses_and_state(self):
+        live = snapshot(vlan("eth0.10", 10, up=False, addresses=["192.168.10.9/24"]))
+        assert plan_changes([VLAN10], live) == [
+            "addr del 192.168.10.9/24 dev eth0.10",
+            "addr add 192.168.10.1/24 dev eth0.10",
+            "link set eth0.10 up",
+        ]
+
+    def test_refuses_to_replace_other_interfaces(self):
+        spec = InterfaceSpec("eth0", "eth1", 10, [])
+        with pytest.raises(Exception, match="eth0 exists and is not a VLAN"):
+            plan_changes([spec], snapshot())
+
+
+class TestCheckpoint:
+    def test_hash_ignores_interface_order(self):
+        vlan20 = InterfaceSpec("eth0.20", "eth0", 20, ["192.168.20.1/24"])
+        first = Checkpoint("a", {"node1": [VLAN10, vlan20]})
+        second = Checkpoint("b", {"node1": [vlan20, VLAN10]})
+        assert first.hash == second.hash
+
+    def test_hash_covers_addresses(self):
+        moved = InterfaceSpec("eth0.10", "eth0", 10, ["192.168.10.2/24"])
+        assert (
+            Checkpoint("a", {"node1": [VLAN10]}).hash
+            != Checkpoint("a", {"node1": [moved]}).hash
+        )
@@ -0,0 +1,144 @@
+import pytest
+
+from src.core.config import ConfigError, ConfigManager, compile_config
+
+
+def node(ip_address: str, **settings):
+    return {"ip_address": ip_address, "subnet_mask": "255.255.0.0", **settings}
+
+
+def config(framework=None, **tests):
+    raw = dict(tests)
+    if framework is not None:
+        raw["framework"] = framework
+    return raw
+
+
+BASIC = {"nodes": {"node1": node("172.20.0.2"), "node2": node("172.20.0.3")}}
+
+
+class TestCompileConfig:
+    def test_valid_config(self):
+        compiled = compile_config(config(basic=BASIC))
+        assert compiled.topology.nodes == {
+            "node1": "172.20.0.2",
+            "node2": "172.20.0.3",
+        }
+
+    def test_shared_nodes_with_same_address(self):
+        other = {"nodes": {"node1": node("172.20.0.2"), "node3": node("172.20.0.4")}}
+        compiled = compile_config(config(basic=BASIC, other=other))
+        assert sorted(compiled.topology.nodes) == ["node1", "node2", "node3"]
+
+    @pytest.mark.parametrize(
+        "raw, message",
+        [
+            (["basic"], "expected a mapping of test configs"),
+            ({"basic": "x"}, "basic: expected a mapping"),
+            ({"basic": {**BASIC, "retries": 3}}, "basic: unknown settings retries"),
+            ({"basic": {"nodes": {}}}, "basic.nodes: expected a mapping"),
+            ({"basic": {"nodes": {"node1": "x"}}}, "basic.nodes.node1: expected"),
+            (
+                {"basic": {"nodes": {"node1": {"ip_address": "172.20.0.2"}}}},
+                "basic.nodes.node1: missing subnet_mask",
+            ),
+            (
+                {"basic": {"nodes": {"node1": node("172.20.0.300")}}},
+                "basic.nodes.node1.ip_address: invalid IPv4 address",
+            ),
+            (
+                {"basic": {"nodes": {"node1": node("172.20.0.2", subnet_mask="x")}}},
+                "basic.nodes.node1.subnet_mask: invalid mask",
+            ),
+            (
+                {"basic": {"nodes": {"node1": node("172.20.0.2", gateway="gw")}}},
+                "basic.nodes.node1.gateway: invalid IPv4 address",
+            ),
+            (
+                {"basic": {"nodes": {"node1": node("172.20.0.2", mtu=1500)}}},
+                "basic.nodes.node1: unknown settings mtu",
+            ),
+            (
+                {"basic": {"nodes": {"n1": node("10.0.0.1"), "n2": node("10.0.0.1")}}},
+                "basic.nodes: 10.0.0.1 is used by both n1 and n2",
+            ),
+            ({"basic": {**BASIC, "description": 1}}, "basic.description"),
+            ({"basic": {**BASIC, "timeout": 0}}, "basic.timeout"),
+            ({"basic": {**BASIC, "timeout": True}}, "basic.timeout"),
+            (
+                {"basic": {**BASIC, "throughput": {"protocol": "sctp"}}},
+                "basic.throughput.protocol: expected one of tcp, udp",
+            ),
+            (
+                {"basic": {**BASIC, "throughput": {"duration": "5"}}},
+                "basic.throughput.duration: expected int",
+            ),
+            (
+                {"basic": {**BASIC, "throughput": {"duration": 0}}},
+                "basic.throughput.duration: expected a positive value",
+            ),
+            (
+                {"basic": {**BASIC, "throughput": {"parallel": -1}}},
+                "basic.throughput.parallel: expected a positive value",
+            ),
+            (
+                {"basic": {**BASIC, "probe": {"interval": 0}}},
+                "basic.probe.interval: expected a positive value",
+            ),
+            (
+                {"basic": {**BASIC, "probe": {"positive_deadline": -1}}},
+                "basic.probe.positive_deadline: expected a positive value",
+            ),
+            (
+                {"basic": {**BASIC, "probe": {"negative_deadline": 0}}},
+                "basic.probe.negative_deadline: expected a positive value",
+            ),
+        ],
+    )
+    def test_invalid_test_config(self, raw, message):
+        with pytest.raises(ConfigError, match=message):
+            compile_config(raw)
+
+    @pytest.mark.parametrize(
+        "framework, message",
+        [
+            ("docker", "framework: expected a mapping"),
+            ({"backends": "docker"}, "framework: unknown settings backends"),
+            ({"trace": "yes"}, "framework.trace: expected bool"),
+            ({"backend": "dockr"}, "framework.backend: expected one of"),
+            ({"keep_output": "failure"}, "framework.keep_output: expected one of"),
+            ({"max_output_size": -5}, "framework.max_output_size: expected a positive"),
+            ({"max_output_size": 0}, "framework.max_output_size: expected a positive"),
+            ({"metrics_port": 0}, "framework.metrics_port: expected a positive"),
+        ],
+    )
+    def test_invalid_framework(self, framework, message):
+        with pytest.raises(ConfigError, match=message):
+            compile_config(config(framework, basic=BASIC))
+
+    def test_unbounded_output_is_allowed(self):
+        compiled = compile_config(config({"max_output_size": None}, basic=BASIC))
+        assert compiled.framework.max_output_size is None
+
+    def test_node_address_differs_between_tests(self):
+        other = {"nodes": {"node1": node("172.20.0.9")}}
+        with pytest.raises(
+            ConfigError,
+            match="other.nodes.node1: address 172.20.0.9 differs from "
+            "172.20.0.2 in basic",
+        ):
+            compile_config(config(basic=BASIC, other=other))
+
+    def test_nodes_share_address_across_tests(self):
+        other = {"nodes": {"node3": node("172.20.0.2")}}
+        with pytest.raises(
+            ConfigError,
+            match="other.nodes.node3: 172.20.0.2 is already used by node1",
+        ):
+            compile_config(config(basic=BASIC, other=other))
+
+    def test_errors_name_the_config_file(self, tmp_path):
+        path = tmp_path / "test_config.yaml"
+        path.write_text("framework:\n  backend: dockr\n")
+        with pytest.raises(ConfigError, match=f"{path}: framework.backend"):
+            ConfigManager(str(path))
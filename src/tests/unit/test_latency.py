@@ -0,0 +1,78 @@
+import pytest
+
+from src.core.latency import detect_regressions, mann_whitney_greater
+
+PAIR = ("node1", "172.20.0.3", None)
+
+
+class TestMannWhitneyGreater:
+    def test_separated_samples(self):
+        # U = 9 of 9, z = 4 / sqrt(5.25)
+        assert mann_whitney_greater([4, 5, 6], [1, 2, 3]) == pytest.approx(
+            0.04043, abs=1e-5
+        )
+
+    def test_smaller_samples_are_not_significant(self):
+        assert mann_whitney_greater([1, 2, 3], [4, 5, 6]) > 0.9
+
+    def test_ties_across_groups(self):
+        # Tie-corrected variance: 4 / 12 * (5 - 12 / 12)
+        assert mann_whitney_greater([2, 2], [1, 1]) == pytest.approx(0.09697, abs=1e-5)
+
+    def test_all_values_tied(self):
+        assert mann_whitney_greater([1, 1, 1], [1, 1, 1]) == 1.0
+
+    @pytest.mark.parametrize(
+        "current, baseline", [([], []), ([1.0], []), ([], [1.0, 2.0])]
+    )
+    def test_empty_samples(self, current, baseline):
+        assert mann_whitney_greater(current, baseline) == 1.0
+
+
+class TestDetectRegressions:
+    baseline = {PAIR: [1.0, 2.0, 3.0]}
+    slower = {PAIR: [4.0, 5.0, 6.0]}  # p = 0.0404, median +150%
+
+    def test_significant_increase(self):
+        (regression,) = detect_regressions(self.slower, self.baseline, alpha=0.05)
+        assert (regression.source, regression.target) == ("node1", "172.20.0.3")
+        assert regression.baseline_median == 2.0
+        assert regression.current_median == 5.0
+        assert regression.increase_percent == 150.0
+        assert (regression.baseline_samples, regression.current_samples) == (3, 3)
+
+    def test_alpha_boundary(self):
+        p_value = mann_whitney_greater(self.slower[PAIR], self.baseline[PAIR])
+        assert detect_regressions(self.slower, self.baseline, alpha=p_value) == []
+        assert detect_regressions(self.slower, self.baseline, alpha=p_value + 1e-9)
+
+    def test_default_alpha_needs_more_samples(self):
+        assert detect_regressions(self.slower, self.baseline) == []
+        current = {PAIR: [float(v) for v in range(10, 20)]}
+        baseline = {PAIR: [float(v) for v in range(1, 11)]}
+        assert len(detect_regressions(current, baseline)) == 1
+
+    def test_small_increase_is_ignored(self):
+        current = {PAIR: [1.1, 1.15, 1.2] * 5}
+        baseline = {PAIR: [1.0, 1.0, 1.05] * 5}
+        assert detect_regressions(current, baseline, alpha=0.05) == []
+
+    @pytest.mark.parametrize(
+        "current, baseline",
+        [
+            ({PAIR: [4.0, 5.0]}, {PAIR: [1.0, 2.0, 3.0]}),
+            ({PAIR: [4.0, 5.0, 6.0]}, {PAIR: [1.0, 2.0]}),
+            ({PAIR: [4.0, 5.0, 6.0]}, {}),
+            ({}, {PAIR: [1.0, 2.0, 3.0]}),
+            ({PAIR: [4.0, 5.0, 6.0]}, {PAIR: [0.0, 0.0, 0.0]}),
+        ],
+    )
+    def test_short_or_missing_samples_are_skipped(self, current, baseline):
+        assert detect_regressions(current, baseline, alpha=0.5) == []
+
+    def test_pairs_are_compared_separately(self):
+        other = ("node2", "172.20.0.2", "eth0.10")
+        current = {PAIR: [4.0, 5.0, 6.0], other: [1.0, 2.0, 3.0]}
+        baseline = {PAIR: [1.0, 2.0, 3.0], other: [1.0, 2.0, 3.0]}
+        regressions = detect_regressions(current, baseline, alpha=0.05)
+        assert [r.source for r in regressions] == ["node1"]
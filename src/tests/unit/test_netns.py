@@ -0,0 +1,86 @@
+import sys
+import time
+
+import pytest
+
+from src.core.backends.base import NodeNotFound
+from src.core.backends.netns_backend import NamespaceBackend, NamespaceStreamingExec
+
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+
+class TestNamespaceStreamingExec:
+    def test_exit_code_after_stream_ends(self):
+        """The stream can end before the process exits."""
+        execution = NamespaceStreamingExec(
+            python("import os, time; os.close(1); os.close(2); time.sleep(0.3)")
+        )
+        assert b"".join(execution) == b""
+        assert execution.exit_code() == 0
+        execution.close()
+
+    def test_close_keeps_exit_code_of_drained_command(self):
+        execution = NamespaceStreamingExec(
+            python(
+                "import os, sys; print('x', flush=True); os.close(1); os.close(2);"
+                " import time; time.sleep(0.2); sys.exit(3)"
+            )
+        )
+        assert b"".join(execution) == b"x\n"
+        execution.close()
+        assert execution.exit_code() == 3
+
+    def test_close_kills_command_still_running(self):
+        execution = NamespaceStreamingExec(
+            python("import time\nwhile True: print(1, flush=True); time.sleep(0.01)")
+        )
+        next(iter(execution))
+        start = time.monotonic()
+        execution.close()
+        assert time.monotonic() - start < 1
+        assert execution.exit_code() < 0
+
+    def test_close_after_process_exited(self):
+        execution = NamespaceStreamingExec(python("pass"))
+        execution._process.wait()
+        execution.close()
+        assert execution.exit_code() == 0
+
+
+class TestNamespaceBackend:
+    @pytest.fixture
+    def backend(self, monkeypatch):
+        backend = NamespaceBackend("{project}-{node}", "ntf")
+        backend.listings = 0
+        backend.namespaces = ["ntf-node1", "other"]
+
+        def list_namespaces():
+            backend.listings += 1
+            return list(backend.namespaces)
+
+        monkeypatch.setattr(backend, "_namespaces", list_namespaces)
+        return backend
+
+    def test_lookups_are_cached(self, backend):
+        for _ in range(3):
+            assert backend.get("node1").namespace == "ntf-node1"
+        assert backend.listings == 1
+
+    def test_missing_node_lists_again(self, backend):
+        backend.get("node1")
+        backend.namespaces.append("ntf-node2")
+        assert backend.get("node2").namespace == "ntf-node2"
+        assert backend.listings == 2
+
+        with pytest.raises(NodeNotFound):
+            backend.get("node3")
+        assert backend.listings == 3
+
+    def test_invalidate(self, backend):
+        backend.get("node1")
+        backend.namespaces.remove("ntf-node1")
+        backend.invalidate("node1")
+        with pytest.raises(NodeNotFound):
+            backend.get("node1")
@@ -0,0 +1,58 @@
+from src.core.output import BoundedOutput, capture_stream
+
+
+def capture(chunks, max_size=None):
+    lines = []
+    captured, _ = capture_stream(chunks, max_size, lines.append)
+    return captured.getvalue(), lines
+
+
+class TestCaptureStream:
+    def test_lines_split_across_chunks(self):
+        output, lines = capture([b"one\ntw", b"o\n", b"\nthree\n"])
+        assert output == "one\ntwo\n\nthree\n"
+        assert lines == ["one", "two", "", "three"]
+
+    def test_last_line_without_newline(self):
+        _, lines = capture([b"one\n", b"two"])
+        assert lines == ["one", "two"]
+
+    def test_flushed_tail_reaches_on_line(self):
+        """A truncated UTF-8 sequence is only decoded by the final flush."""
+        output, lines = capture([b"ok\nabc", "é".encode()[:1]])
+        assert output == "ok\nabc�"
+        assert lines == ["ok", "abc�"]
+
+    def test_split_utf8_sequence_is_decoded_once(self):
+        encoded = "é\n".encode()
+        _, lines = capture([encoded[:1], encoded[1:]])
+        assert lines == ["é"]
+
+    def test_on_line_stops_the_stream(self):
+        seen = []
+
+        def on_line(line):
+            seen.append(line)
+            return line == "stop"
+
+        captured, stopped = capture_stream([b"a\nstop\n", b"never\n"], None, on_line)
+        assert stopped
+        assert seen == ["a", "stop"]
+        assert captured.getvalue() == "a\nstop\n"
+
+    def test_stop_on_final_line(self):
+        captured, stopped = capture_stream([b"a\n", b"stop"], None, "stop".__eq__)
+        assert stopped
+
+    def test_without_on_line(self):
+        captured, stopped = capture_stream([b"a\n", b"b"])
+        assert (captured.getvalue(), stopped) == ("a\nb", False)
+
+
+class TestBoundedOutput:
+    def test_keeps_head_and_tail(self):
+        output = BoundedOutput(4)
+        for text in ("ab", "cdef", "gh"):
+            output.write(text)
+        assert output.truncated == 4
+        assert output.getvalue() == "ab\n... [4 characters truncated] ...\ngh"
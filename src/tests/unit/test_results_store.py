@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from src.core.reporter import TestResult
+from src.core.results_store import SQLiteResultsStore
+
+START = datetime(2024, 1, 1)
+
+
+def result(test_name, status="PASS", minutes=0, duration=1.0):
+    return TestResult(
+        "connectivity", test_name, status, duration, START + timedelta(minutes=minutes)
+    )
+
+
+class TestSQLiteResultsStore:
+    def test_record_execution_replaces_its_rows(self, tmp_path):
+        store = SQLiteResultsStore(tmp_path / "results.db")
+        store.record_execution("run1", {"connectivity": [result("test_ping")]})
+        # A later flush of the same execution, with one more result
+        store.record_execution(
+            "run1",
+            {"connectivity": [result("test_ping"), result("test_dns", "FAIL", 1)]},
+        )
+
+        assert store.latest_execution() == "run1"
+        assert store._execute("SELECT total, failed FROM executions").fetchall() == [
+            (2, 1)
+        ]
+        store.close()
+
+    def test_flaky_and_trend(self, tmp_path):
+        store = SQLiteResultsStore(tmp_path / "results.db")
+        for run, status in enumerate(["PASS", "FAIL", "PASS"]):
+            store.record_execution(
+                f"run{run}",
+                {"connectivity": [result("test_ping", status, run, run + 1.0)]},
+                START + timedelta(minutes=run),
+            )
+
+        (flaky,) = store.flaky_tests()
+        assert (flaky.test_name, flaky.passed, flaky.failed) == ("test_ping", 2, 1)
+        trend = store.duration_trend("test_ping", limit=2)
+        assert [(p.execution_id, p.duration) for p in trend] == [
+            ("run1", 2.0),
+            ("run2", 3.0),
+        ]
+        store.close()
+
+    def test_trend_by_test_name_uses_an_index(self, tmp_path):
+        store = SQLiteResultsStore(tmp_path / "results.db")
+        plan = store._execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM test_results"
+            " WHERE test_name = ? ORDER BY timestamp DESC LIMIT 10",
+            ("test_ping",),
+        ).fetchall()
+        assert "idx_results_test_name" in " ".join(row[-1] for row in plan)
+        store.close()
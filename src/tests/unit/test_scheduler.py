@@ -0,0 +1,61 @@
+import json
+
+from src.cli.scheduler import load_module_durations, plan_work_units
+
+
+def write_report(report_dir, durations):
+    execution_dir = report_dir / "execution_20240101_000000"
+    execution_dir.mkdir()
+    report = {
+        "modules": {
+            module: [{"duration": d} for d in module_durations]
+            for module, module_durations in durations.items()
+        }
+    }
+    (execution_dir / "test_report.json").write_text(json.dumps(report))
+
+
+class TestScheduler:
+    def test_longest_module_runs_first(self, tmp_path):
+        """Modules are ordered by their durations in the previous execution."""
+        # Modules without a file have no isolation group
+        write_report(tmp_path, {"test_short": [1.0, 0.5], "test_long": [6.0]})
+
+        durations = load_module_durations(tmp_path)
+        units = plan_work_units(
+            ["src.tests.test_short", "src.tests.test_long"], durations
+        )
+
+        assert [unit.modules for unit in units] == [
+            ["src.tests.test_long"],
+            ["src.tests.test_short"],
+        ]
+        assert [unit.estimated_duration for unit in units] == [6.0, 1.5]
+
+    def test_isolation_group_runs_as_one_unit(self, tmp_path):
+        """Modules sharing the node1-node2 link run longest first in one unit."""
+        write_report(
+            tmp_path,
+            {
+                "test_connectivity": [1.0],
+                "test_throughput": [4.0],
+                "test_vlan_configuration": [2.0],
+            },
+        )
+
+        units = plan_work_units(
+            [
+                "src.tests.test_connectivity",
+                "src.tests.test_throughput",
+                "src.tests.test_vlan_configuration",
+            ],
+            load_module_durations(tmp_path),
+        )
+
+        assert len(units) == 1
+        assert units[0].isolation_group == "node1-node2"
+        assert units[0].modules == [
+            "src.tests.test_throughput",
+            "src.tests.test_vlan_configuration",
+            "src.tests.test_connectivity",
+        ]
@@ -0,0 +1,138 @@
+import shutil
+import subprocess
+
+import pytest
+
+from src.core.backends.base import ExecResult, NodeHandle
+from src.core.backends.simulated import SimulatedNetwork, SimulatedNode
+from src.core.topology import Topology
+from src.protocol.probe import ProbeResult
+from src.protocol.vlan import VLANConfig, VLANManager
+
+
+def simulated_node() -> SimulatedNode:
+    topology = Topology("unit", "image", "172.20.0.0/16", {"node1": "172.20.0.2"})
+    return SimulatedNode("node1", SimulatedNetwork(topology))
+
+
+def vlan(vlan_id: int) -> VLANConfig:
+    return VLANConfig(vlan_id, f"vlan{vlan_id}", f"192.168.{vlan_id}.1/24", ["eth0"])
+
+
+class LocalNode(NodeHandle):
+    """Runs commands on this host, to check the real ip -batch heredoc."""
+
+    name = "local"
+
+    def exec_run(self, command) -> ExecResult:
+        result = subprocess.run(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        return ExecResult(result.returncode, result.stdout)
+
+    def exec_stream(self, command):
+        raise NotImplementedError
+
+
+class TestParseBatchErrors:
+    def test_errors_map_to_their_lines(self):
+        output = (
+            "RTNETLINK answers: File exists\n"
+            "Command failed -:1\n"
+            'Cannot find device "eth0.20"\n'
+            "Command failed -:5\n"
+        )
+        assert VLANManager._parse_batch_errors(output) == {
+            1: "RTNETLINK answers: File exists",
+            5: 'Cannot find device "eth0.20"',
+        }
+
+    def test_failure_without_message(self):
+        assert VLANManager._parse_batch_errors("Command failed -:3\n") == {3: "failed"}
+
+    def test_no_failures(self):
+        assert VLANManager._parse_batch_errors("") == {}
+
+    @pytest.mark.skipif(shutil.which("ip") is None, reason="needs iproute2")
+    def test_heredoc_line_numbers_match_ip(self):
+        """The lines NodeHandle.exec_ip_batch sends are numbered from 1."""
+        result = LocalNode().exec_ip_batch(
+            ["link show lo", "link show ntf-missing0", "link show lo"]
+        )
+        errors = VLANManager._parse_batch_errors(result.output.decode())
+        assert list(errors) == [2]
+        assert "ntf-missing0" in errors[2]
+
+
+class TestVLANBatches:
+    def test_failure_is_blamed_on_its_vlan(self):
+        manager = VLANManager(simulated_node())
+        assert manager.create_vlans([vlan(20)]).ok
+
+        result = manager.create_vlans([vlan(10), vlan(20), vlan(30)])
+
+        assert result.succeeded == [10, 30]
+        assert list(result.failed) == [20]
+        assert result.failed[20].startswith("link add link eth0 name eth0.20")
+
+    def test_line_numbers_restart_in_every_chunk(self):
+        manager = VLANManager(simulated_node())
+        manager.batch_chunk_size = 2
+        assert manager.create_vlans([vlan(40)]).ok
+
+        # Chunks of two VLANs: [10, 20], [30, 40], [50]
+        result = manager.create_vlans([vlan(v) for v in (10, 20, 30, 40, 50)])
+
+        assert result.succeeded == [10, 20, 30, 50]
+        assert list(result.failed) == [40]
+
+    def test_delete_reports_missing_vlans(self):
+        manager = VLANManager(simulated_node())
+        assert manager.create_vlans([vlan(10), vlan(30)]).ok
+
+        result = manager.delete_vlans([10, 20, 30])
+
+        assert result.succeeded == [10, 30]
+        assert list(result.failed) == [20]
+        assert "eth0.20" in result.failed[20]
+
+
+class ProbeRecorder:
+    """Stands in for NetworkTestBase.probe_reachability."""
+
+    def __init__(self, reachable=True, error=None):
+        self.reachable = reachable
+        self.error = error
+        self.probes = []
+
+    def probe_reachability(self, probes):
+        self.probes.extend(probes)
+        return [ProbeResult(p, self.reachable, 0.1, error=self.error) for p in probes]
+
+
+class TestVLANVerification:
+    def test_connectivity_goes_through_the_test(self):
+        network_test = ProbeRecorder(reachable=True)
+        manager = VLANManager(simulated_node())
+
+        assert manager.verify_vlan_connectivity(network_test, "192.168.10.2", 10)
+        (probe,) = network_test.probes
+        assert (probe.node, probe.target, probe.interface) == (
+            "node1",
+            "192.168.10.2",
+            "eth0.10",
+        )
+        assert probe.expect_reachable
+
+    @pytest.mark.parametrize(
+        "reachable, error, isolated",
+        [(False, None, True), (True, None, False), (False, "no such device", False)],
+    )
+    def test_isolation(self, reachable, error, isolated):
+        network_test = ProbeRecorder(reachable, error)
+        manager = VLANManager(simulated_node())
+
+        assert (
+            manager.verify_vlan_isolation(network_test, "192.168.20.2", 10) == isolated
+        )
+        assert not network_test.probes[0].expect_reachable
@@ -1,22 +1,339 @@
 // report.js
-document.addEventListener('DOMContentLoaded', function() {
-    document.querySelectorAll('.test-details').forEach(details => {
-        details.classList.add('hidden');
-    });
-    document.querySelectorAll('.test-header').forEach(header => {
-        header.addEventListener('click', () => {
-            const details = header.nextElementSibling;
-            const chevron = header.querySelector('.fa-chevron-right');
-            if (details) {
-                details.classList.toggle('hidden');
-
-                // Rotate chevron if it exists
-                if (chevron) {
-                    chevron.style.transform = details.classList.contains('hidden')
-                        ? 'rotate(0deg)'
-                        : 'rotate(90deg)';
+// Test rows are rendered from report_data/index.js. A test's details are in
+// the chunk file holding it, which is only loaded when the test is expanded.
+// Command outputs are referenced from the chunks and loaded from the test's own
+// outputs file. Both are loaded with <script> tags rather than fetch(), which
+// browsers block for reports opened straight from disk.
+(function() {
+    const ROW_HEIGHT = 60;         // Collapsed row (50px + borders) plus the gap
+    const ROW_GAP = 8;
+    const VIEWPORT_HEIGHT = 640;   // Max height of a module's scrolling list
+    const OVERSCAN = 10;           // Rows rendered beyond the visible ones
+    const LOG_PAGE_SIZE = 200;     // Command logs rendered per "show more"
+
+    const chunks = {};             // chunk id -> test details, once loaded
+    const pending = {};            // chunk id -> callbacks waiting for it
+    const outputs = {};            // test index -> output ref -> output
+    const pendingOutputs = {};     // test index -> callbacks waiting for them
+    const filters = {status: 'all', query: ''};
+
+    window.reportChunkLoaded = function(chunkId, tests) {
+        chunks[chunkId] = tests;
+        (pending[chunkId] || []).forEach(callback => callback(tests));
+        delete pending[chunkId];
+    };
+
+    function loadDetails(index, callback) {
+        const chunkSize = window.REPORT_INDEX.chunkSize;
+        const chunkId = Math.floor(index / chunkSize);
+        const offset = index % chunkSize;
+        if (chunks[chunkId]) {
+            callback(chunks[chunkId][offset]);
+            return;
+        }
+        if (!pending[chunkId]) {
+            pending[chunkId] = [];
+            const script = document.createElement('script');
+            script.src = 'report_data/chunk_' + String(chunkId).padStart(5, '0') + '.js';
+            document.body.appendChild(script);
+        }
+        pending[chunkId].push(tests => callback(tests[offset]));
+    }
+
+    window.reportOutputsLoaded = function(index, testOutputs) {
+        outputs[index] = testOutputs;
+        (pendingOutputs[index] || []).forEach(callback => callback(testOutputs));
+        delete pendingOutputs[index];
+    };
+
+    function loadOutputs(index, test, callback) {
+        const logs = (test.details || {}).command_logs || [];
+        if (!logs.some(log => log.output_ref)) {
+            callback({});
+            return;
+        }
+        if (outputs[index]) {
+            callback(outputs[index]);
+            return;
+        }
+        if (!pendingOutputs[index]) {
+            pendingOutputs[index] = [];
+            const script = document.createElement('script');
+            script.src = 'report_data/outputs/' + index + '.js';
+            document.body.appendChild(script);
+        }
+        pendingOutputs[index].push(callback);
+    }
+
+    function el(tag, className, text) {
+        const node = document.createElement(tag);
+        if (className) {
+            node.className = className;
+        }
+        if (text !== undefined) {
+            node.textContent = text;
+        }
+        return node;
+    }
+
+    function renderMesh(mesh) {
+        const wrapper = el('div', 'mesh-heatmap');
+        const table = el('table');
+        const header = el('tr');
+        header.appendChild(el('th', null, 'src \\ dst'));
+        mesh.nodes.forEach(node => header.appendChild(el('th', null, node)));
+        table.appendChild(header);
+
+        mesh.nodes.forEach((source, row) => {
+            const tr = el('tr');
+            tr.appendChild(el('th', null, source));
+            mesh.nodes.forEach((target, column) => {
+                const reachable = mesh.reachable[row][column];
+                const loss = mesh.loss[row][column];
+                const rtt = mesh.rtt_avg[row][column];
+                let cell;
+                if (reachable === null) {
+                    cell = el('td', 'mesh-cell mesh-none');
+                } else if (!reachable) {
+                    cell = el('td', 'mesh-cell mesh-down', '✕');
+                    cell.title = source + ' -> ' + target + ': unreachable';
+                } else {
+                    cell = el('td', 'mesh-cell ' + (loss ? 'mesh-loss' : 'mesh-ok'),
+                              rtt === null ? '' : String(rtt));
+                    cell.title = source + ' -> ' + target + ': ' + loss + '% loss, ' + rtt + ' ms';
+                }
+                tr.appendChild(cell);
+            });
+            table.appendChild(tr);
+        });
+        wrapper.appendChild(table);
+        return wrapper;
+    }
+
+    function renderLog(log, testOutputs) {
+        const entry = el('div', 'log-entry');
+        entry.dataset.node = log.node;
+
+        const header = el('div', 'entry-header');
+        const info = el('div', 'entry-info');
+        info.append(el('span', 'node-label', log.node), el('span', 'command-label', '$ ' + log.command));
+        const meta = el('div', 'entry-meta');
+        meta.append(el('span', 'timestamp', log.timestamp),
+                    el('span', 'duration', Number(log.duration).toFixed(3) + 's'));
+        if (log.exit_code !== 0) {
+            meta.appendChild(el('span', 'exit-code fail', 'Exit Code: ' + log.exit_code));
+        }
+        header.append(info, meta);
+
+        const content = el('div', 'entry-content');
+        const output = log.output_ref ? testOutputs[log.output_ref] : log.output;
+        content.appendChild(el('pre', 'output', output === null || output === undefined
+            ? '(output not kept)' : output));
+        entry.append(header, content);
+        return entry;
+    }
+
+    function renderLogs(container, logs, testOutputs, start, onResize) {
+        logs.slice(start, start + LOG_PAGE_SIZE)
+            .forEach(log => container.appendChild(renderLog(log, testOutputs)));
+        const remaining = logs.length - start - LOG_PAGE_SIZE;
+        if (remaining > 0) {
+            const more = el('button', 'filter-btn', 'Show ' + Math.min(remaining, LOG_PAGE_SIZE) +
+                            ' more of ' + remaining + ' commands');
+            more.addEventListener('click', () => {
+                more.remove();
+                renderLogs(container, logs, testOutputs, start + LOG_PAGE_SIZE, onResize);
+                onResize();
+            });
+            container.appendChild(more);
+        }
+    }
+
+    function renderDetails(container, test, testOutputs, onResize) {
+        container.textContent = '';
+        if (test.error_message) {
+            container.appendChild(el('div', 'error-message', test.error_message));
+        }
+        const details = test.details || {};
+        if (details.shard) {
+            container.appendChild(el('div', 'shard-label', 'Docker host: ' + details.shard));
+        }
+        if (details.connectivity_matrix) {
+            container.appendChild(renderMesh(details.connectivity_matrix));
+        }
+        const logs = details.command_logs || [];
+        if (logs.length) {
+            const log = el('div', 'command-log');
+            renderLogs(log, logs, testOutputs, 0, onResize);
+            container.appendChild(log);
+        }
+    }
+
+    // Scrolling list that only keeps the rows in view (plus OVERSCAN) in the
+    // DOM. Rows are absolutely positioned from a prefix sum of their heights,
+    // which only changes when a test is expanded or collapsed.
+    class VirtualList {
+        constructor(container, tests) {
+            this.container = container;
+            this.tests = tests;  // [name, status, duration, commands, index]
+            this.expanded = new Map();  // test index -> {height, node}
+            this.rows = new Map();  // test index -> rendered row
+
+            this.viewport = el('div', 'virtual-viewport');
+            this.spacer = el('div', 'virtual-spacer');
+            this.viewport.appendChild(this.spacer);
+            container.appendChild(this.viewport);
+            this.viewport.addEventListener('scroll', () => this.render());
+            this.filter();
+        }
+
+        filter() {
+            this.visible = this.tests.filter(test =>
+                (filters.status === 'all' || test[1] === filters.status) &&
+                (!filters.query || test[0].toLowerCase().includes(filters.query)));
+            this.rows.forEach(row => row.remove());
+            this.rows.clear();
+            this.layout();
+        }
+
+        layout() {
+            this.offsets = new Float64Array(this.visible.length + 1);
+            for (let i = 0; i < this.visible.length; i++) {
+                const open = this.expanded.get(this.visible[i][4]);
+                this.offsets[i + 1] = this.offsets[i] + (open ? open.height : ROW_HEIGHT);
+            }
+            const total = this.offsets[this.visible.length];
+            this.spacer.style.height = total + 'px';
+            this.viewport.style.height = Math.min(total, VIEWPORT_HEIGHT) + 'px';
+            this.container.classList.toggle('hidden', this.visible.length === 0);
+            this.render();
+        }
+
+        firstVisible(top) {
+            let low = 0;
+            let high = this.visible.length;
+            while (low < high) {
+                const middle = (low + high) >> 1;
+                if (this.offsets[middle + 1] <= top) {
+                    low = middle + 1;
+                } else {
+                    high = middle;
+                }
+            }
+            return low;
+        }
+
+        render() {
+            const top = this.viewport.scrollTop;
+            const start = Math.max(0, this.firstVisible(top) - OVERSCAN);
+            let end = start;
+            while (end < this.visible.length && this.offsets[end] < top + VIEWPORT_HEIGHT) {
+                end++;
+            }
+            end = Math.min(this.visible.length, end + OVERSCAN);
+
+            const wanted = new Set();
+            for (let i = start; i < end; i++) {
+                const test = this.visible[i];
+                wanted.add(test[4]);
+                let row = this.rows.get(test[4]);
+                if (!row) {
+                    row = this.createRow(test);
+                    this.rows.set(test[4], row);
+                    this.spacer.appendChild(row);
                 }
+                row.style.top = this.offsets[i] + 'px';
+            }
+            this.rows.forEach((row, index) => {
+                if (!wanted.has(index)) {
+                    row.remove();
+                    this.rows.delete(index);
+                }
+            });
+        }
+
+        createRow(test) {
+            const [name, status, duration, commands, index] = test;
+            const row = el('div', 'test-case');
+            const header = el('div', 'test-header');
+            const title = el('div', 'test-title');
+            const chevron = el('i', 'fas fa-chevron-right');
+            title.append(chevron, document.createTextNode(name));
+            const meta = el('div', 'test-meta');
+            meta.append(el('span', 'command-count', commands + ' commands'),
+                        el('span', 'duration', duration.toFixed(2) + 's'),
+                        el('span', 'status ' + (status === 'PASS' ? 'pass' : 'fail'), status));
+            header.append(title, meta);
+            header.addEventListener('click', () => this.toggle(index, row, chevron));
+            row.appendChild(header);
+
+            const open = this.expanded.get(index);
+            if (open) {
+                row.appendChild(open.node);
+                chevron.style.transform = 'rotate(90deg)';
+            }
+            return row;
+        }
+
+        toggle(index, row, chevron) {
+            const open = this.expanded.get(index);
+            if (open) {
+                this.expanded.delete(index);
+                open.node.remove();
+                chevron.style.transform = 'rotate(0deg)';
+                this.layout();
+                return;
             }
+
+            const details = el('div', 'test-details', 'Loading...');
+            this.expanded.set(index, {height: ROW_HEIGHT, node: details});
+            row.appendChild(details);
+            chevron.style.transform = 'rotate(90deg)';
+
+            const measure = () => {
+                const entry = this.expanded.get(index);
+                if (entry && row.isConnected) {
+                    entry.height = row.offsetHeight + ROW_GAP;
+                    this.layout();
+                }
+            };
+            measure();
+            loadDetails(index, test => loadOutputs(index, test, testOutputs => {
+                renderDetails(details, test, testOutputs, measure);
+                measure();
+            }));
+        }
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        const reportIndex = window.REPORT_INDEX || {chunkSize: 1, modules: {}};
+        const lists = [];
+        document.querySelectorAll('.test-results[data-module]').forEach(container => {
+            const tests = reportIndex.modules[container.dataset.module] || [];
+            lists.push(new VirtualList(container, tests));
         });
+        const refresh = () => lists.forEach(list => list.filter());
+
+        document.querySelectorAll('.filter-btn[data-status]').forEach(button => {
+            button.addEventListener('click', () => {
+                document.querySelectorAll('.filter-btn[data-status]').forEach(other => {
+                    other.classList.toggle('active', other === button);
+                });
+                filters.status = button.dataset.status;
+                refresh();
+            });
+        });
+
+        let searchTimer = null;
+        const search = document.querySelector('.filter-search');
+        if (search) {
+            search.addEventListener('input', () => {
+                clearTimeout(searchTimer);
+                searchTimer = setTimeout(() => {
+                    filters.query = search.value.trim().toLowerCase();
+                    refresh();
+                }, 150);
+            });
+        }
     });
-});
+})();